@@ -0,0 +1,62 @@
+"""add character index
+
+Revision ID: 10123456abcd
+Revises: f0123456abcd
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '10123456abcd'
+down_revision: Union[str, None] = 'f0123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'character_appearances',
+        sa.Column('segment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('character_name', sa.String(length=255), nullable=False),
+        sa.Column('script_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('line_count', sa.Integer(), nullable=False),
+        sa.Column('word_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['segment_id'], ['scene_segments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['script_id'], ['scripts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('segment_id', 'character_name')
+    )
+    op.create_index(
+        'ix_character_appearances_script_id_character_name',
+        'character_appearances',
+        ['script_id', 'character_name'],
+        unique=False
+    )
+
+    # Backfill; must match CharacterIndexService's rebuild query
+    op.execute(
+        """
+        INSERT INTO character_appearances (segment_id, character_name, script_id, line_count, word_count)
+        SELECT s.id,
+               upper(btrim(regexp_replace(c.character_name, '(\\s*\\([^)]*\\))+\\s*$', ''))),
+               s.script_id,
+               count(*),
+               sum(coalesce(array_length(regexp_split_to_array(nullif(btrim(c.content), ''), '\\s+'), 1), 0))
+        FROM scene_segments s
+        JOIN scene_segment_components c ON c.scene_segment_id = s.id
+        WHERE s.is_deleted IS false
+          AND c.is_deleted IS false
+          AND c.component_type = 'DIALOGUE'
+          AND nullif(upper(btrim(regexp_replace(c.character_name, '(\\s*\\([^)]*\\))+\\s*$', ''))), '') IS NOT NULL
+        GROUP BY s.id, upper(btrim(regexp_replace(c.character_name, '(\\s*\\([^)]*\\))+\\s*$', ''))), s.script_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_character_appearances_script_id_character_name', table_name='character_appearances')
+    op.drop_table('character_appearances')
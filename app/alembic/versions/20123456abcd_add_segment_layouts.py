@@ -0,0 +1,41 @@
+"""add segment layouts
+
+Revision ID: 20123456abcd
+Revises: 10123456abcd
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '20123456abcd'
+down_revision: Union[str, None] = '10123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Starts empty; segments are laid out on the first estimate of each script
+    op.create_table(
+        'segment_layouts',
+        sa.Column('segment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('script_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('content_revision', sa.Integer(), nullable=False),
+        sa.Column('component_count', sa.Integer(), nullable=False),
+        sa.Column('layout_version', sa.Integer(), nullable=False),
+        sa.Column('blocks', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['segment_id'], ['scene_segments.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['script_id'], ['scripts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('segment_id')
+    )
+    op.create_index('ix_segment_layouts_script_id', 'segment_layouts', ['script_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_segment_layouts_script_id', table_name='segment_layouts')
+    op.drop_table('segment_layouts')
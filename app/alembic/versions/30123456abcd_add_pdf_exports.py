@@ -0,0 +1,56 @@
+"""add pdf exports
+
+Revision ID: 30123456abcd
+Revises: 20123456abcd
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '30123456abcd'
+down_revision: Union[str, None] = '20123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rendered_pdfs',
+        sa.Column('script_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('lines_per_page', sa.Integer(), nullable=False),
+        sa.Column('page_count', sa.Integer(), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['script_id'], ['scripts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('script_id')
+    )
+    op.create_table(
+        'pdf_export_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('script_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'DONE', 'FAILED', name='pdfexportjobstatus'), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['script_id'], ['scripts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pdf_export_jobs_id'), 'pdf_export_jobs', ['id'], unique=False)
+    op.create_index('ix_pdf_export_jobs_script_id', 'pdf_export_jobs', ['script_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pdf_export_jobs_script_id', table_name='pdf_export_jobs')
+    op.drop_index(op.f('ix_pdf_export_jobs_id'), table_name='pdf_export_jobs')
+    op.drop_table('pdf_export_jobs')
+    sa.Enum(name='pdfexportjobstatus').drop(op.get_bind(), checkfirst=True)
+    op.drop_table('rendered_pdfs')
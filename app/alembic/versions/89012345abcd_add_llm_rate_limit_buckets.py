@@ -0,0 +1,33 @@
+"""add llm rate limit buckets table
+
+Revision ID: 89012345abcd
+Revises: 78901234abcd
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '89012345abcd'
+down_revision: Union[str, None] = '78901234abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Shared token bucket state for the postgres rate limiter backend
+    op.create_table(
+        'llm_rate_limit_buckets',
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('requests', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('llm_rate_limit_buckets')
@@ -0,0 +1,46 @@
+"""add position counters to scripts and scene segments
+
+Revision ID: 90123456abcd
+Revises: 89012345abcd
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '90123456abcd'
+down_revision: Union[str, None] = '89012345abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Counters used to append segments/components atomically (UPDATE ... RETURNING)
+    op.add_column('scripts', sa.Column('segment_number_seq', sa.Float(), server_default='0', nullable=False))
+    op.add_column('scene_segments', sa.Column('component_position_seq', sa.Float(), server_default='0', nullable=False))
+
+    # Start from the current last key so existing scripts keep appending after it
+    op.execute("""
+        UPDATE scripts s SET segment_number_seq = m.max_number
+        FROM (
+            SELECT script_id, MAX(segment_number) AS max_number
+            FROM scene_segments WHERE is_deleted IS FALSE GROUP BY script_id
+        ) m
+        WHERE s.id = m.script_id
+    """)
+    op.execute("""
+        UPDATE scene_segments s SET component_position_seq = m.max_position
+        FROM (
+            SELECT scene_segment_id, MAX(position) AS max_position
+            FROM scene_segment_components WHERE is_deleted IS FALSE GROUP BY scene_segment_id
+        ) m
+        WHERE s.id = m.scene_segment_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('scene_segments', 'component_position_seq')
+    op.drop_column('scripts', 'segment_number_seq')
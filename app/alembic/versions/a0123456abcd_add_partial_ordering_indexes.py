@@ -0,0 +1,48 @@
+"""add partial ordering indexes for live rows
+
+Revision ID: a0123456abcd
+Revises: 90123456abcd
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a0123456abcd'
+down_revision: Union[str, None] = '90123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The predicate is spelled exactly like the queries' `is_deleted.is_(False)` filter
+# so the planner can match the partial index without proving an implication.
+LIVE_ROWS = sa.text('is_deleted IS FALSE')
+
+INDEXES = [
+    ('ix_scene_segments_script_id_segment_number_live', 'scene_segments', ['script_id', 'segment_number']),
+    ('ix_scene_segment_components_segment_id_position_live', 'scene_segment_components', ['scene_segment_id', 'position']),
+    ('ix_scene_description_beats_beat_id_position_live', 'scene_description_beats', ['beat_id', 'position']),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so the editor tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=LIVE_ROWS,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
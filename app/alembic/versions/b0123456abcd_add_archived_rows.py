@@ -0,0 +1,37 @@
+"""add archived rows table for the soft-delete purge job
+
+Revision ID: b0123456abcd
+Revises: a0123456abcd
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0123456abcd'
+down_revision: Union[str, None] = 'a0123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cold storage for rows hard-deleted by app/services/purge_service.py
+    op.create_table(
+        'archived_rows',
+        sa.Column('table_name', sa.String(length=100), nullable=False),
+        sa.Column('row_id', sa.UUID(), nullable=False),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('table_name', 'row_id')
+    )
+    op.create_index('ix_archived_rows_archived_at', 'archived_rows', ['archived_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_rows_archived_at', table_name='archived_rows')
+    op.drop_table('archived_rows')
@@ -0,0 +1,37 @@
+"""add script revision counter and editor snapshots
+
+Revision ID: c0123456abcd
+Revises: b0123456abcd
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0123456abcd'
+down_revision: Union[str, None] = 'b0123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('scripts', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+
+    # One pre-serialized editor payload per script, see app/services/script_snapshot_service.py
+    op.create_table(
+        'script_snapshots',
+        sa.Column('script_id', sa.UUID(), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['script_id'], ['scripts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('script_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('script_snapshots')
+    op.drop_column('scripts', 'revision')
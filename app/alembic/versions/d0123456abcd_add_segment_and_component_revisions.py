@@ -0,0 +1,48 @@
+"""add per-row revisions for delta sync
+
+Revision ID: d0123456abcd
+Revises: c0123456abcd
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0123456abcd'
+down_revision: Union[str, None] = 'c0123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_scene_segments_script_id_revision', 'scene_segments', ['script_id', 'revision']),
+    ('ix_scene_segment_components_segment_id_revision', 'scene_segment_components', ['scene_segment_id', 'revision']),
+]
+
+
+def upgrade() -> None:
+    # Existing rows count as written at revision 0, i.e. before any client synced
+    op.add_column('scene_segments', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('scene_segment_components', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('scene_segment_components', 'revision')
+    op.drop_column('scene_segments', 'revision')
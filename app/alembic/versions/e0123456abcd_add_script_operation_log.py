@@ -0,0 +1,52 @@
+"""add script operation log
+
+Revision ID: e0123456abcd
+Revises: d0123456abcd
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e0123456abcd'
+down_revision: Union[str, None] = 'd0123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('scripts', sa.Column('operation_log_floor', sa.Integer(), server_default='0', nullable=False))
+
+    # Text operations on component content, see app/services/operation_log_service.py
+    op.create_table(
+        'script_operations',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('script_id', sa.UUID(), nullable=False),
+        sa.Column('component_id', sa.UUID(), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('operations', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('client_id', sa.String(length=64), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['script_id'], ['scripts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['component_id'], ['scene_segment_components.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_script_operations_id'), 'script_operations', ['id'], unique=False)
+    op.create_index('ix_script_operations_script_id_revision', 'script_operations', ['script_id', 'revision'], unique=False)
+    op.create_index('ix_script_operations_component_id_revision', 'script_operations', ['component_id', 'revision'], unique=False)
+    op.create_index('ix_script_operations_created_at', 'script_operations', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_script_operations_created_at', table_name='script_operations')
+    op.drop_index('ix_script_operations_component_id_revision', table_name='script_operations')
+    op.drop_index('ix_script_operations_script_id_revision', table_name='script_operations')
+    op.drop_index(op.f('ix_script_operations_id'), table_name='script_operations')
+    op.drop_table('script_operations')
+    op.drop_column('scripts', 'operation_log_floor')
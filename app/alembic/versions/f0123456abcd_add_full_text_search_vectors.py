@@ -0,0 +1,72 @@
+"""add full-text search vectors
+
+Revision ID: f0123456abcd
+Revises: e0123456abcd
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0123456abcd'
+down_revision: Union[str, None] = 'e0123456abcd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Weighted documents, kept in sync by Postgres on every INSERT/UPDATE of the row.
+# Must match the Computed() expressions on the models.
+VECTORS = [
+    (
+        'scene_segment_components',
+        "setweight(to_tsvector('english', coalesce(character_name, '')), 'A') || "
+        "setweight(to_tsvector('english', content), 'B')",
+        'ix_scene_segment_components_search_vector',
+    ),
+    (
+        'scene_description_beats',
+        "setweight(to_tsvector('english', scene_heading), 'A') || "
+        "setweight(to_tsvector('english', scene_description), 'B')",
+        'ix_scene_description_beats_search_vector',
+    ),
+    (
+        'beats',
+        "setweight(to_tsvector('english', beat_title), 'A') || "
+        "setweight(to_tsvector('english', beat_description), 'B')",
+        'ix_beats_search_vector',
+    ),
+]
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table once under an exclusive
+    # lock; run this in a maintenance window on large databases
+    for table, expression, _ in VECTORS:
+        op.add_column(
+            table,
+            sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True))
+        )
+
+    with op.get_context().autocommit_block():
+        for table, _, index in VECTORS:
+            op.create_index(
+                index,
+                table,
+                ['search_vector'],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, _, index in VECTORS:
+            op.drop_index(index, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table, _, _ in VECTORS:
+        op.drop_column(table, 'search_vector')
@@ -20,6 +20,13 @@ async def get_current_user(
     """
     Validate access token and return current user
     """
+    return get_user_from_token(db, credentials.credentials)
+
+def get_user_from_token(db: Session, token: str):
+    """
+    Validate a Supabase access token and return its user, creating it on first use.
+    Also used by WebSocket endpoints, which receive the token as a query parameter.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,7 +36,7 @@ async def get_current_user(
     try:
         # Decode JWT token
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             settings.SUPABASE_JWT_SECRET,
             algorithms=[settings.JWT_ALGORITHM],
             audience="authenticated"
@@ -1,12 +1,52 @@
 # app/config.py
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from functools import lru_cache
 
 class Settings(BaseSettings):
     # Application Settings
     APP_NAME: str = "Script Manager"
     API_V1_PREFIX: str = "/api/v1"
+    # Response compression (see app/middleware/compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Complete bodies below this are sent uncompressed
+    COMPRESSION_LEVELS: Dict[str, int] = {"gzip": 6, "br": 4, "zstd": 3}
+    # Per path prefix overrides, e.g. {"/api/v1/scripts/": {"br": 5, "zstd": 6}}
+    COMPRESSION_ROUTE_LEVELS: Dict[str, Dict[str, int]] = {}
+
+    # Live collaboration over WebSockets (see app/services/live_sync.py)
+    LIVE_SYNC_ENABLED: bool = True  # NOTIFY on every script revision bump and serve the WebSocket
+    LIVE_SYNC_CHANNEL: str = "script_changes"
+    LIVE_SYNC_RECONNECT_SECONDS: float = 5.0
+
+    # Operation-log editing (see app/services/operation_log_service.py)
+    OPERATION_LOG_COMPACTION_ENABLED: bool = True
+    OPERATION_LOG_RETENTION_MINUTES: int = 24 * 60  # Oldest base revision an edit can still be merged from
+    OPERATION_LOG_COMPACTION_BATCH_SIZE: int = 5000
+    OPERATION_LOG_COMPACTION_INTERVAL_SECONDS: int = 15 * 60
+
+    # Page-count and runtime estimates (see app/services/page_estimate_service.py)
+    PAGINATION_LINES_PER_PAGE: int = 55
+    PAGINATION_SECONDS_PER_PAGE: float = 60.0  # One page per minute of screen time
+
+    # Fountain / FDX export (see app/services/screenplay_export_service.py)
+    EXPORT_FRAGMENT_CACHE_SIZE: int = 20000  # Rendered segments kept per worker, across formats
+    EXPORT_STREAM_CHUNK_SIZE: int = 64 * 1024
+
+    # PDF export (see app/services/pdf_export_service.py)
+    PDF_RENDER_WORKERS: int = 2  # Processes for PDF layout and rendering
+    PDF_RENDER_MAX_PENDING: int = 8  # Inline renders queued or running per API process before answering 503
+    PDF_INLINE_MAX_COMPONENTS: int = 20000  # Larger scripts not yet rendered must go through an export job
+    PDF_JOB_TIMEOUT_SECONDS: int = 15 * 60  # Unfinished jobs older than this are reported as failed
+
+    # Soft-delete purge (see app/services/purge_service.py)
+    PURGE_ENABLED: bool = False  # Run the purge loop inside the API process
+    PURGE_MODE: str = "archive"  # "archive" (copy to archived_rows) or "delete"
+    PURGE_RETENTION_DAYS: int = 30
+    PURGE_BATCH_SIZE: int = 500
+    PURGE_MAX_BATCHES_PER_TABLE: Optional[int] = 200  # Per run; the rest waits for the next run
+    PURGE_INTERVAL_SECONDS: int = 6 * 3600
+
     DEBUG: bool = False
     
     # CORS Settings
@@ -35,6 +75,13 @@ class Settings(BaseSettings):
         "text/plain"
     ]
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB in bytes
+    AZURE_STORAGE_MAX_CONNECTIONS: int = 100  # Shared aiohttp pool of the blob client
+    AZURE_SAS_UPLOAD_TTL_MINUTES: int = 15
+    AZURE_SAS_DOWNLOAD_TTL_MINUTES: int = 5
+    AZURE_UPLOAD_BLOCK_SIZE: int = 4 * 1024 * 1024  # Staged block size for streamed uploads
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # Read size when streaming an upload
+    UPLOAD_EXTRACTION_WORKERS: int = 2  # Processes for PDF/DOCX text extraction
+    UPLOAD_IMPORT_BATCH_SEGMENTS: int = 200  # Parsed segments per bulk insert during upload
 
     # Supabase Settings
     SUPABASE_URL: str
@@ -65,12 +112,35 @@ class Settings(BaseSettings):
     AZURE_OPENAI_API_VERSION: str = "2024-09-12"
     AZURE_OPENAI_DEPLOYMENT_NAME: str
     AZURE_OPENAI_MAX_TOKENS: int = 65000
+    AZURE_OPENAI_FAST_DEPLOYMENT_NAME: Optional[str] = None  # Cheap/fast tier for short edits
+    AZURE_OPENAI_FALLBACK_DEPLOYMENTS: List[str] = []  # Tried in order when a deployment is throttled
+    AZURE_OPENAI_ROUTES: Dict[str, Dict[str, Any]] = {}  # Per-operation overrides, see app/services/llm_router.py
     AZURE_OPENAI_TEMPERATURE: float = 1
     AZURE_TOP_P: float = 0.9
     AZURE_PRESENCE_PENALTY: float = 0.3
     AZURE_FREQUENCY_PENALTY: float = 0.2
     AZURE_SEED: int = 53
 
+    # Azure OpenAI resilience (see app/services/llm_resilience.py)
+    AZURE_OPENAI_TIMEOUT_SECONDS: float = 120.0  # Per-attempt timeout, capped by the operation deadline
+    AZURE_OPENAI_MAX_RETRIES: int = 4
+    AZURE_OPENAI_BACKOFF_BASE_SECONDS: float = 0.5
+    AZURE_OPENAI_BACKOFF_MAX_SECONDS: float = 20.0
+    AZURE_OPENAI_HEDGE_DELAY_SECONDS: float = 8.0  # 0 disables hedging of short edit calls
+    AZURE_OPENAI_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    AZURE_OPENAI_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Client-side rate limiting (see app/services/llm_rate_limiter.py)
+    AZURE_OPENAI_RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per process) or "postgres" (shared)
+    AZURE_OPENAI_TPM: int = 150000  # Deployment tokens-per-minute quota
+    AZURE_OPENAI_RPM: int = 900  # Deployment requests-per-minute quota
+    AZURE_OPENAI_BULK_RESERVE_FRACTION: float = 0.2  # Share of quota bulk generation may not use
+    AZURE_OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS: float = 30.0
+    AZURE_OPENAI_DEFAULT_OUTPUT_TOKENS: int = 2048  # Reservation for calls without max_tokens
+    AZURE_OPENAI_FALLBACK_MAX_WAIT_SECONDS: float = 2.0  # Queue wait before trying the next deployment
+    AZURE_OPENAI_BUDGET_ESCALATION_FACTOR: float = 2.0  # max_tokens multiplier after a truncated response
+    AZURE_OPENAI_BUDGET_MAX_ESCALATIONS: int = 2
+
     DEBUG: bool = False
     ENVIRONMENT: str = "development"  # Can be "development", "staging", "production"
     ENABLE_TEST_ENDPOINTS: bool = False  # Specific flag for test endpoints
@@ -1,19 +1,31 @@
 # app/main.py
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List
+import asyncio
 import logging
 import time
 
 from app.config import settings
 from app.database import engine, Base
 from app.models import users, script  # This ensures models are imported for migrations
+from app.middleware.compression import CompressionMiddleware
+from app.services.llm_resilience import LLMUnavailableError, get_circuit_breaker_states
+from app.services.llm_rate_limiter import get_rate_limiter_metrics
+from app.services.document_extraction import shutdown_extraction_pool
+from app.services.pdf_export_service import shutdown_render_pool
+from app.services.azure_service import init_blob_service_client, close_blob_service_client
+from app.services.purge_service import run_purge_loop
+from app.services.live_sync import run_listener as run_live_sync_listener
+from app.services.operation_log_service import run_compaction_loop
+from app.services import script_revision  # noqa: F401  registers the revision flush listener
+from app.services import character_index_service  # noqa: F401  registers the character index flush listener
 
 # Import routers
-from app.routers import users, scripts, test_beats, beats, scenes, scene_descriptions, scene_segments, pricing
+from app.routers import users, scripts, test_beats, beats, scenes, scene_descriptions, scene_segments, pricing, search
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +42,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     docs_url=f"{settings.API_V1_PREFIX}/docs",
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -42,6 +55,15 @@ app.add_middleware(
     allow_headers=settings.CORS_HEADERS,
 )
 
+# Negotiated zstd/br/gzip compression of large JSON and streamed responses
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        levels=settings.COMPRESSION_LEVELS,
+        route_levels=settings.COMPRESSION_ROUTE_LEVELS,
+    )
+
 # Middleware for request timing
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -74,13 +96,30 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
         }
     )
 
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable_exception_handler(request: Request, exc: LLMUnavailableError):
+    logger.error(f"LLM unavailable: {exc}")
+    headers = {"Retry-After": str(int(exc.retry_after) + 1)} if exc.retry_after is not None else None
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "message": "AI service temporarily unavailable",
+            "detail": str(exc)
+        },
+        headers=headers
+    )
+
 # Health check endpoint
 @app.get("/health", tags=["Health"])
 async def health_check():
+    circuit_breakers = get_circuit_breaker_states()
+    llm_degraded = any(cb["state"] != "closed" for cb in circuit_breakers.values())
     return {
-        "status": "healthy",
+        "status": "degraded" if llm_degraded else "healthy",
         "app_name": settings.APP_NAME,
-        "api_version": "v1"
+        "api_version": "v1",
+        "llm_circuit_breakers": circuit_breakers,
+        "llm_rate_limiters": get_rate_limiter_metrics()
     }
 
 # Root endpoint
@@ -128,6 +167,12 @@ app.include_router(
     tags=["scene-segments-and-components"]
 )
 
+app.include_router(
+    search.router,
+    prefix=f"{settings.API_V1_PREFIX}/search",
+    tags=["search"]
+)
+
 app.include_router(
     pricing.router,
     prefix=f"{settings.API_V1_PREFIX}/pricing",
@@ -146,13 +191,25 @@ if settings.DEBUG:  # Only include test endpoints in debug mode
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up Movie Script Manager API")
-    # Add any startup tasks here (e.g., database connection verification)
+    await init_blob_service_client()
+    if settings.PURGE_ENABLED:
+        app.state.purge_task = asyncio.create_task(run_purge_loop())
+    if settings.LIVE_SYNC_ENABLED:
+        app.state.live_sync_task = asyncio.create_task(run_live_sync_listener())
+    if settings.OPERATION_LOG_COMPACTION_ENABLED:
+        app.state.compaction_task = asyncio.create_task(run_compaction_loop())
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Movie Script Manager API")
-    # Add any cleanup tasks here
+    shutdown_extraction_pool()
+    shutdown_render_pool()
+    for task_name in ("purge_task", "live_sync_task", "compaction_task"):
+        task = getattr(app.state, task_name, None)
+        if task is not None:
+            task.cancel()
+    await close_blob_service_client()
 
 if __name__ == "__main__":
     import uvicorn
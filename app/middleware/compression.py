@@ -0,0 +1,222 @@
+# app/middleware/compression.py
+"""
+Negotiated response compression (zstd, br, gzip).
+
+Script payloads are large and very repetitive, so they compress extremely well.
+The encoding is picked from Accept-Encoding (client q-values first, then server
+preference zstd > br > gzip, limited to the codecs installed). Complete bodies
+smaller than `minimum_size` are sent as is. Streamed bodies (exports, SSE) are
+compressed chunk by chunk and flushed after every chunk, so each event reaches
+the client immediately.
+
+Levels come from COMPRESSION_LEVELS and can be overridden per path prefix with
+COMPRESSION_ROUTE_LEVELS, e.g. a cheaper level for the editor load path.
+"""
+from typing import Dict, List, Optional, Tuple
+import logging
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional codec
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional codec
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "text/",
+)
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+CODECS = {"gzip": _Gzip}
+if brotli is not None:
+    CODECS["br"] = _Brotli
+if zstandard is not None:
+    CODECS["zstd"] = _Zstd
+
+# Server preference when the client accepts several with the same q-value
+PREFERENCE = ["zstd", "br", "gzip"]
+
+
+def choose_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Best available encoding for an Accept-Encoding header, or None."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value.strip())
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    candidates = []
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0:
+            candidates.append((weight, -PREFERENCE.index(encoding), encoding))
+    return max(candidates)[2] if candidates else None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        levels: Optional[Dict[str, int]] = None,
+        route_levels: Optional[Dict[str, Dict[str, int]]] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+        # Longest prefix wins
+        self.route_levels: List[Tuple[str, Dict[str, int]]] = sorted(
+            (route_levels or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+        self.available = [encoding for encoding in PREFERENCE if encoding in CODECS]
+
+    def level_for(self, path: str, encoding: str) -> int:
+        for prefix, levels in self.route_levels:
+            if path.startswith(prefix) and encoding in levels:
+                return levels[encoding]
+        return self.levels[encoding]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(
+            self.app, send, encoding, self.level_for(scope["path"], encoding), self.minimum_size
+        )
+        await responder(scope, receive)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, send: Send, encoding: str, level: int, minimum_size: int):
+        self.app = app
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _should_compress(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether it is worth it
+            self.start_message = message
+            self.passthrough = not self._should_compress(message)
+            if self.passthrough:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                MutableHeaders(raw=self.start_message["headers"]).add_vary_header("Accept-Encoding")
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.compressor = CODECS[self.encoding](self.level)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        if more_body:
+            # Flush so streamed chunks (SSE events, export pages) are not held back
+            chunk = self.compressor.compress(body) + self.compressor.flush()
+        else:
+            chunk = self.compressor.compress(body) + self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -3,4 +3,10 @@ from .users import User
 from .beats import Beat, MasterBeatSheet, ActEnum, BeatSheetType, Scene,SceneGenerationTracker
 # from .scene import Scene, SceneGenerationTracker, SceneGenerationStatus
 from .scene_segments import SceneSegment, SceneSegmentComponent, ComponentType
+from .archive import ArchivedRow
+from .snapshot import ScriptSnapshot
 
+from .operations import ScriptOperation
+from .characters import CharacterAppearance
+from .pagination import SegmentLayout
+from .exports import RenderedPdf, PdfExportJob
@@ -0,0 +1,22 @@
+# app/models/archive.py
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ArchivedRow(Base):
+    """
+    Cold copy of a soft-deleted row removed from its hot table by the purge job.
+
+    Rows from every purged table share this table; `data` holds the full row as
+    JSON so it can be restored or audited without keeping a mirror of each schema.
+    """
+    __tablename__ = "archived_rows"
+
+    table_name = Column(String(100), primary_key=True)
+    row_id = Column(UUID(as_uuid=True), primary_key=True)
+    data = Column(JSONB, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON, Enum, Integer, UniqueConstraint, Float, Boolean
+from sqlalchemy import Column, Computed, String, DateTime, ForeignKey, Text, JSON, Enum, Index, Integer, UniqueConstraint, Float, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID, JSONB
 from app.models.base import UUIDModel
 import enum
 
@@ -63,6 +63,15 @@ class Beat(UUIDModel, SoftDeleteMixin):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     beat_act = Column(Enum(ActEnum), nullable=False)
     complete_json = Column(JSONB, nullable=True)
+    # Full-text search; see SceneSegmentComponent.search_vector
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', beat_title), 'A') || "
+            "setweight(to_tsvector('english', beat_description), 'B')",
+            persisted=True
+        )
+    )
 
     # Relationships
     script = relationship("Script", back_populates="beats")
@@ -79,7 +88,9 @@ class Beat(UUIDModel, SoftDeleteMixin):
     __table_args__ = (
         UniqueConstraint('script_id', 'position', name='unique_position_per_script'),
         UniqueConstraint('script_id', 'beat_title', name='unique_beat_title_per_script'),
+        Index("ix_beats_search_vector", "search_vector", postgresql_using="gin"),
     )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
 
 class Scene(UUIDModel, SoftDeleteMixin):
@@ -0,0 +1,27 @@
+# app/models/characters.py
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class CharacterAppearance(Base):
+    """
+    How much one character speaks in one segment (scene) of a script.
+
+    Rows are derived from the live DIALOGUE components of the segment and are
+    rebuilt for a segment whenever its dialogue changes (see
+    app/services/character_index_service.py). `character_name` is the normalized
+    (trimmed, upper-case) speaker name.
+    """
+    __tablename__ = "character_appearances"
+
+    segment_id = Column(UUID(as_uuid=True), ForeignKey("scene_segments.id", ondelete="CASCADE"), primary_key=True)
+    character_name = Column(String(255), primary_key=True)
+    script_id = Column(UUID(as_uuid=True), ForeignKey("scripts.id", ondelete="CASCADE"), nullable=False)
+    line_count = Column(Integer, nullable=False)
+    word_count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_character_appearances_script_id_character_name", "script_id", "character_name"),
+    )
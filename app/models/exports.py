@@ -0,0 +1,49 @@
+# app/models/exports.py
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, LargeBinary, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import enum
+
+from app.database import Base
+from app.models.base import UUIDModel
+
+
+class RenderedPdf(Base):
+    """
+    Last PDF rendered for a script (see app/services/pdf_export_service.py).
+
+    It is current while `revision` matches Script.revision; older ones are
+    replaced by the next render, never by a render of an earlier revision.
+    """
+    __tablename__ = "rendered_pdfs"
+
+    script_id = Column(UUID(as_uuid=True), ForeignKey("scripts.id", ondelete="CASCADE"), primary_key=True)
+    revision = Column(Integer, nullable=False)
+    lines_per_page = Column(Integer, nullable=False)
+    page_count = Column(Integer, nullable=False)
+    content = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class PdfExportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class PdfExportJob(UUIDModel):
+    """A background PDF render; the result is the script's RenderedPdf at `revision`."""
+    __tablename__ = "pdf_export_jobs"
+
+    script_id = Column(UUID(as_uuid=True), ForeignKey("scripts.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    revision = Column(Integer, nullable=False)
+    status = Column(Enum(PdfExportJobStatus), nullable=False, default=PdfExportJobStatus.PENDING)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_pdf_export_jobs_script_id", "script_id"),
+    )
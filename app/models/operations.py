@@ -0,0 +1,35 @@
+# app/models/operations.py
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.models.base import UUIDModel
+
+
+class ScriptOperation(UUIDModel):
+    """
+    One write to a component's content in the script's edit log.
+
+    `operations` are ot.js-style operations (see app/services/text_operations.py),
+    applied in order to the content as it was before `revision`. Edits submitted
+    against an older revision are transformed past these rows. The log is
+    append-only and OperationLogService.compact trims entries older than
+    OPERATION_LOG_RETENTION_MINUTES.
+    """
+    __tablename__ = "script_operations"
+
+    script_id = Column(UUID(as_uuid=True), ForeignKey("scripts.id", ondelete="CASCADE"), nullable=False)
+    component_id = Column(
+        UUID(as_uuid=True), ForeignKey("scene_segment_components.id", ondelete="CASCADE"), nullable=False
+    )
+    revision = Column(Integer, nullable=False)
+    operations = Column(JSONB, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    client_id = Column(String(64), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_script_operations_script_id_revision", "script_id", "revision"),
+        Index("ix_script_operations_component_id_revision", "component_id", "revision"),
+        Index("ix_script_operations_created_at", "created_at"),
+    )
@@ -0,0 +1,31 @@
+# app/models/pagination.py
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class SegmentLayout(Base):
+    """
+    Cached page layout of one segment: its blocks as [space_before, lines, kind]
+    (see app/services/screenplay_layout.py).
+
+    The layout is current while `content_revision` and `component_count` still
+    match the segment's components (highest revision, number of rows including
+    soft-deleted ones) and `layout_version` matches LAYOUT_VERSION; otherwise the
+    segment is laid out again on the next estimate.
+    """
+    __tablename__ = "segment_layouts"
+
+    segment_id = Column(UUID(as_uuid=True), ForeignKey("scene_segments.id", ondelete="CASCADE"), primary_key=True)
+    script_id = Column(UUID(as_uuid=True), ForeignKey("scripts.id", ondelete="CASCADE"), nullable=False)
+    content_revision = Column(Integer, nullable=False)
+    component_count = Column(Integer, nullable=False)
+    layout_version = Column(Integer, nullable=False)
+    blocks = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_segment_layouts_script_id", "script_id"),
+    )
@@ -0,0 +1,20 @@
+# app/models/rate_limit.py
+from sqlalchemy import Column, String, DateTime, Float
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class LLMRateLimitBucket(Base):
+    """
+    Shared token bucket state for an Azure OpenAI deployment.
+
+    Used by the postgres rate limiter backend so that TPM/RPM limits hold across
+    every uvicorn worker and node. Buckets are refilled lazily on each acquire.
+    """
+    __tablename__ = "llm_rate_limit_buckets"
+
+    name = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    requests = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,8 +1,8 @@
 # app/models/scene_segment.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Float, Boolean, Enum, UniqueConstraint
+from sqlalchemy import Column, Computed, String, DateTime, ForeignKey, Text, Float, Boolean, Enum, UniqueConstraint, Index, Integer, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 import enum
 from typing import Optional
 
@@ -30,6 +30,10 @@ class SceneSegment(UUIDModel, SoftDeleteMixin):
     beat_id = Column(UUID(as_uuid=True), ForeignKey("beats.id", ondelete="SET NULL"), nullable=True)
     scene_description_id = Column(UUID(as_uuid=True), ForeignKey("scene_description_beats.id", ondelete="SET NULL"), nullable=True)
     segment_number = Column(Float, nullable=False)
+    # Last component position handed out; see OrderingService.allocate_end
+    component_position_seq = Column(Float, default=0.0, server_default="0", nullable=False)
+    # Script.revision at the last write to this row; see app/services/script_revision.py
+    revision = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -40,8 +44,14 @@ class SceneSegment(UUIDModel, SoftDeleteMixin):
     components = relationship("SceneSegmentComponent", back_populates="scene_segment", cascade="all, delete-orphan")
 
     __table_args__ = (
-        # Ensure unique ordering within a script (for non-deleted segments)
-        # This is implemented using a partial index in PostgreSQL
+        # Ordered listing of a script's live segments (migration a0123456abcd)
+        Index(
+            "ix_scene_segments_script_id_segment_number_live",
+            "script_id", "segment_number",
+            postgresql_where=text("is_deleted IS FALSE")
+        ),
+        # Delta sync: rows written after a given revision (migration d0123456abcd)
+        Index("ix_scene_segments_script_id_revision", "script_id", "revision"),
     )
 
 
@@ -60,6 +70,19 @@ class SceneSegmentComponent(UUIDModel, SoftDeleteMixin):
     content = Column(Text, nullable=False)
     character_name = Column(String(255), nullable=True)  # Only for DIALOGUE type
     parenthetical = Column(Text, nullable=True)  # Only for DIALOGUE type
+    # Full-text search document, maintained by Postgres on every write. Not mapped
+    # (see __mapper_args__), so the ORM never loads or returns it; queried through
+    # the table column in app/services/search_service.py. Migration f0123456abcd.
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(character_name, '')), 'A') || "
+            "setweight(to_tsvector('english', content), 'B')",
+            persisted=True
+        )
+    )
+    # Script.revision at the last write to this row; see app/services/script_revision.py
+    revision = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -73,9 +96,17 @@ class SceneSegmentComponent(UUIDModel, SoftDeleteMixin):
 
 
     __table_args__ = (
-        # Ensure unique ordering within a segment (for non-deleted components)
-        # This is implemented using a partial index in PostgreSQL
+        # Ordered listing of a segment's live components (migration a0123456abcd)
+        Index(
+            "ix_scene_segment_components_segment_id_position_live",
+            "scene_segment_id", "position",
+            postgresql_where=text("is_deleted IS FALSE")
+        ),
+        # Delta sync: rows written after a given revision (migration d0123456abcd)
+        Index("ix_scene_segment_components_segment_id_revision", "scene_segment_id", "revision"),
+        Index("ix_scene_segment_components_search_vector", "search_vector", postgresql_using="gin"),
     )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
 
 class ShorteningAlternative(UUIDModel, SoftDeleteMixin):
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, UniqueConstraint
+from sqlalchemy import Column, Computed, String, DateTime, ForeignKey, Text, Integer, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from app.models.base import UUIDModel, SoftDeleteMixin
 
 class SceneDescription(UUIDModel, SoftDeleteMixin):
@@ -11,6 +11,15 @@ class SceneDescription(UUIDModel, SoftDeleteMixin):
     position = Column(Integer, nullable=False)
     scene_heading = Column(String(1000), nullable=False)
     scene_description = Column(Text, nullable=False)
+    # Full-text search; see SceneSegmentComponent.search_vector
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', scene_heading), 'A') || "
+            "setweight(to_tsvector('english', scene_description), 'B')",
+            persisted=True
+        )
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -21,3 +30,13 @@ class SceneDescription(UUIDModel, SoftDeleteMixin):
     # __table_args__ = (
     #     UniqueConstraint('beat_id', 'position', name='unique_scene_position_per_beat'),
     # )
+    __table_args__ = (
+        # Ordered listing of a beat's live scene descriptions (migration a0123456abcd)
+        Index(
+            "ix_scene_description_beats_beat_id_position_live",
+            "beat_id", "position",
+            postgresql_where=text("is_deleted IS FALSE")
+        ),
+        Index("ix_scene_description_beats_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
@@ -1,5 +1,5 @@
 # app/models/script.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, Integer, CheckConstraint, Enum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, Integer, Float, CheckConstraint, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
@@ -23,6 +23,14 @@ class Script(UUIDModel, SoftDeleteMixin):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     script_progress = Column(Integer, default=0, nullable=True)
+    # Last segment_number handed out; see OrderingService.allocate_end
+    segment_number_seq = Column(Float, default=0.0, server_default="0", nullable=False)
+    # Bumped on every change to the script's beats, scenes, segments or components;
+    # see app/services/script_revision.py
+    revision = Column(Integer, default=0, server_default="0", nullable=False)
+    # Edit log entries up to this revision have been compacted away; see
+    # app/services/operation_log_service.py
+    operation_log_floor = Column(Integer, default=0, server_default="0", nullable=False)
 
     creation_method = Column(
         Enum(ScriptCreationMethod), 
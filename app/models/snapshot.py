@@ -0,0 +1,23 @@
+# app/models/snapshot.py
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ScriptSnapshot(Base):
+    """
+    Pre-serialized editor payload of a script (beats, scene descriptions, segments
+    and components) as of `revision`.
+
+    The payload is stored as JSON text, not JSONB, so it can be returned verbatim
+    without being parsed or re-encoded. It is stale when `revision` is behind
+    Script.revision and is rebuilt on the next read.
+    """
+    __tablename__ = "script_snapshots"
+
+    script_id = Column(UUID(as_uuid=True), ForeignKey("scripts.id", ondelete="CASCADE"), primary_key=True)
+    revision = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,6 @@
 # routers/scripts.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Header, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
@@ -18,6 +18,8 @@ from app.schemas.script import (
 from app.services.script_service import ScriptService
 from app.services.azure_service import AzureStorageService
 from app.services.beat_service import BeatSheetService
+from app.services.http_caching import check_etag, weak_etag
+from app.services.script_revision import get_script_revision
 from app.auth.dependencies import get_current_user
 from app.schemas.user import User
 from app.schemas.beat import ScriptWithBeatsResponse, BeatResponse, BeatUpdate
@@ -31,9 +33,16 @@ router = APIRouter()
 @router.get("/{script_id}/beatsheet", response_model=List[BeatResponse])
 async def get_script_beatsheet(
     script_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    revision = get_script_revision(db, script_id, current_user.id)
+    cached = check_etag(response, if_none_match, weak_etag("beats", revision) if revision is not None else None)
+    if cached:
+        return cached
+
     beats = BeatSheetService.get_script_beatsheet(
         db=db,
         script_id=script_id,
@@ -1,7 +1,7 @@
 # app/routers/scene_descriptions.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.database import get_db
@@ -16,7 +16,12 @@ from app.schemas.scene_description import (
     ActSceneDescriptionGenerationRequest,
     ActSceneDescriptionResult
 )
+from app.models.beats import Beat
+from app.models.usage import AICallTypeEnum
 from app.services.scene_description_service import SceneDescriptionService
+from app.services.usage_service import UsageService
+from app.services.http_caching import check_etag, weak_etag
+from app.services.script_revision import get_beat_script_revision
 
 router = APIRouter()
 
@@ -37,6 +42,13 @@ async def generate_scene_descriptions_for_beat(
             beat_id=request.beat_id,
             user_id=current_user.id
         )
+        UsageService.log_routed_ai_call(
+            db=db,
+            user_id=current_user.id,
+            call_type=AICallTypeEnum.SCENE_DESCRIPTION.value,
+            script_id=db.query(Beat.script_id).filter(Beat.id == request.beat_id).scalar(),
+            metadata={"beat_id": str(request.beat_id)}
+        )
         return result
     except HTTPException as e:
         raise e
@@ -49,12 +61,19 @@ async def generate_scene_descriptions_for_beat(
 @router.get("/beat/{beat_id}", response_model=List[SceneDescriptionResponse])
 async def get_scene_descriptions_for_beat_api(
     beat_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve all scene descriptions for a specific beat.
     """
+    revision = get_beat_script_revision(db, beat_id, current_user.id)
+    cached = check_etag(response, if_none_match, weak_etag("scenes", revision) if revision is not None else None)
+    if cached:
+        return cached
+
     scene_service = SceneDescriptionService()
     try:
         return scene_service.get_scene_descriptions_for_beat(
@@ -108,6 +127,13 @@ async def generate_scene_descriptions_for_act(
             act=request.act,
             user_id=current_user.id
         )
+        UsageService.log_routed_ai_call(
+            db=db,
+            user_id=current_user.id,
+            call_type=AICallTypeEnum.SCENE_DESCRIPTION.value,
+            script_id=request.script_id,
+            metadata={"act": request.act.value}
+        )
         return result
     except HTTPException as e:
         raise e
@@ -1,8 +1,9 @@
 # app/routers/scene_segments.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 from pydantic import BaseModel
 import logging
@@ -19,15 +20,29 @@ from app.schemas.scene_segment import (
     ComponentUpdate,
     ReorderComponentRequest,
     ReorderSegmentRequest,
+    MoveSegmentsRequest,
+    MoveComponentsRequest,
+    MoveRangeResponse,
     BulkCreateSegmentsRequest,
     SegmentListResponse,
     ScriptChangesResponse,
-    ScriptChangesRequest
+    ScriptChangesRequest,
+    ScreenplayImportRequest,
+    ScreenplayImportResponse
 )
 from app.services.scene_segment_service import SceneSegmentService
+from app.services.screenplay_import_service import ScreenplayImportService
+from app.services.screenplay_export import RENDERERS, content_disposition
+from app.services.screenplay_export_service import ScreenplayExportService
+from app.services.ordering_service import OrderingService, SEGMENTS, COMPONENTS
+from app.services.http_caching import check_etag, json_bytes_response, weak_etag
+from app.services.script_revision import get_script_revision
 from app.services.script_service import ScriptService
 
 from app.services.scene_segment_ai_service import SceneSegmentAIService
+from app.services.llm_router import run_llm_call
+from app.services.usage_service import UsageService
+from app.models.usage import AICallTypeEnum
 from app.schemas.scene_segment_ai import (SceneSegmentGenerationResponse, 
                                           ScriptSceneGenerationRequestUser, 
                                           AISceneSegmentGenerationResponse,
@@ -105,6 +120,22 @@ async def reorder_segment(
         reorder_request.new_segment_number
     )
 
+@router.post("/move", response_model=MoveRangeResponse)
+async def move_scene_segments(
+    move_request: MoveSegmentsRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Move a range of segments after another segment (or to the start) in one write.
+    """
+    return OrderingService.move_range(
+        db,
+        SEGMENTS,
+        move_request.segment_ids,
+        move_request.after_segment_id
+    )
+
 @router.post("/batch", response_model=List[SceneSegment])
 async def create_scene_segments_batch(
     batch_request: BulkCreateSegmentsRequest,
@@ -182,6 +213,22 @@ async def reorder_component(
         reorder_request.new_position
     )
 
+@router.post("/components/move", response_model=MoveRangeResponse)
+async def move_components(
+    move_request: MoveComponentsRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Move a range of components after another component (or to the start) in one write.
+    """
+    return OrderingService.move_range(
+        db,
+        COMPONENTS,
+        move_request.component_ids,
+        move_request.after_component_id
+    )
+
 @router.post("/{segment_id}/components/batch", response_model=List[Component])
 async def update_components_batch(
     segment_id: UUID,
@@ -216,10 +263,12 @@ async def auto_save_segment(
 @router.get("/script/{script_id}", response_model=SegmentListResponse)
 async def get_segments_for_script(
     script_id: UUID,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     beat_id: Optional[UUID] = None,
     scene_description_id: Optional[UUID] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -227,20 +276,25 @@ async def get_segments_for_script(
     Retrieve all scene segments for a specific script.
     Supports optional filtering by beat_id or scene_description_id.
     """
-    segments, total = SceneSegmentService.get_scene_segments_for_script(
-        db, 
-        script_id, 
-        skip=skip, 
+    # The ETag only covers the revision; query parameters are part of the URL
+    revision = get_script_revision(db, script_id, current_user.id)
+    cached = check_etag(response, if_none_match, weak_etag("segments", revision) if revision is not None else None)
+    if cached:
+        return cached
+
+    content = SceneSegmentService.get_scene_segments_json(
+        db,
+        script_id,
+        skip=skip,
         limit=limit,
         beat_id=beat_id,
         scene_description_id=scene_description_id
     )
-    
-    return SegmentListResponse(segments=segments, total=total)
+    return json_bytes_response(content, response)
 
 class TextToSegmentRequest(BaseModel):
     script_id: UUID
-    segment_number: float
+    segment_number: Optional[float] = None
     text: str
     beat_id: Optional[UUID] = None
     scene_description_id: Optional[UUID] = None
@@ -264,6 +318,35 @@ async def create_segment_from_text(
         scene_description_id=request.scene_description_id
     )
 
+@router.post(
+    "/script/{script_id}/import",
+    response_model=ScreenplayImportResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def import_screenplay(
+    script_id: UUID,
+    request: ScreenplayImportRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Import a whole plain-text or Fountain screenplay.
+    The text is split into segments at scene headings and written in one bulk insert.
+    """
+    existing_script = ScriptService.get_script(db=db, script_id=script_id)
+    if existing_script.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to modify this script"
+        )
+
+    return ScreenplayImportService.import_text(
+        db=db,
+        script_id=script_id,
+        text=request.text,
+        replace_existing=request.replace_existing
+    )
+
 @router.get("/script/{script_id}/next-segment-number", response_model=float)
 async def get_next_segment_number(
     script_id: UUID,
@@ -272,7 +355,8 @@ async def get_next_segment_number(
 ):
     """
     Get the next available segment number for a script.
-    Useful when creating new segments to ensure proper ordering.
+    This is only a hint: concurrent writers may take the same number. To append,
+    create the segment without a segment_number and one is allocated atomically.
     """
     # Query for the highest segment number
     result = SceneSegmentService.fetch_next_segment_number(db=db, script_id=script_id)
@@ -291,7 +375,8 @@ async def get_next_component_position(
 ):
     """
     Get the next available position for a component within a segment.
-    Useful when adding new components to ensure proper ordering.
+    This is only a hint: to append, add the component without a position and one
+    is allocated atomically.
     """
     try:
         return SceneSegmentService.get_next_component_position(db, segment_id)
@@ -317,6 +402,27 @@ async def export_screenplay(
     """
     return SceneSegmentService.export_screenplay_text(db, script_id)
 
+@router.get("/script/{script_id}/export/{export_format}")
+async def export_screenplay_file(
+    script_id: UUID,
+    export_format: Literal["fountain", "fdx"],
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the screenplay as Fountain or Final Draft (FDX).
+
+    The file is streamed as it is rendered; scenes unchanged since the last
+    export are served from the rendered-fragment cache.
+    """
+    title = ScreenplayExportService.get_script_title(db, script_id, current_user.id)
+    renderer = RENDERERS[export_format]
+    return StreamingResponse(
+        ScreenplayExportService.stream(script_id, export_format, title),
+        media_type=renderer.media_type,
+        headers={"Content-Disposition": content_disposition(title, renderer.extension)}
+    )
+
 @router.post("/components/{component_id}/auto-format", response_model=Component)
 async def auto_format_component(
     component_id: UUID,
@@ -340,11 +446,18 @@ async def generate_next_segment(
     and generates content for it.
     """
     ai_service = SceneSegmentAIService()
-    return await ai_service.generate_next_segment(
+    result = await ai_service.generate_next_segment(
         db=db,
         script_id=request.script_id,
         user_id=current_user.id
     )
+    UsageService.log_routed_ai_call(
+        db=db,
+        user_id=current_user.id,
+        call_type=AICallTypeEnum.SCENE_SEGMENT.value,
+        script_id=request.script_id
+    )
+    return result
 
 
 @router.post("/ai/get-or-generate-first", response_model=AISceneSegmentGenerationResponse)
@@ -361,11 +474,18 @@ async def get_or_generate_first_segment(
     AI to generate the first segment and returns it.
     """
     ai_service = SceneSegmentAIService()
-    return await ai_service.get_or_generate_first_segment(
+    result = await ai_service.get_or_generate_first_segment(
         db=db,
         script_id=request.script_id,
         user_id=current_user.id
     )
+    UsageService.log_routed_ai_call(
+        db=db,
+        user_id=current_user.id,
+        call_type=AICallTypeEnum.SCENE_SEGMENT.value,
+        script_id=request.script_id
+    )
+    return result
 
 
 @router.put("/{script_id}/changes_old", response_model=ScriptChangesResponse)
@@ -462,7 +582,7 @@ async def shorten_component(
     Generate multiple shortened alternatives for a component's content using AI.
     Works for both ACTION and DIALOGUE components.
     """
-    return SceneSegmentAIService.shorten_component(db, component_id)
+    return await run_llm_call(SceneSegmentAIService.shorten_component, db, component_id, current_user.id)
 
 
 @router.post("/components/{component_id}/apply-shortened", response_model=ApplyShortenedTextResponse)
@@ -502,7 +622,7 @@ async def rewrite_component(
     Returns:
         RewriteComponentResponse: Original text and themed alternatives with explanations
     """
-    return SceneSegmentAIService.rewrite_component(db, component_id)
+    return await run_llm_call(SceneSegmentAIService.rewrite_component, db, component_id, current_user.id)
 
 
 @router.post("/components/{component_id}/apply-rewrite", response_model=ApplyRewriteTextResponse)
@@ -543,7 +663,7 @@ async def expand_component(
     Generate multiple expanded alternatives for a component's content using AI.
     Works for both ACTION and DIALOGUE components.
     """
-    return SceneSegmentAIService.expand_component(db, component_id)
+    return await run_llm_call(SceneSegmentAIService.expand_component, db, component_id, current_user.id)
 
 
 @router.post("/components/{component_id}/apply-expanded", response_model=ApplyExpandedTextResponse)
@@ -582,7 +702,7 @@ async def continue_component(
     Returns:
         ContinueComponentResponse: Original text and themed continuation alternatives with explanations
     """
-    return SceneSegmentAIService.continue_component(db, component_id)
+    return await run_llm_call(SceneSegmentAIService.continue_component, db, component_id, current_user.id)
 
 
 @router.post("/components/{component_id}/apply-continuation", response_model=ApplyContinuationResponse)
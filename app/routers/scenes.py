@@ -19,6 +19,8 @@ from app.schemas.scene import (
 from app.services.scene_service import SceneService, SceneGenerationService
 from app.services.openai_service import AzureOpenAIService
 from app.models.beats import Beat, ActEnum
+from app.models.usage import AICallTypeEnum
+from app.services.usage_service import UsageService
 
 router = APIRouter()
 
@@ -41,6 +43,13 @@ async def generate_scenes_for_beat(
         
         # Use the service to handle generation
         result = await scene_generator.generate_scenes(db, generation_request)
+        UsageService.log_routed_ai_call(
+            db=db,
+            user_id=current_user.id,
+            call_type=AICallTypeEnum.SCENE_DESCRIPTION.value,
+            script_id=request.script_id,
+            metadata={"beat_id": str(request.beat_id)}
+        )
         
         return result
 
@@ -70,6 +79,13 @@ async def generate_scenes_for_act(
         
         # Use the service to handle generation
         result = await scene_generator.generate_scenes(db, generation_request)
+        UsageService.log_routed_ai_call(
+            db=db,
+            user_id=current_user.id,
+            call_type=AICallTypeEnum.SCENE_DESCRIPTION.value,
+            script_id=request.script_id,
+            metadata={"act": request.act.value}
+        )
         
         return SceneGenerationResponse(
             status="success",
@@ -1,12 +1,14 @@
 # app/routers/scripts.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Header, Query, Response, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from typing import List
 from functools import partial
+from fastapi.concurrency import run_in_threadpool
 
 
+from app.config import settings
 from app.database import get_db
 from app.schemas.script import (
     Script,
@@ -14,13 +16,35 @@ from app.schemas.script import (
     ScriptUpdate,
     ScriptOut,
     ScriptList,
-    ScriptOutForUI
+    ScriptOutForUI,
+    ScriptUploadUrlRequest,
+    ScriptUploadUrlResponse,
+    ScriptUploadCompleteRequest,
+    ScriptDownloadUrlResponse
 )
 from app.services.script_service import ScriptService
+from app.services.script_upload_service import ScriptUploadService
 from app.services.azure_service import AzureStorageService
 from app.auth.dependencies import get_current_user
 from app.schemas.user import User
 from app.schemas.beat import ScriptWithBeatsResponse
+from app.schemas.snapshot import ScriptSnapshotResponse
+from app.schemas.changes import ScriptChangesResponse
+from app.schemas.characters import CharacterIndexResponse
+from app.schemas.pagination import ScriptPageEstimate
+from app.schemas.exports import PdfExportJobResponse
+from app.schemas.operations import OperationBatchRequest, OperationBatchResponse, OperationLogResponse
+from app.services.script_snapshot_service import ScriptSnapshotService
+from app.services.script_changes_service import ScriptChangesService
+from app.services.character_index_service import CharacterIndexService
+from app.services.page_estimate_service import PageEstimateService
+from app.services.pdf_export_service import PdfExportService
+from app.services.screenplay_export import content_disposition
+from app.services import live_sync
+from app.services.operation_log_service import OperationLogService
+from app.services.llm_router import run_llm_call
+from app.services.http_caching import check_etag, etag_matches, not_modified, weak_etag
+from app.services.script_revision import get_script_modified_at, get_script_revision
 
 from app.auth.ai_guard import get_ai_call_guard
 from app.models.usage import AICallTypeEnum
@@ -78,10 +102,18 @@ async def list_scripts(
 @router.get("/{script_id}", response_model=ScriptOut)
 async def get_script(
     script_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific script by ID"""
+    modified_at = get_script_modified_at(db, script_id, current_user.id)
+    etag = weak_etag("script", int(modified_at.timestamp() * 1_000_000)) if modified_at else None
+    cached = check_etag(response, if_none_match, etag)
+    if cached:
+        return cached
+
     script = ScriptService.get_script(db=db, script_id=script_id)
     if script.user_id != current_user.id:
         raise HTTPException(
@@ -129,10 +161,15 @@ async def delete_script(
 async def upload_script_file(
     script_id: UUID,
     file: UploadFile = File(...),
+    import_segments: bool = True,
+    replace_existing: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Upload a script file to Azure Blob Storage"""
+    """
+    Upload a script file to Azure Blob Storage.
+    Plain text, Fountain, PDF and DOCX files are also imported as editable scene segments.
+    """
     existing_script = ScriptService.get_script(db=db, script_id=script_id)
     if existing_script.user_id != current_user.id:
         raise HTTPException(
@@ -140,11 +177,63 @@ async def upload_script_file(
             detail="Not authorized to modify this script"
         )
     
-    # Upload file to Azure Blob Storage
-    azure_service = AzureStorageService()
-    file_url = await azure_service.upload_file(file, script_id)
-    
-    # Update script with file URL
+    return await ScriptUploadService.upload_and_import(
+        db=db,
+        script_id=script_id,
+        file=file,
+        import_segments=import_segments,
+        replace_existing=replace_existing
+    )
+
+
+@router.post("/{script_id}/upload-url", response_model=ScriptUploadUrlResponse)
+async def get_script_upload_url(
+    script_id: UUID,
+    request: ScriptUploadUrlRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Issue a short-lived SAS URL so the client can PUT the file straight to blob storage.
+    Call /upload-complete afterwards to attach it to the script.
+    """
+    existing_script = ScriptService.get_script(db=db, script_id=script_id)
+    if existing_script.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to modify this script"
+        )
+
+    sas = AzureStorageService().generate_upload_sas(
+        script_id=script_id,
+        filename=request.filename,
+        content_type=request.content_type,
+        size=request.size
+    )
+    return ScriptUploadUrlResponse(
+        upload_url=sas["url"],
+        blob_name=sas["blob_name"],
+        expires_at=sas["expires_at"],
+        headers=sas["headers"]
+    )
+
+
+@router.post("/{script_id}/upload-complete", response_model=ScriptOut)
+async def complete_script_upload(
+    script_id: UUID,
+    request: ScriptUploadCompleteRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Verify a direct-to-blob upload (size, content type) and attach it to the script"""
+    existing_script = ScriptService.get_script(db=db, script_id=script_id)
+    if existing_script.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to modify this script"
+        )
+
+    file_url = await AzureStorageService().verify_uploaded_blob(script_id, request.blob_name)
     script_update = ScriptUpdate(
         is_file_uploaded=True,
         file_url=file_url
@@ -156,6 +245,285 @@ async def upload_script_file(
     )
 
 
+@router.get("/{script_id}/download-url", response_model=ScriptDownloadUrlResponse)
+async def get_script_download_url(
+    script_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Issue a short-lived read-only SAS URL for the script's uploaded file"""
+    existing_script = ScriptService.get_script(db=db, script_id=script_id)
+    if existing_script.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this script"
+        )
+
+    azure_service = AzureStorageService()
+    blob_name = azure_service.blob_name_from_url(existing_script.file_url) if existing_script.file_url else None
+    if not blob_name:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No file uploaded for this script"
+        )
+
+    sas = azure_service.generate_download_sas(blob_name)
+    return ScriptDownloadUrlResponse(download_url=sas["url"], expires_at=sas["expires_at"])
+
+
+@router.get("/{script_id}/snapshot", response_model=ScriptSnapshotResponse)
+async def get_script_snapshot(
+    script_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Everything the editor needs to open a script (beats, scene descriptions,
+    segments and components) in one pre-serialized payload.
+
+    Send the returned ETag back as If-None-Match to get a 304 while the script's
+    revision is unchanged.
+    """
+    etag, payload = ScriptSnapshotService.get_snapshot(
+        db=db,
+        script_id=script_id,
+        user_id=current_user.id,
+        if_none_match=if_none_match
+    )
+    if payload is None:
+        return not_modified(etag)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+    )
+
+
+@router.get("/{script_id}/changes", response_model=ScriptChangesResponse)
+async def get_script_changes(
+    script_id: UUID,
+    since: int = Query(..., ge=0, description="Script revision the client last synced to"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Segments and components created, updated or soft-deleted since revision `since`.
+
+    Clients open a script from the snapshot, then poll this with the last revision
+    they saw; the response size is proportional to the edits, not the script.
+    """
+    return ScriptChangesService.get_changes(
+        db=db,
+        script_id=script_id,
+        user_id=current_user.id,
+        since=since
+    )
+
+
+@router.get("/{script_id}/characters", response_model=CharacterIndexResponse)
+async def get_script_characters(
+    script_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Speaking characters of a script, most lines first.
+
+    Line and word counts cover DIALOGUE components; names are matched
+    case-insensitively. Served from the precomputed character index.
+    """
+    return CharacterIndexService.get_index(
+        db=db,
+        script_id=script_id,
+        user_id=current_user.id
+    )
+
+
+@router.get("/{script_id}/page-estimate", response_model=ScriptPageEstimate)
+async def get_script_page_estimate(
+    script_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Estimated page count and runtime of the script, its segments and its beats.
+
+    Only segments edited since the last estimate are laid out again, so this is
+    cheap to call after every autosave; the ETag follows the script revision.
+    """
+    revision = get_script_revision(db, script_id, current_user.id)
+    etag = weak_etag("pages", revision, settings.PAGINATION_LINES_PER_PAGE) if revision is not None else None
+    cached = check_etag(response, if_none_match, etag)
+    if cached:
+        return cached
+    return PageEstimateService.get_estimate(
+        db=db,
+        script_id=script_id,
+        user_id=current_user.id
+    )
+
+
+@router.get("/{script_id}/export/pdf")
+async def export_script_pdf(
+    script_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the script as an industry-format PDF.
+
+    Renders run in a process pool and are kept per script revision, so only the
+    first download after an edit renders. Large scripts not rendered yet get a
+    409; create an export job for them instead. Only Western European (cp1252)
+    characters can be printed; scripts containing others get a 422 naming them.
+    """
+    script = PdfExportService.get_script(db, script_id, current_user.id)
+    etag = weak_etag("pdf", script.revision, settings.PAGINATION_LINES_PER_PAGE)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    content, page_count = await PdfExportService.get_pdf(db, script_id, script.title, script.revision)
+    return Response(
+        content=content,
+        media_type="application/pdf",
+        headers={
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+            "Content-Disposition": content_disposition(script.title, "pdf"),
+            "X-Page-Count": str(page_count)
+        }
+    )
+
+
+@router.post(
+    "/{script_id}/export/pdf/jobs",
+    response_model=PdfExportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def create_script_pdf_job(
+    script_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Render the script's current revision to PDF in the background; poll the job, then download it.
+
+    The job fails, naming them, if the script contains characters outside cp1252.
+    """
+    return await PdfExportService.create_job(db, script_id, current_user.id)
+
+
+@router.get("/{script_id}/export/pdf/jobs/{job_id}", response_model=PdfExportJobResponse)
+async def get_script_pdf_job(
+    script_id: UUID,
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return PdfExportService.get_job(db, script_id, job_id, current_user.id)
+
+
+@router.get("/{script_id}/export/pdf/jobs/{job_id}/download")
+async def download_script_pdf_job(
+    script_id: UUID,
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    The finished job's PDF: 409 while it is still rendering, 410 once a later
+    revision of the script has been rendered in its place.
+    """
+    script = PdfExportService.get_script(db, script_id, current_user.id)
+    content, page_count = PdfExportService.get_job_result(db, script_id, job_id, current_user.id)
+    return Response(
+        content=content,
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": content_disposition(script.title, "pdf"),
+            "X-Page-Count": str(page_count)
+        }
+    )
+
+
+@router.post("/{script_id}/operations", response_model=OperationBatchResponse)
+async def submit_script_operations(
+    script_id: UUID,
+    request: OperationBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply text edits to component content, merged with any edits other sessions
+    made since `base_revision`.
+
+    Send only the changed ranges; the response carries the edits as applied and
+    the new revision to base the next batch on.
+    """
+    return OperationLogService.submit(
+        db=db,
+        script_id=script_id,
+        user_id=current_user.id,
+        request=request
+    )
+
+
+@router.get("/{script_id}/operations", response_model=OperationLogResponse)
+async def get_script_operations(
+    script_id: UUID,
+    since: int = Query(..., ge=0, description="Script revision the client last synced to"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Edits logged after revision `since`, oldest first, for rebasing unsent local edits."""
+    return OperationLogService.get_operations(
+        db=db,
+        script_id=script_id,
+        user_id=current_user.id,
+        since=since
+    )
+
+
+@router.websocket("/{script_id}/live")
+async def script_live_updates(
+    websocket: WebSocket,
+    script_id: UUID,
+    token: str = Query(..., description="Access token (browsers cannot set headers on WebSockets)"),
+    since: Optional[int] = Query(None, ge=0, description="Last revision the client has; omit to start from now")
+):
+    """
+    Live segment and component changes for one script.
+
+    Every message is a ScriptChangesResponse (the same shape as GET /changes)
+    covering the edits committed by any session since the previous message.
+    """
+    if not settings.LIVE_SYNC_ENABLED:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    revision = await run_in_threadpool(live_sync.authorize, script_id, token)
+    if revision is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber = live_sync.hub.subscribe(
+        script_id, websocket, revision if since is None else min(since, revision)
+    )
+    # Catch up on anything after `since`
+    live_sync.hub.notify(script_id, revision)
+    try:
+        while True:
+            # Client messages are not used; reading just detects the disconnect
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_sync.hub.unsubscribe(script_id, subscriber)
+
+
 @router.post("/with-ai", response_model=ScriptWithBeatsResponse)
 async def create_script_with_ai(
     script: ScriptCreate,
@@ -166,7 +534,8 @@ async def create_script_with_ai(
 
 
     """Create a new script with AI-generated beat sheet"""
-    script_resp = ScriptService.create_script_with_beats(
+    script_resp = await run_llm_call(
+        ScriptService.create_script_with_beats,
         db=db, 
         script=script, 
         user_id=current_user.id
@@ -0,0 +1,37 @@
+# app/routers/search.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+
+from app.database import get_db
+from app.auth.dependencies import get_current_user
+from app.schemas.user import User
+from app.schemas.search import SearchResponse
+from app.services.search_service import SearchService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchResponse)
+async def search_scripts(
+    q: str = Query(..., min_length=1, max_length=200, description='Web-style query, e.g. "front door" -night'),
+    script_id: Optional[UUID] = Query(None, description="Limit the search to one script"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Search the current user's scripts: component text and character names, scene
+    descriptions, and beat titles and descriptions. Best matches first, with
+    highlighted snippets and the positions needed to open each hit in the editor.
+    """
+    return SearchService.search(
+        db=db,
+        user_id=current_user.id,
+        text=q,
+        script_id=script_id,
+        limit=limit,
+        offset=offset
+    )
@@ -6,9 +6,11 @@ from pydantic import BaseModel
 
 from app.database import get_db
 from app.services.openai_service import AzureOpenAIService
+from app.services.llm_router import run_llm_call
 from app.services.scene_description_service import SceneDescriptionService
 from app.schemas.scene_segment_ai import AISceneComponent, SceneSegmentGenerationRequest, ComponentType
 
+from fastapi.concurrency import iterate_in_threadpool
 from fastapi.responses import StreamingResponse
 import traceback
 import logging
@@ -36,7 +38,8 @@ async def test_beat_generation(
     openai_service = AzureOpenAIService()
     
     try:
-        beats = openai_service.generate_beat_sheet(
+        beats = await run_llm_call(
+            openai_service.generate_beat_sheet,
             title=script_data.title,
             subtitle=script_data.subtitle,
             genre=script_data.genre,
@@ -69,16 +72,18 @@ async def test_beat_generation_stream(
     openai_service = AzureOpenAIService()
     
     try:
-        beat_stream = openai_service.generate_beat_sheet_stream(
+        beat_stream = await run_llm_call(
+            openai_service.generate_beat_sheet_stream,
             title=script_data.title,
             subtitle=script_data.subtitle,
             genre=script_data.genre,
             story=script_data.story
         )
         
-        # Wrap the synchronous generator in an async generator for StreamingResponse.
+        # Wrap the synchronous generator in an async generator for StreamingResponse;
+        # each chunk is read in a worker thread so the event loop is never blocked.
         async def event_generator():
-            for partial in beat_stream:
+            async for partial in iterate_in_threadpool(beat_stream):
                 # Convert each Beat (Pydantic model) to a dict; here, partial is a List[Beat]
                 beats_data = [beat.model_dump() for beat in partial]
                 # Send a progress update containing the current partial beat sheet
@@ -116,7 +121,8 @@ async def test_scene_generation_for_beat(
     openai_service = AzureOpenAIService()
     
     try:
-        scenes = openai_service.generate_scenes_for_beat(
+        scenes = await run_llm_call(
+            openai_service.generate_scenes_for_beat,
             beat_title=scene_input.beat_title,
             beat_description=scene_input.beat_description,
             script_genre=scene_input.script_genre,
@@ -158,7 +164,8 @@ async def test_scene_generation_for_act(
     openai_service = AzureOpenAIService()
     
     try:
-        scenes_by_beat = openai_service.generate_scenes_for_act(
+        scenes_by_beat = await run_llm_call(
+            openai_service.generate_scenes_for_act,
             act_beats=act_input.act_beats,
             script_genre=act_input.script_genre,
             tone=act_input.tone
@@ -197,7 +204,8 @@ async def test_scene_regeneration(
     openai_service = AzureOpenAIService()
     
     try:
-        regenerated_scene = openai_service.regenerate_scene(
+        regenerated_scene = await run_llm_call(
+            openai_service.regenerate_scene,
             scene_id=regen_input.scene_id,
             beat_context=regen_input.beat_context,
             previous_scene=regen_input.previous_scene,
@@ -284,7 +292,8 @@ async def test_scene_segment_generation(
     openai_service = AzureOpenAIService()
     
     try:
-        generated_segment = openai_service.generate_scene_segment(
+        generated_segment = await run_llm_call(
+            openai_service.generate_scene_segment,
             story_synopsis=request.story_synopsis,
             genre=request.genre,
             arc_structure=request.arc_structure,
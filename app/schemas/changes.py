@@ -0,0 +1,42 @@
+# app/schemas/changes.py
+from pydantic import BaseModel, UUID4, Field
+from typing import List, Optional
+from datetime import datetime
+
+from app.schemas.scene_segment import Component, SceneSegmentBase
+
+
+class SegmentChange(SceneSegmentBase):
+    """A segment row as of its last write; components are listed separately."""
+    id: UUID4
+    beat_id: Optional[UUID4] = None
+    scene_description_id: Optional[UUID4] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    is_deleted: bool = False
+    deleted_at: Optional[datetime] = None
+    revision: int
+
+    class Config:
+        from_attributes = True
+
+
+class ComponentChange(Component):
+    revision: int
+
+    class Config:
+        from_attributes = True
+
+
+class ScriptChangesResponse(BaseModel):
+    """
+    Segments and components created, updated or soft-deleted after `since`.
+
+    Apply them by id (rows with is_deleted=True are removed) and send `revision`
+    as the next `since`.
+    """
+    script_id: UUID4
+    since: int
+    revision: int = Field(..., description="Current script revision; use it as the next `since`")
+    segments: List[SegmentChange]
+    components: List[ComponentChange]
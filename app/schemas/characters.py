@@ -0,0 +1,27 @@
+# app/schemas/characters.py
+from pydantic import BaseModel, UUID4
+from typing import List, Optional
+
+
+class CharacterScene(BaseModel):
+    """A segment a character speaks in, with their dialogue counts there."""
+    segment_id: UUID4
+    segment_number: float
+    heading: Optional[str] = None
+    line_count: int
+    word_count: int
+
+
+class CharacterStats(BaseModel):
+    character_name: str
+    line_count: int
+    word_count: int
+    scene_count: int
+    first_appearance: CharacterScene
+    last_appearance: CharacterScene
+    scenes: List[CharacterScene]
+
+
+class CharacterIndexResponse(BaseModel):
+    script_id: UUID4
+    characters: List[CharacterStats]
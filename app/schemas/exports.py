@@ -0,0 +1,19 @@
+# app/schemas/exports.py
+from datetime import datetime
+from pydantic import BaseModel, UUID4, Field
+from typing import Optional
+
+from app.models.exports import PdfExportJobStatus
+
+
+class PdfExportJobResponse(BaseModel):
+    id: UUID4
+    script_id: UUID4
+    revision: int = Field(..., description="Script revision being rendered")
+    status: PdfExportJobStatus
+    error: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
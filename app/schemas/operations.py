@@ -0,0 +1,49 @@
+# app/schemas/operations.py
+from pydantic import BaseModel, UUID4, Field
+from typing import List, Optional
+
+
+class TextChange(BaseModel):
+    """Replace `delete_count` characters at `position` with `insert` (positions in code points)."""
+    position: int = Field(..., ge=0)
+    delete_count: int = Field(0, ge=0)
+    insert: str = ""
+
+
+class ComponentEdit(BaseModel):
+    """
+    Changes to one component's content. Ranges are ascending, non-overlapping and
+    relative to the content before this edit.
+    """
+    component_id: UUID4
+    changes: List[TextChange] = Field(..., min_length=1)
+
+
+class OperationBatchRequest(BaseModel):
+    base_revision: int = Field(..., ge=0, description="Script revision the edits were made against")
+    client_id: Optional[str] = Field(None, max_length=64, description="Lets a session recognise its own edits")
+    edits: List[ComponentEdit] = Field(..., min_length=1, description="Applied in order")
+
+
+class OperationBatchResponse(BaseModel):
+    script_id: UUID4
+    base_revision: int
+    revision: int
+    applied: List[ComponentEdit] = Field(
+        ..., description="The edits as applied, after merging with concurrent edits"
+    )
+    dropped_component_ids: List[UUID4] = Field(
+        default_factory=list, description="Components deleted meanwhile; their edits were discarded"
+    )
+
+
+class LoggedEdit(ComponentEdit):
+    revision: int
+    client_id: Optional[str] = None
+
+
+class OperationLogResponse(BaseModel):
+    script_id: UUID4
+    since: int
+    revision: int
+    operations: List[LoggedEdit]
@@ -0,0 +1,35 @@
+# app/schemas/pagination.py
+from pydantic import BaseModel, UUID4, Field
+from typing import List, Optional
+
+
+class SegmentPageEstimate(BaseModel):
+    segment_id: UUID4
+    segment_number: float
+    beat_id: Optional[UUID4] = None
+    start_page: int = Field(..., description="Page the segment starts on (1-based)")
+    pages: float
+    eighths: int = Field(..., description="Length in eighths of a page, at least 1 for a non-empty segment")
+    runtime_seconds: float
+
+
+class BeatPageEstimate(BaseModel):
+    beat_id: UUID4
+    position: int
+    beat_title: str
+    segment_count: int
+    pages: float
+    eighths: int
+    runtime_seconds: float
+    target_page_length: Optional[str] = Field(None, description="Page length suggested when the beat sheet was generated")
+
+
+class ScriptPageEstimate(BaseModel):
+    script_id: UUID4
+    revision: int
+    lines_per_page: int
+    page_count: int
+    pages: float
+    runtime_seconds: float
+    segments: List[SegmentPageEstimate]
+    beats: List[BeatPageEstimate]
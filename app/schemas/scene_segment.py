@@ -1,6 +1,8 @@
 # app/schemas/scene_segment.py
-from pydantic import BaseModel, UUID4, Field, validator
+from pydantic import BaseModel, UUID4, Field, TypeAdapter, validator
 from typing import List, Optional, Dict, Any
+from typing_extensions import TypedDict
+from uuid import UUID
 from datetime import datetime
 from enum import Enum
 
@@ -30,7 +32,7 @@ class ComponentBase(BaseModel):
 
 class ComponentCreate(ComponentBase):
     id: UUID4
-    pass
+    position: Optional[float] = Field(None, description="Position within the segment; omit to append at the end")
     class Config:
         from_attributes = True
 
@@ -54,6 +56,7 @@ class SceneSegmentBase(BaseModel):
 
 
 class SceneSegmentCreate(SceneSegmentBase):
+    segment_number: Optional[float] = Field(None, description="Position within the script; omit to append at the end")
     beat_id: Optional[UUID4] = None
     scene_description_id: Optional[UUID4] = None
     components: List[ComponentCreate] = Field(..., min_items=1, description="Components that make up this segment")
@@ -97,6 +100,22 @@ class ReorderSegmentRequest(BaseModel):
     new_segment_number: float
 
 
+class MoveSegmentsRequest(BaseModel):
+    segment_ids: List[UUID4] = Field(..., min_length=1, description="Segments to move, kept in their current order")
+    after_segment_id: Optional[UUID4] = Field(None, description="Place them after this segment; null moves them to the start")
+
+
+class MoveComponentsRequest(BaseModel):
+    component_ids: List[UUID4] = Field(..., min_length=1, description="Components to move, kept in their current order")
+    after_component_id: Optional[UUID4] = Field(None, description="Place them after this component; null moves them to the start")
+
+
+class MoveRangeResponse(BaseModel):
+    parent_id: UUID4
+    renumbered: bool = Field(..., description="True if the parent's items were respaced; refetch their order")
+    positions: Dict[str, float] = Field(..., description="New order key of each moved item")
+
+
 class BulkCreateSegmentsRequest(BaseModel):
     script_id: UUID4
     beat_id: Optional[UUID4] = None
@@ -109,6 +128,58 @@ class SegmentListResponse(BaseModel):
     total: int
 
 
+# Row shapes for the serialization fast path. They mirror Component / SceneSegment /
+# SegmentListResponse field for field, but are only used to dump plain dicts built
+# from DB rows, so nothing is validated on the way out.
+class ComponentRow(TypedDict):
+    id: UUID
+    scene_segment_id: UUID
+    component_type: str
+    position: float
+    content: str
+    character_name: Optional[str]
+    parenthetical: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    is_deleted: bool
+    deleted_at: Optional[datetime]
+
+
+class SegmentRow(TypedDict):
+    id: UUID
+    script_id: UUID
+    segment_number: float
+    beat_id: Optional[UUID]
+    scene_description_id: Optional[UUID]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    is_deleted: bool
+    deleted_at: Optional[datetime]
+    components: List[ComponentRow]
+
+
+class SegmentListRows(TypedDict):
+    segments: List[SegmentRow]
+    total: int
+
+
+SEGMENT_LIST_ADAPTER = TypeAdapter(SegmentListRows)
+
+
+class ScreenplayImportRequest(BaseModel):
+    text: str = Field(..., min_length=1, description="Whole screenplay as plain text or Fountain")
+    replace_existing: bool = Field(False, description="Soft-delete the script's current segments first")
+
+
+class ScreenplayImportResponse(BaseModel):
+    script_id: UUID4
+    segments_created: int
+    components_created: int
+    replaced_segments: int = 0
+    first_segment_number: Optional[float] = None
+    last_segment_number: Optional[float] = None
+
+
 #### For Script Edits
 
 ### Writing the below component type class for just FE integration
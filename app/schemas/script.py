@@ -1,7 +1,7 @@
 # app/schemas/script.py
 from pydantic import BaseModel, Field, HttpUrl, UUID4
 from datetime import datetime
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 from uuid import UUID
 
 from enum import Enum
@@ -52,6 +52,25 @@ class Script(ScriptBase):
     class Config:
         from_attributes = True
 
+class ScriptUploadUrlRequest(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str
+    size: int = Field(..., gt=0, description="File size in bytes")
+
+class ScriptUploadUrlResponse(BaseModel):
+    upload_url: str
+    blob_name: str
+    expires_at: datetime
+    method: str = "PUT"
+    headers: Dict[str, str] = Field(default_factory=dict, description="Headers the client must send with the PUT")
+
+class ScriptUploadCompleteRequest(BaseModel):
+    blob_name: str
+
+class ScriptDownloadUrlResponse(BaseModel):
+    download_url: str
+    expires_at: datetime
+
 class ScriptOut(Script):
     """Script model for API responses with user information"""
     # user_email: str
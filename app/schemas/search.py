@@ -0,0 +1,31 @@
+# app/schemas/search.py
+from pydantic import BaseModel, UUID4, Field
+from typing import List, Literal, Optional
+
+
+class SearchHit(BaseModel):
+    """
+    One matching component, scene description or beat. The id/position fields of
+    the levels above the hit are filled in so the editor can jump straight to it.
+    """
+    kind: Literal["component", "scene_description", "beat"]
+    script_id: UUID4
+    script_title: str
+    rank: float
+    snippet: str = Field(..., description="Matching text with hits wrapped in <mark></mark>")
+    beat_id: Optional[UUID4] = None
+    beat_position: Optional[int] = None
+    scene_description_id: Optional[UUID4] = None
+    scene_description_position: Optional[int] = None
+    segment_id: Optional[UUID4] = None
+    segment_number: Optional[float] = None
+    component_id: Optional[UUID4] = None
+    component_position: Optional[float] = None
+    component_type: Optional[str] = None
+
+
+class SearchResponse(BaseModel):
+    query: str
+    limit: int
+    offset: int
+    results: List[SearchHit]
@@ -0,0 +1,16 @@
+# app/schemas/snapshot.py
+from pydantic import BaseModel, UUID4
+from typing import List
+
+from app.schemas.beat import BeatResponse
+from app.schemas.scene_description import SceneDescriptionResponse
+from app.schemas.scene_segment import SceneSegment
+
+
+class ScriptSnapshotResponse(BaseModel):
+    """Everything the editor needs to open a script, as of `revision`."""
+    script_id: UUID4
+    revision: int
+    beats: List[BeatResponse]
+    scene_descriptions: List[SceneDescriptionResponse]
+    segments: List[SceneSegment]
@@ -1,64 +1,153 @@
 # app/services/azure_service.py
 from fastapi import HTTPException, UploadFile, status
-from azure.storage.blob import BlobServiceClient, ContentSettings
-from azure.core.exceptions import AzureError
+from azure.storage.blob import BlobBlock, BlobSasPermissions, ContentSettings, generate_blob_sas
+from azure.storage.blob.aio import BlobServiceClient
+from azure.core.exceptions import AzureError, ResourceNotFoundError
+from azure.core.pipeline.transport import AioHttpTransport
 import logging
 from uuid import UUID
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
 from app.config import settings
 import aiohttp
-import asyncio
+import base64
+import os
+import re
 
 logger = logging.getLogger(__name__)
 
+# Leading bytes of each allowed upload type; text/plain is checked for binary content
+FILE_SIGNATURES = {
+    "application/pdf": (b"%PDF-",),
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": (b"PK\x03\x04",),
+    "application/msword": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+}
+
+UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^A-Za-z0-9._ -]")
+
+# Process-wide async client sharing one aiohttp connection pool
+_blob_service_client: Optional[BlobServiceClient] = None
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_blob_service_client() -> BlobServiceClient:
+    """
+    Return the shared async BlobServiceClient.
+
+    It is normally created at startup; creating it lazily here keeps scripts and
+    workers that skip the startup hook working. Must be called from a running loop.
+    """
+    global _blob_service_client, _http_session
+    if _blob_service_client is None:
+        if not settings.AZURE_STORAGE_CONNECTION_STRING:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Blob storage is not configured"
+            )
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=settings.AZURE_STORAGE_MAX_CONNECTIONS)
+        )
+        _blob_service_client = BlobServiceClient.from_connection_string(
+            settings.AZURE_STORAGE_CONNECTION_STRING,
+            transport=AioHttpTransport(session=_http_session, session_owner=False)
+        )
+    return _blob_service_client
+
+
+async def init_blob_service_client() -> None:
+    """Create the shared client at startup (no-op when storage is not configured)."""
+    if settings.AZURE_STORAGE_CONNECTION_STRING:
+        get_blob_service_client()
+
+
+async def close_blob_service_client() -> None:
+    """Close the shared client and its connection pool at shutdown."""
+    global _blob_service_client, _http_session
+    if _blob_service_client is not None:
+        await _blob_service_client.close()
+        _blob_service_client = None
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+class StagedBlobUpload:
+    """
+    Block blob upload fed chunk by chunk.
+
+    At most one block is buffered; full blocks are staged as they fill up and the
+    blob only becomes visible when the block list is committed. Abandoned uploads
+    leave uncommitted blocks that Azure discards on its own.
+    """
+
+    def __init__(self, blob_client, content_type: str, block_size: int):
+        self.blob_client = blob_client
+        self.content_type = content_type
+        self.block_size = block_size
+        self._buffer = bytearray()
+        self._block_ids: List[str] = []
+        self.size = 0
+
+    async def write(self, data: bytes) -> None:
+        self._buffer.extend(data)
+        self.size += len(data)
+        while len(self._buffer) >= self.block_size:
+            block = bytes(self._buffer[:self.block_size])
+            del self._buffer[:self.block_size]
+            await self._stage(block)
+
+    async def _stage(self, block: bytes) -> None:
+        block_id = base64.b64encode(f"{len(self._block_ids):08d}".encode()).decode()
+        await self.blob_client.stage_block(block_id, block, length=len(block))
+        self._block_ids.append(block_id)
+
+    async def commit(self) -> str:
+        """Stage the last partial block, commit the block list and return the blob URL."""
+        if self._buffer or not self._block_ids:
+            await self._stage(bytes(self._buffer))
+            self._buffer.clear()
+        await self.blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in self._block_ids],
+            content_settings=ContentSettings(content_type=self.content_type)
+        )
+        return self.blob_client.url
+
 class AzureStorageService:
     def __init__(self):
-        self.connection_string = settings.AZURE_STORAGE_CONNECTION_STRING
         self.container_name = settings.AZURE_CONTAINER_NAME
         self.allowed_content_types = settings.AZURE_ALLOWED_FILE_TYPES
         self.max_file_size = settings.MAX_FILE_SIZE
 
+    def get_blob_client(self, blob_name: str):
+        return get_blob_service_client().get_blob_client(self.container_name, blob_name)
+
     async def upload_file(self, file: UploadFile, script_id: UUID) -> str:
         """
         Upload a file to Azure Blob Storage
         """
         try:
-            # Validate file
-            await self._validate_file(file)
-            
-            # Generate blob name
-            blob_name = f"scripts/{script_id}/{file.filename}"
-            
-            # Create blob service client
-            blob_service_client = BlobServiceClient.from_connection_string(
-                self.connection_string
-            )
-            
-            # Get container client
-            container_client = blob_service_client.get_container_client(
-                self.container_name
-            )
-            
-            # Get blob client
-            blob_client = container_client.get_blob_client(blob_name)
-            
-            # Set content settings
-            content_settings = ContentSettings(
-                content_type=file.content_type
+            self.validate_content_type(file.content_type)
+            upload = self.start_staged_upload(
+                script_id, self.safe_filename(file.filename), file.content_type
             )
-            
-            # Upload file
-            file_contents = await file.read()
-            await asyncio.to_thread(
-                blob_client.upload_blob,
-                file_contents,
-                overwrite=True,
-                content_settings=content_settings
-            )
-            
+
+            # Stream the file in chunks, checking size and type as it arrives
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                if upload.size == 0:
+                    self.validate_signature(file.content_type, chunk)
+                if upload.size + len(chunk) > self.max_file_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File too large. Maximum size: {self.max_file_size} bytes"
+                    )
+                await upload.write(chunk)
+
             # Return the URL
-            return blob_client.url
-            
+            return await upload.commit()
+
+        except HTTPException:
+            raise
         except AzureError as e:
             logger.error(f"Azure storage error: {str(e)}")
             raise HTTPException(
@@ -74,72 +163,175 @@ class AzureStorageService:
         finally:
             await file.close()
 
-    async def delete_file(self, script_id: UUID, filename: str) -> bool:
+    def validate_content_type(self, content_type: Optional[str]) -> None:
+        if content_type not in self.allowed_content_types:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type not allowed. Allowed types: {self.allowed_content_types}"
+            )
+
+    def validate_signature(self, content_type: str, head: bytes) -> None:
+        """Check that the first bytes of an upload match its declared content type."""
+        signatures = FILE_SIGNATURES.get(content_type)
+        if signatures is not None:
+            valid = head.startswith(signatures)
+        else:
+            valid = b"\x00" not in head
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File content does not match its type ({content_type})"
+            )
+
+    def start_staged_upload(self, script_id: UUID, filename: str, content_type: str) -> StagedBlobUpload:
+        """Begin a block-by-block upload of scripts/{script_id}/{filename}."""
+        blob_client = self.get_blob_client(f"scripts/{script_id}/{filename}")
+        return StagedBlobUpload(blob_client, content_type, settings.AZURE_UPLOAD_BLOCK_SIZE)
+
+    @staticmethod
+    def safe_filename(filename: str) -> str:
+        name = UNSAFE_FILENAME_CHARS_RE.sub("_", os.path.basename(filename or "")).strip(" .")
+        if not name:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid file name"
+            )
+        return name[:200]
+
+    def blob_name_from_url(self, url: str) -> Optional[str]:
+        """Blob name of a URL in our container, e.g. a Script.file_url."""
+        path = unquote(urlparse(url).path).lstrip("/")
+        prefix = f"{self.container_name}/"
+        return path[len(prefix):] if path.startswith(prefix) else None
+
+    def _generate_sas_url(
+        self,
+        blob_name: str,
+        permission: BlobSasPermissions,
+        ttl_minutes: int,
+        **sas_options: Any
+    ) -> Dict[str, Any]:
+        credential = get_blob_service_client().credential
+        account_key = getattr(credential, "account_key", None)
+        if not account_key:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Blob storage is not configured with an account key for SAS tokens"
+            )
+        # Small backdate so clients with skewed clocks are not rejected
+        starts_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=ttl_minutes)
+        token = generate_blob_sas(
+            account_name=credential.account_name,
+            container_name=self.container_name,
+            blob_name=blob_name,
+            account_key=account_key,
+            permission=permission,
+            start=starts_at,
+            expiry=expires_at,
+            protocol="https",
+            **sas_options
+        )
+        blob_url = self.get_blob_client(blob_name).url
+        return {"url": f"{blob_url}?{token}", "blob_name": blob_name, "expires_at": expires_at}
+
+    def generate_upload_sas(
+        self,
+        script_id: UUID,
+        filename: str,
+        content_type: str,
+        size: int
+    ) -> Dict[str, Any]:
         """
-        Delete a file from Azure Blob Storage
+        Short-lived SAS URL that only allows creating/writing scripts/{script_id}/{filename}.
         """
-        try:
-            blob_name = f"scripts/{script_id}/{filename}"
-            
-            blob_service_client = BlobServiceClient.from_connection_string(
-                self.connection_string
-            )
-            container_client = blob_service_client.get_container_client(
-                self.container_name
+        self.validate_content_type(content_type)
+        if size <= 0 or size > self.max_file_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size: {self.max_file_size} bytes"
             )
-            blob_client = container_client.get_blob_client(blob_name)
-            
-            await asyncio.to_thread(blob_client.delete_blob)
-            return True
-            
-        except AzureError as e:
-            logger.error(f"Azure storage error: {str(e)}")
-            return False
+        blob_name = f"scripts/{script_id}/{self.safe_filename(filename)}"
+        result = self._generate_sas_url(
+            blob_name,
+            BlobSasPermissions(create=True, write=True),
+            settings.AZURE_SAS_UPLOAD_TTL_MINUTES
+        )
+        result["headers"] = {"x-ms-blob-type": "BlockBlob", "x-ms-blob-content-type": content_type}
+        return result
+
+    def generate_download_sas(self, blob_name: str) -> Dict[str, Any]:
+        """Short-lived read-only SAS URL for one blob, served as an attachment."""
+        filename = blob_name.rsplit("/", 1)[-1]
+        return self._generate_sas_url(
+            blob_name,
+            BlobSasPermissions(read=True),
+            settings.AZURE_SAS_DOWNLOAD_TTL_MINUTES,
+            content_disposition=f'attachment; filename="{filename}"'
+        )
 
-    async def _validate_file(self, file: UploadFile):
+    async def verify_uploaded_blob(self, script_id: UUID, blob_name: str) -> str:
         """
-        Validate file size and type
+        Check a directly uploaded blob before it is attached to a script.
+
+        The blob must live under scripts/{script_id}/, respect the size limit, carry an
+        allowed content type and start with that type's signature. Rejected blobs are
+        deleted. Returns the blob URL (without SAS token).
         """
-        if file.content_type not in self.allowed_content_types:
+        if not blob_name.startswith(f"scripts/{script_id}/") or ".." in blob_name:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type not allowed. Allowed types: {self.allowed_content_types}"
+                detail="Blob does not belong to this script"
+            )
+        blob_client = self.get_blob_client(blob_name)
+        try:
+            properties = await blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Uploaded file not found"
             )
-        
-        # Check file size
-        file_size = 0
-        while chunk := await file.read(8192):
-            file_size += len(chunk)
-            if file_size > self.max_file_size:
+
+        try:
+            content_type = properties.content_settings.content_type
+            self.validate_content_type(content_type)
+            if properties.size <= 0 or properties.size > self.max_file_size:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File too large. Maximum size: {self.max_file_size} bytes"
                 )
-        
-        # Reset file position
-        await file.seek(0)
+            downloader = await blob_client.download_blob(offset=0, length=min(properties.size, 512))
+            self.validate_signature(content_type, await downloader.readall())
+        except HTTPException:
+            await blob_client.delete_blob()
+            raise
+        return blob_client.url
+
+    async def delete_file(self, script_id: UUID, filename: str) -> bool:
+        """
+        Delete a file from Azure Blob Storage
+        """
+        try:
+            blob_client = self.get_blob_client(f"scripts/{script_id}/{filename}")
+            await blob_client.delete_blob()
+            return True
+
+        except AzureError as e:
+            logger.error(f"Azure storage error: {str(e)}")
+            return False
 
     async def get_file_url(self, script_id: UUID, filename: str) -> Optional[str]:
         """
         Get the URL for a file
         """
         try:
-            blob_name = f"scripts/{script_id}/{filename}"
-            
-            blob_service_client = BlobServiceClient.from_connection_string(
-                self.connection_string
-            )
-            container_client = blob_service_client.get_container_client(
-                self.container_name
-            )
-            blob_client = container_client.get_blob_client(blob_name)
-            
+            blob_client = self.get_blob_client(f"scripts/{script_id}/{filename}")
+
             # Check if blob exists
-            exists = await asyncio.to_thread(blob_client.exists)
-            if exists:
+            if await blob_client.exists():
                 return blob_client.url
             return None
-            
+
         except AzureError as e:
             logger.error(f"Azure storage error: {str(e)}")
-            return None
\ No newline at end of file
+            return None
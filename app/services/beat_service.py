@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select, update
 from fastapi import HTTPException, status
 from typing import List, Optional
 from uuid import UUID
@@ -7,8 +7,10 @@ import logging
 
 from app.models.script import Script
 from app.models.beats import Beat, MasterBeatSheet, BeatSheetType
+from app.models.scene_segments import SceneSegment
 from app.schemas.beat import BeatCreate, BeatUpdate
 from app.schemas.script import ScriptCreationMethod
+from app.services.script_revision import bump_script_revision, segment_revision
 
 logger = logging.getLogger(__name__)
 
@@ -145,12 +147,19 @@ class BeatSheetService:
         """
         Delete all beats for a script
         """
-        result = db.query(Beat).filter(
-            and_(
-                Beat.script_id == script_id,
-                Beat.user_id == user_id
-            )
-        ).delete(synchronize_session=False)
+        beat_filter = and_(
+            Beat.script_id == script_id,
+            Beat.user_id == user_id
+        )
+        bump_script_revision(db, script_ids=[script_id])
+        # Detach segments explicitly (the FK would SET NULL anyway) so delta sync sees them
+        db.execute(
+            update(SceneSegment)
+            .where(SceneSegment.beat_id.in_(select(Beat.id).where(beat_filter)))
+            .values(beat_id=None, revision=segment_revision()),
+            execution_options={"synchronize_session": False}
+        )
+        result = db.query(Beat).filter(beat_filter).delete(synchronize_session=False)
 
         if result == 0:
             raise HTTPException(
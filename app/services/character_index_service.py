@@ -0,0 +1,210 @@
+# app/services/character_index_service.py
+"""
+Per-script character index.
+
+`character_appearances` holds one row per (segment, speaker) with the number of
+DIALOGUE components and words that speaker has in the segment; names are
+compared without case or cue extensions, so "Dave (V.O.)" counts as DAVE.
+Whenever a segment's dialogue may have changed, its rows are rebuilt from that
+segment's components alone (a delete and an INSERT ... SELECT over a handful of
+rows), so keeping the index current costs the same for a one-page script and a
+feature.
+
+ORM writes are picked up by an after_flush listener; Core writes (screenplay
+import, clear_script, operation-log edits) call refresh_segments / refresh_script
+themselves. All of them already hold the script's row lock from the revision
+bump, so rebuilds of the same segment never interleave.
+
+Reading the index aggregates the precomputed rows; components are never scanned.
+"""
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Set
+from uuid import UUID
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, delete, event, func, inspect, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.characters import CharacterAppearance
+from app.models.scene_segments import ComponentType, SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.schemas.characters import CharacterIndexResponse, CharacterScene, CharacterStats
+
+logger = logging.getLogger(__name__)
+
+
+# Cue extensions the parser keeps on the name, e.g. "DAVE (V.O.) (CONT'D)"
+CUE_EXTENSIONS = r"(\s*\([^)]*\))+\s*$"
+
+
+def _speaker():
+    name = func.regexp_replace(SceneSegmentComponent.character_name, CUE_EXTENSIONS, "")
+    return func.upper(func.btrim(name))
+
+
+def _word_count():
+    # NULL for blank content, so it counts as zero words rather than one
+    words = func.regexp_split_to_array(func.nullif(func.btrim(SceneSegmentComponent.content), ""), r"\s+")
+    return func.coalesce(func.array_length(words, 1), 0)
+
+
+def _rebuild_statements(segment_condition):
+    """DELETE + INSERT ... SELECT rebuilding the rows of the segments matching the condition."""
+    speaker = _speaker()
+    rows = (
+        select(
+            SceneSegment.id,
+            speaker,
+            SceneSegment.script_id,
+            func.count(),
+            func.sum(_word_count()),
+        )
+        .join(SceneSegmentComponent, SceneSegmentComponent.scene_segment_id == SceneSegment.id)
+        .where(
+            and_(
+                segment_condition,
+                SceneSegment.is_deleted.is_(False),
+                SceneSegmentComponent.is_deleted.is_(False),
+                SceneSegmentComponent.component_type == ComponentType.DIALOGUE,
+                func.nullif(speaker, "").isnot(None)
+            )
+        )
+        .group_by(SceneSegment.id, speaker, SceneSegment.script_id)
+    )
+    return [
+        delete(CharacterAppearance).where(
+            CharacterAppearance.segment_id.in_(select(SceneSegment.id).where(segment_condition))
+        ),
+        insert(CharacterAppearance).from_select(
+            ["segment_id", "character_name", "script_id", "line_count", "word_count"], rows
+        ),
+    ]
+
+
+class CharacterIndexService:
+    @staticmethod
+    def refresh_segments(db: Session, segment_ids: Iterable[UUID]) -> None:
+        """Rebuild the index rows of the given segments. Does not commit."""
+        segment_ids = set(segment_ids)
+        if not segment_ids:
+            return
+        for statement in _rebuild_statements(SceneSegment.id.in_(segment_ids)):
+            db.execute(statement)
+
+    @staticmethod
+    def refresh_script(db: Session, script_id: UUID) -> None:
+        """Rebuild every index row of a script. Does not commit."""
+        for statement in _rebuild_statements(SceneSegment.script_id == script_id):
+            db.execute(statement)
+
+    @staticmethod
+    def get_index(db: Session, script_id: UUID, user_id: UUID) -> CharacterIndexResponse:
+        """Speakers of a script by number of lines, with the scenes they speak in."""
+        owner = db.query(Script.user_id).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).scalar()
+        if owner is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if owner != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+
+        rows = db.query(
+            CharacterAppearance.character_name,
+            CharacterAppearance.segment_id,
+            SceneSegment.segment_number,
+            CharacterAppearance.line_count,
+            CharacterAppearance.word_count,
+        ).join(
+            SceneSegment, SceneSegment.id == CharacterAppearance.segment_id
+        ).filter(
+            CharacterAppearance.script_id == script_id
+        ).order_by(SceneSegment.segment_number).all()
+
+        # First heading of each segment the characters appear in, for labelling scenes
+        headings: Dict[UUID, str] = {}
+        segment_ids = {row.segment_id for row in rows}
+        if segment_ids:
+            headings = dict(db.execute(
+                select(SceneSegmentComponent.scene_segment_id, SceneSegmentComponent.content)
+                .distinct(SceneSegmentComponent.scene_segment_id)
+                .where(
+                    and_(
+                        SceneSegmentComponent.scene_segment_id.in_(segment_ids),
+                        SceneSegmentComponent.component_type == ComponentType.HEADING,
+                        SceneSegmentComponent.is_deleted.is_(False)
+                    )
+                )
+                .order_by(SceneSegmentComponent.scene_segment_id, SceneSegmentComponent.position)
+            ).all())
+
+        scenes: Dict[str, List[CharacterScene]] = defaultdict(list)
+        for row in rows:
+            scenes[row.character_name].append(CharacterScene(
+                segment_id=row.segment_id,
+                segment_number=row.segment_number,
+                heading=headings.get(row.segment_id),
+                line_count=row.line_count,
+                word_count=row.word_count
+            ))
+
+        characters = [
+            CharacterStats(
+                character_name=name,
+                line_count=sum(scene.line_count for scene in appearances),
+                word_count=sum(scene.word_count for scene in appearances),
+                scene_count=len(appearances),
+                first_appearance=appearances[0],
+                last_appearance=appearances[-1],
+                scenes=appearances
+            )
+            for name, appearances in scenes.items()
+        ]
+        characters.sort(key=lambda character: (-character.line_count, character.character_name))
+        return CharacterIndexResponse(script_id=script_id, characters=characters)
+
+
+_DIALOGUE_FIELDS = ("component_type", "character_name", "content", "is_deleted", "scene_segment_id")
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_character_index_after_flush(session: Session, flush_context) -> None:
+    segment_ids: Set[UUID] = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, SceneSegmentComponent):
+            state = inspect(obj)
+            if obj in session.dirty:
+                changed = [state.attrs[key].history for key in _DIALOGUE_FIELDS]
+                if not any(history.has_changes() for history in changed):
+                    continue
+                # The previous type is unknown when the attribute was expired
+                # before being set, so any type change counts
+                retyped = state.attrs.component_type.history.has_changes()
+                if obj.component_type != ComponentType.DIALOGUE and not retyped:
+                    continue
+                # A component moved between segments leaves its old segment too
+                segment_ids.update(
+                    segment_id for segment_id in state.attrs.scene_segment_id.history.deleted if segment_id
+                )
+            elif obj.component_type != ComponentType.DIALOGUE:
+                continue
+            if obj.scene_segment_id is not None:
+                segment_ids.add(obj.scene_segment_id)
+        elif isinstance(obj, SceneSegment) and obj in session.dirty:
+            if inspect(obj).attrs.is_deleted.history.has_changes():
+                segment_ids.add(obj.id)
+
+    if segment_ids:
+        connection = session.connection()
+        for statement in _rebuild_statements(SceneSegment.id.in_(segment_ids)):
+            connection.execute(statement)
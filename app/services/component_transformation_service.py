@@ -0,0 +1,414 @@
+# app/services/component_transformation_service.py
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from fastapi import HTTPException, status
+from typing import Any, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+import logging
+import traceback
+import uuid
+
+from pydantic import BaseModel
+
+from app.models.script import Script
+from app.models.usage import AICallTypeEnum
+from app.models.scene_segments import (SceneSegment, SceneSegmentComponent, ComponentType,
+                                       ShorteningAlternative, ShorteningSelectionHistory,
+                                       RewriteAlternative, RewriteSelectionHistory,
+                                       ExpansionAlternative, ExpansionSelectionHistory,
+                                       ContinuationAlternative, ContinuationSelectionHistory)
+from app.schemas.scene_segment_ai import (TransformationType,
+                                          ShortenComponentResponse, ScriptShorten,
+                                          RewriteComponentResponse, ScriptRewrite,
+                                          ExpandComponentResponse, ScriptExpansion,
+                                          ContinueComponentResponse, ScriptContinuation)
+from app.services.openai_service import AzureOpenAIService
+from app.services.llm_resilience import LLMUnavailableError
+from app.services.usage_service import UsageService
+
+logger = logging.getLogger(__name__)
+
+# Every transformation produces the same five themed alternatives
+ALTERNATIVE_THEMES: List[str] = ["concise", "dramatic", "minimal", "poetic", "humorous"]
+
+APPLY_MODE_REPLACE = "replace"
+APPLY_MODE_APPEND = "append"
+
+
+@dataclass(frozen=True)
+class TransformationConfig:
+    """
+    Everything the engine needs to know about one transformation type.
+
+    Adding a new transformation means adding one entry to TRANSFORMATIONS
+    (plus the OpenAI prompt methods and alternative/history tables it points at).
+    """
+    transform_type: TransformationType
+    verb: str                       # "shorten" -> "Cannot shorten component of type ..."
+    label: str                      # "shortening" -> "Error generating shortening alternatives"
+    call_type: AICallTypeEnum
+    alternative_model: Type[Any]
+    history_model: Type[Any]
+    text_field: str                 # Column on the alternative model / field on the AI response
+    action_method: str              # AzureOpenAIService method for ACTION components
+    dialogue_method: str            # AzureOpenAIService method for DIALOGUE components
+    response_model: Type[BaseModel]
+    item_model: Type[BaseModel]
+    apply_mode: str = APPLY_MODE_REPLACE
+    noun: str = "alternative"       # Used in the apply status messages
+    supported_types: Tuple[ComponentType, ...] = (ComponentType.ACTION, ComponentType.DIALOGUE)
+
+
+TRANSFORMATIONS: Dict[TransformationType, TransformationConfig] = {
+    TransformationType.SHORTEN: TransformationConfig(
+        transform_type=TransformationType.SHORTEN,
+        verb="shorten",
+        label="shortening",
+        call_type=AICallTypeEnum.SHORTENING,
+        alternative_model=ShorteningAlternative,
+        history_model=ShorteningSelectionHistory,
+        text_field="shortened_text",
+        action_method="shorten_action_component",
+        dialogue_method="shorten_dialogue_component",
+        response_model=ShortenComponentResponse,
+        item_model=ScriptShorten,
+    ),
+    TransformationType.REWRITE: TransformationConfig(
+        transform_type=TransformationType.REWRITE,
+        verb="rewrite",
+        label="rewrite",
+        call_type=AICallTypeEnum.REWRITING,
+        alternative_model=RewriteAlternative,
+        history_model=RewriteSelectionHistory,
+        text_field="rewritten_text",
+        action_method="rewrite_action_component",
+        dialogue_method="rewrite_dialogue_component",
+        response_model=RewriteComponentResponse,
+        item_model=ScriptRewrite,
+    ),
+    TransformationType.EXPAND: TransformationConfig(
+        transform_type=TransformationType.EXPAND,
+        verb="expand",
+        label="expansion",
+        call_type=AICallTypeEnum.EXPANSION,
+        alternative_model=ExpansionAlternative,
+        history_model=ExpansionSelectionHistory,
+        text_field="expanded_text",
+        action_method="expand_action_component",
+        dialogue_method="expand_dialogue_component",
+        response_model=ExpandComponentResponse,
+        item_model=ScriptExpansion,
+    ),
+    TransformationType.CONTINUE: TransformationConfig(
+        transform_type=TransformationType.CONTINUE,
+        verb="continue",
+        label="continuation",
+        call_type=AICallTypeEnum.CONTINUATION,
+        alternative_model=ContinuationAlternative,
+        history_model=ContinuationSelectionHistory,
+        text_field="continuation_text",
+        action_method="continue_action_component",
+        dialogue_method="continue_dialogue_component",
+        response_model=ContinueComponentResponse,
+        item_model=ScriptContinuation,
+        apply_mode=APPLY_MODE_APPEND,
+        noun="continuation",
+    ),
+}
+
+
+class ComponentTransformationService:
+    @staticmethod
+    def get_config(transform_type: TransformationType) -> TransformationConfig:
+        """
+        Look up the configuration for a transformation type
+        """
+        config = TRANSFORMATIONS.get(transform_type)
+        if not config:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported transformation type: {transform_type}"
+            )
+        return config
+
+    @staticmethod
+    def load_component_context(
+        db: Session,
+        component_id: UUID
+    ) -> Tuple[SceneSegmentComponent, SceneSegment, Script]:
+        """
+        Load a component together with its segment and script in a single joined query.
+        """
+        row = db.query(SceneSegmentComponent, SceneSegment, Script).join(
+            SceneSegment, SceneSegmentComponent.scene_segment_id == SceneSegment.id
+        ).join(
+            Script, SceneSegment.script_id == Script.id
+        ).filter(
+            and_(
+                SceneSegmentComponent.id == component_id,
+                SceneSegmentComponent.is_deleted.is_(False)
+            )
+        ).first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Component not found"
+            )
+        return row
+
+    @staticmethod
+    def _generate_alternatives(
+        config: TransformationConfig,
+        component: SceneSegmentComponent,
+        script: Script,
+        openai_service: Optional[AzureOpenAIService] = None
+    ) -> Any:
+        """
+        Call the configured OpenAI prompt for the component's type
+        """
+        openai_service = openai_service or AzureOpenAIService()
+        context = {
+            "genre": script.genre,
+            "script_title": script.title
+        }
+
+        if component.component_type == ComponentType.DIALOGUE:
+            context["parenthetical"] = component.parenthetical
+            # Character traits are not tracked yet; prompts accept an empty value
+            context["character_traits"] = ""
+            return getattr(openai_service, config.dialogue_method)(
+                text=component.content,
+                character_name=component.character_name,
+                context=context
+            )
+
+        return getattr(openai_service, config.action_method)(
+            text=component.content,
+            context=context
+        )
+
+    @staticmethod
+    def _upsert_alternatives(
+        db: Session,
+        config: TransformationConfig,
+        component_id: UUID,
+        alternatives: Any
+    ) -> None:
+        """
+        Store all themed alternatives with one INSERT ... ON CONFLICT DO UPDATE statement.
+        """
+        rows = []
+        for theme in ALTERNATIVE_THEMES:
+            item = getattr(alternatives, theme)
+            rows.append({
+                "id": uuid.uuid4(),
+                "component_id": component_id,
+                "alternative_type": theme,
+                config.text_field: getattr(item, config.text_field),
+                "explanation": item.explanation,
+                "is_deleted": False,
+            })
+
+        stmt = pg_insert(config.alternative_model.__table__).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["component_id", "alternative_type"],
+            set_={
+                config.text_field: stmt.excluded[config.text_field],
+                "explanation": stmt.excluded.explanation,
+                "is_deleted": False,
+                "deleted_at": None,
+                "updated_at": func.now(),
+            }
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def transform_component(
+        db: Session,
+        component_id: UUID,
+        transform_type: TransformationType,
+        openai_service: Optional[AzureOpenAIService] = None,
+        user_id: Optional[UUID] = None
+    ) -> BaseModel:
+        """
+        Generate themed alternatives for a component and store them.
+
+        The call is logged to the usage log as `user_id`'s, when given.
+        Returns the transformation's response model (e.g. ShortenComponentResponse).
+        """
+        config = ComponentTransformationService.get_config(transform_type)
+        component, segment, script = ComponentTransformationService.load_component_context(db, component_id)
+
+        if component.component_type not in config.supported_types:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot {config.verb} component of type {component.component_type}"
+            )
+
+        try:
+            alternatives = ComponentTransformationService._generate_alternatives(
+                config, component, script, openai_service
+            )
+            ComponentTransformationService._upsert_alternatives(db, config, component_id, alternatives)
+            db.commit()
+            if user_id is not None:
+                UsageService.log_ai_call(
+                    db=db,
+                    user_id=user_id,
+                    call_type=config.call_type.value,
+                    script_id=script.id,
+                    metadata={"component_id": str(component_id)}
+                )
+
+            return config.response_model(
+                component_id=component_id,
+                original_text=component.content,
+                **{
+                    theme: config.item_model(
+                        **{
+                            config.text_field: getattr(getattr(alternatives, theme), config.text_field),
+                            "explanation": getattr(alternatives, theme).explanation
+                        }
+                    )
+                    for theme in ALTERNATIVE_THEMES
+                }
+            )
+
+        except LLMUnavailableError as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"AI service temporarily unavailable: {str(e)}"
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(traceback.format_exc())
+            logger.error(f"Error generating {config.label} alternatives: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating {config.label} alternatives: {str(e)}"
+            )
+
+    @staticmethod
+    def _get_status_message(config: TransformationConfig, is_already_applied: bool, is_same_selection: bool) -> str:
+        """Generate an appropriate status message based on what happened."""
+        if is_already_applied and is_same_selection:
+            return f"This {config.noun} is already applied and was previously selected."
+        elif is_already_applied:
+            return f"This {config.noun} was already applied, but your selection has been recorded."
+        elif is_same_selection:
+            return "Component content updated, but this selection type was already recorded."
+        else:
+            return f"{config.noun.capitalize()} successfully applied and recorded."
+
+    @staticmethod
+    def apply_alternative(
+        db: Session,
+        component_id: UUID,
+        transform_type: TransformationType,
+        alternative_text: str,
+        user_id: UUID
+    ) -> Dict[str, Any]:
+        """
+        Apply a selected alternative to a component and record the selection.
+
+        The component, the matching alternative and the most recent selection type are
+        loaded in one query. Content is only written if it would change and the selection
+        is only recorded if it differs from the most recent one.
+
+        Returns:
+            Dictionary with updated component and status information
+        """
+        config = ComponentTransformationService.get_config(transform_type)
+        Alternative = config.alternative_model
+        History = config.history_model
+
+        latest_selection_type = (
+            select(History.alternative_type)
+            .where(History.component_id == component_id)
+            .order_by(History.selected_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        row = db.query(SceneSegmentComponent, Alternative, latest_selection_type).outerjoin(
+            Alternative,
+            and_(
+                Alternative.component_id == SceneSegmentComponent.id,
+                getattr(Alternative, config.text_field) == alternative_text,
+                Alternative.is_deleted.is_(False)
+            )
+        ).filter(
+            and_(
+                SceneSegmentComponent.id == component_id,
+                SceneSegmentComponent.is_deleted.is_(False)
+            )
+        ).first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Component not found"
+            )
+
+        component, alternative, latest_type = row
+        if not alternative:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{config.noun.capitalize()} with the provided text not found"
+            )
+
+        try:
+            new_text = getattr(alternative, config.text_field)
+
+            if config.apply_mode == APPLY_MODE_APPEND:
+                # Continuations are appended, so "applied" means the content already ends with it
+                is_already_applied = component.content.endswith(new_text)
+            else:
+                is_already_applied = component.content == new_text
+
+            is_same_selection = latest_type is not None and latest_type == alternative.alternative_type
+
+            if not is_already_applied:
+                if config.apply_mode == APPLY_MODE_APPEND:
+                    # Add a space between if needed
+                    if component.content and not component.content.endswith((" ", "\n")):
+                        component.content = f"{component.content} {new_text}"
+                    else:
+                        component.content = f"{component.content}{new_text}"
+                else:
+                    component.content = new_text
+                component.updated_at = func.now()
+
+            if not is_same_selection:
+                db.add(History(
+                    user_id=user_id,
+                    component_id=component_id,
+                    alternative_id=alternative.id,
+                    alternative_type=alternative.alternative_type
+                ))
+
+            db.commit()
+
+            if not is_already_applied:
+                db.refresh(component)
+
+            return {
+                "component": component,
+                "was_updated": not is_already_applied,
+                "was_recorded": not is_same_selection,
+                "message": ComponentTransformationService._get_status_message(
+                    config, is_already_applied, is_same_selection
+                )
+            }
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error applying {config.label} alternative: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error applying {config.label} alternative: {str(e)}"
+            )
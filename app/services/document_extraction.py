@@ -0,0 +1,129 @@
+# app/services/document_extraction.py
+"""
+Text extraction for uploaded PDF and DOCX screenplays.
+
+Both formats keep their index at the end of the file, so they cannot be parsed while
+streaming. The upload is spooled to a temporary file and extracted in a small process
+pool, keeping CPU-heavy PDF work off the event loop and out of the API process.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+import asyncio
+import logging
+import re
+import threading
+import zipfile
+from xml.etree import ElementTree
+
+from app.config import settings
+from app.services.screenplay_parser import is_character_cue, is_scene_heading, is_transition
+
+logger = logging.getLogger(__name__)
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Page furniture that PDF exports repeat on every page
+PAGE_FURNITURE_RE = re.compile(r"^\s*(\d+\.?|\(?CONTINUED\)?:?|\(MORE\)|CONT'D:?)\s*$", re.IGNORECASE)
+
+
+class ExtractionError(Exception):
+    """Raised when a document cannot be turned into screenplay text."""
+
+
+def _strip_page_furniture(text: str) -> str:
+    return "\n".join(line for line in text.splitlines() if not PAGE_FURNITURE_RE.match(line))
+
+
+def extract_pdf_text(path: str) -> str:
+    """Extract text from a PDF, keeping the vertical spacing between elements."""
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ExtractionError("PDF import requires the pypdf package") from e
+
+    pages = []
+    try:
+        for page in PdfReader(path).pages:
+            pages.append(page.extract_text(extraction_mode="layout") or "")
+    except Exception as e:
+        raise ExtractionError(f"Not a readable PDF document: {str(e)}") from e
+    return _strip_page_furniture("\n\n".join(pages))
+
+
+def extract_docx_text(path: str) -> str:
+    """
+    Extract text from a DOCX file with the standard library.
+
+    Screenplay elements are Word paragraphs; they are separated by blank lines
+    (Fountain style) except between a character cue, its parenthetical and its
+    dialogue, which must stay together.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ExtractionError("Not a valid DOCX document") from e
+
+    paragraphs: List[str] = []
+    for paragraph in root.iter(f"{WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{WORD_NS}t" and node.text:
+                parts.append(node.text)
+            elif node.tag in (f"{WORD_NS}br", f"{WORD_NS}cr"):
+                parts.append("\n")
+            elif node.tag == f"{WORD_NS}tab":
+                parts.append(" ")
+        text = "".join(parts).strip()
+        if text:
+            paragraphs.append(text)
+
+    lines: List[str] = []
+    keep_with_next = False
+    for text in paragraphs:
+        if lines and not keep_with_next:
+            lines.append("")
+        lines.append(text)
+        is_cue = is_character_cue(text) and not is_scene_heading(text) and not is_transition(text)
+        keep_with_next = is_cue or (keep_with_next and text.startswith("("))
+    return "\n".join(lines)
+
+
+def _extract(path: str, content_type: str) -> str:
+    if content_type == PDF_CONTENT_TYPE:
+        return extract_pdf_text(path)
+    if content_type == DOCX_CONTENT_TYPE:
+        return extract_docx_text(path)
+    raise ExtractionError(f"Text extraction is not supported for {content_type}")
+
+
+def supports_extraction(content_type: str) -> bool:
+    return content_type in (PDF_CONTENT_TYPE, DOCX_CONTENT_TYPE)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.UPLOAD_EXTRACTION_WORKERS)
+        return _pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def extract_text(path: str, content_type: str) -> str:
+    """Extract screenplay text from a spooled PDF/DOCX file in the process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_extraction_pool(), _extract, path, content_type)
@@ -0,0 +1,60 @@
+# app/services/http_caching.py
+"""
+ETag helpers for conditional GETs.
+
+ETags are weak (W/"...") because responses may be re-encoded (compressed) on the
+way out; they are compared with the weak comparison of RFC 9110.
+"""
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+
+def weak_etag(*parts: Any) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def _opaque(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(candidate) == _opaque(etag) for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def json_bytes_response(content: bytes, response: Optional[Response] = None) -> Response:
+    """
+    Send pre-serialized JSON. Returning a Response bypasses FastAPI's handling of
+    the injected `response`, so its caching headers are carried over here.
+    """
+    headers = {}
+    if response is not None:
+        headers = {name: response.headers[name] for name in ("etag", "cache-control") if name in response.headers}
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def check_etag(response: Response, if_none_match: Optional[str], etag: Optional[str]) -> Optional[Response]:
+    """
+    Conditional GET guard for endpoints returning models.
+
+    Returns a 304 response to send as is when If-None-Match matches; otherwise sets
+    the ETag on the endpoint's `response` and returns None. A None etag (row not
+    found or not owned) skips the check so the endpoint raises its usual error.
+    """
+    if etag is None:
+        return None
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return None
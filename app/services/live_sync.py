@@ -0,0 +1,185 @@
+# app/services/live_sync.py
+"""
+Live collaboration: push segment and component changes to open editors.
+
+Every revision bump queues `NOTIFY <LIVE_SYNC_CHANNEL>, '<script_id>:<revision>'`
+in the writing transaction (app/services/script_revision.py), so Postgres
+delivers it to every API worker and node only once the edit has committed.
+Each worker keeps one asyncpg connection LISTENing on the channel. When a script
+with open sockets moves on, the worker loads the rows changed since the oldest
+revision its sockets have seen (one ScriptChangesService query, however many
+sockets) and sends each socket the part it has not seen yet.
+
+The notification only says "something changed"; the rows themselves always come
+from the database, so dropped or coalesced notifications cost latency, not data.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+from uuid import UUID
+import asyncio
+import logging
+
+import asyncpg
+from fastapi import HTTPException, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models.script import Script
+from app.schemas.changes import ScriptChangesResponse
+from app.auth.dependencies import get_user_from_token
+from app.services.script_changes_service import ScriptChangesService
+from app.services.script_revision import get_script_revision
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    websocket: WebSocket
+    revision: int
+
+
+def authorize(script_id: UUID, token: str) -> Optional[int]:
+    """Current revision of the script if the token's user owns it, else None."""
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+        return get_script_revision(db, script_id, user.id)
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+
+
+def _load_changes(script_id: UUID, since: int) -> Optional[ScriptChangesResponse]:
+    db = SessionLocal()
+    try:
+        revision = db.query(Script.revision).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).scalar()
+        if revision is None:
+            return None
+        return ScriptChangesService.collect(db, script_id, since, revision)
+    finally:
+        db.close()
+
+
+class ScriptChangeHub:
+    """Per-worker registry of open editor sockets, grouped by script."""
+
+    def __init__(self):
+        self._subscribers: Dict[UUID, Set[_Subscriber]] = defaultdict(set)
+        self._syncing: Dict[UUID, asyncio.Task] = {}
+        self._dirty: Set[UUID] = set()
+
+    def subscribe(self, script_id: UUID, websocket: WebSocket, revision: int) -> _Subscriber:
+        subscriber = _Subscriber(websocket, revision)
+        self._subscribers[script_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, script_id: UUID, subscriber: _Subscriber) -> None:
+        subscribers = self._subscribers.get(script_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[script_id]
+
+    def notify(self, script_id: UUID, revision: Optional[int] = None) -> None:
+        """A script reached `revision` (None: unknown, e.g. after a reconnect)."""
+        subscribers = self._subscribers.get(script_id)
+        if not subscribers:
+            return
+        if revision is not None and all(sub.revision >= revision for sub in subscribers):
+            return
+        if script_id in self._syncing:
+            # Picked up by the running sync's next round
+            self._dirty.add(script_id)
+            return
+        self._syncing[script_id] = asyncio.create_task(self._sync(script_id))
+
+    def notify_all(self) -> None:
+        for script_id in list(self._subscribers):
+            self.notify(script_id)
+
+    async def _sync(self, script_id: UUID) -> None:
+        try:
+            while True:
+                self._dirty.discard(script_id)
+                subscribers = list(self._subscribers.get(script_id, ()))
+                if not subscribers:
+                    return
+                since = min(sub.revision for sub in subscribers)
+                changes = await run_in_threadpool(_load_changes, script_id, since)
+                if changes is None:
+                    return
+                await asyncio.gather(*(self._send(sub, changes) for sub in subscribers))
+                if script_id not in self._dirty:
+                    return
+        except Exception as e:
+            logger.error(f"Error syncing script {script_id} to live editors: {str(e)}")
+        finally:
+            self._syncing.pop(script_id, None)
+
+    @staticmethod
+    async def _send(subscriber: _Subscriber, changes: ScriptChangesResponse) -> None:
+        if changes.revision <= subscriber.revision:
+            return
+        since = subscriber.revision
+        update = changes.model_copy(update={
+            "since": since,
+            "segments": [row for row in changes.segments if row.revision > since],
+            "components": [row for row in changes.components if row.revision > since],
+        })
+        try:
+            await subscriber.websocket.send_text(update.model_dump_json())
+            subscriber.revision = changes.revision
+        except Exception as e:
+            # The socket's own receive loop notices the disconnect and unsubscribes
+            logger.info(f"Dropping live update for a closed socket: {str(e)}")
+
+
+hub = ScriptChangeHub()
+
+
+def _listener_dsn() -> str:
+    # asyncpg takes a plain libpq URL, without SQLAlchemy's +driver suffix
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _on_notification(connection, pid, channel, payload: str) -> None:
+    try:
+        script_id, _, revision = payload.partition(":")
+        hub.notify(UUID(script_id), int(revision))
+    except ValueError:
+        logger.warning(f"Ignoring malformed {channel} notification: {payload!r}")
+
+
+async def run_listener() -> None:
+    """Background task: LISTEN for revision bumps, reconnecting when the connection drops."""
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(_listener_dsn())
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(settings.LIVE_SYNC_CHANNEL, _on_notification)
+            logger.info(f"Listening for script changes on {settings.LIVE_SYNC_CHANNEL}")
+            # Anything committed while we were not listening
+            hub.notify_all()
+            await closed.wait()
+            logger.warning("Live sync listener connection closed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Live sync listener failed: {str(e)}")
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(settings.LIVE_SYNC_RECONNECT_SECONDS)
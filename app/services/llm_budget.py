@@ -0,0 +1,101 @@
+# app/services/llm_budget.py
+"""
+Output token budgets for Azure OpenAI calls.
+
+Azure counts max_tokens against the deployment's TPM quota when a request is admitted,
+so asking for the model maximum on every call wastes most of the quota. Each operation
+gets a budget sized from the text it works on and the shape of its response model;
+a call is retried with a larger budget only if its output was actually truncated.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from instructor.exceptions import IncompleteOutputException
+from pydantic import BaseModel
+
+from app.config import settings
+from app.services.llm_resilience import LLMOperation
+
+CHARS_PER_TOKEN = 4
+TOKENS_PER_WORD = 1.4
+
+
+@dataclass(frozen=True)
+class OutputBudget:
+    fixed_tokens: int  # JSON structure and anything independent of the input
+    per_item_tokens: int  # Per alternative / list item: keys, explanation, heading...
+    source_ratio: float = 0.0  # Output tokens per source-text token, for each item
+    word_ratio: float = 0.0  # Output tokens per requested word (whole response)
+    default_items: int = 1  # Items when the response model does not say how many
+    minimum: int = 256
+
+
+OUTPUT_BUDGETS: Dict[LLMOperation, OutputBudget] = {
+    # 15 beats with name, title, description, page length, timing and act
+    LLMOperation.BEAT_SHEET: OutputBudget(fixed_tokens=200, per_item_tokens=250, default_items=15, minimum=2048),
+    LLMOperation.SCENES_FOR_BEAT: OutputBudget(fixed_tokens=100, per_item_tokens=220, default_items=8),
+    LLMOperation.REGENERATE_SCENE: OutputBudget(fixed_tokens=100, per_item_tokens=300),
+    LLMOperation.SCENE_DESCRIPTION: OutputBudget(fixed_tokens=100, per_item_tokens=220, default_items=8),
+    # Scenes regularly run well past min_word_count and each component carries JSON overhead
+    LLMOperation.SCENE_SEGMENT: OutputBudget(fixed_tokens=600, per_item_tokens=0, word_ratio=3.5, minimum=2048),
+    # Five themed alternatives, each with a short explanation
+    LLMOperation.SHORTEN: OutputBudget(fixed_tokens=60, per_item_tokens=80, source_ratio=1.0),
+    LLMOperation.REWRITE: OutputBudget(fixed_tokens=60, per_item_tokens=80, source_ratio=1.5),
+    LLMOperation.EXPAND: OutputBudget(fixed_tokens=60, per_item_tokens=120, source_ratio=3.0, minimum=512),
+    LLMOperation.CONTINUE: OutputBudget(fixed_tokens=60, per_item_tokens=200, source_ratio=1.5, minimum=512),
+}
+
+
+def count_response_items(response_model: Any) -> Optional[int]:
+    """
+    Number of alternatives a response model asks for, e.g. 5 for ScriptShortenerResponse.
+
+    Returns None for list responses and models without nested alternatives.
+    """
+    if not isinstance(response_model, type) or not issubclass(response_model, BaseModel):
+        return None
+    items = sum(
+        1 for field in response_model.model_fields.values()
+        if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel)
+    )
+    return items or None
+
+
+def estimate_output_budget(
+    operation: LLMOperation,
+    response_model: Any = None,
+    source_text: Optional[str] = None,
+    expected_words: Optional[int] = None
+) -> int:
+    """Output budget in tokens for one call, capped at AZURE_OPENAI_MAX_TOKENS."""
+    budget = OUTPUT_BUDGETS.get(operation)
+    if budget is None:
+        return settings.AZURE_OPENAI_MAX_TOKENS
+
+    items = count_response_items(response_model) or budget.default_items
+    source_tokens = len(source_text or "") / CHARS_PER_TOKEN
+    tokens = (
+        budget.fixed_tokens
+        + items * (budget.per_item_tokens + budget.source_ratio * source_tokens)
+        + budget.word_ratio * (expected_words or 0)
+    )
+    tokens = max(int(tokens), budget.minimum)
+    return min(tokens, settings.AZURE_OPENAI_MAX_TOKENS)
+
+
+def next_budget(current: int) -> Optional[int]:
+    """Larger budget for a retry after truncation, or None if already at the ceiling."""
+    if current >= settings.AZURE_OPENAI_MAX_TOKENS:
+        return None
+    return min(int(current * settings.AZURE_OPENAI_BUDGET_ESCALATION_FACTOR), settings.AZURE_OPENAI_MAX_TOKENS)
+
+
+def is_truncated(exc: BaseException) -> bool:
+    """True if the call failed because the output hit max_tokens (finish_reason 'length')."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, IncompleteOutputException):
+            return True
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return False
@@ -0,0 +1,318 @@
+# app/services/llm_rate_limiter.py
+"""
+Client-side token bucket in front of Azure OpenAI.
+
+Every request reserves its estimated prompt tokens plus its output budget before it
+is sent - retries and hedged duplicates included, see ResilientLLMClient.create() -
+so bursts of bulk generation queue up here instead of turning into 429 storms.
+Interactive edits are served ahead of bulk generation, and bulk work may never dip
+into the slice of quota reserved for interactive calls.
+
+acquire() blocks while it waits. It is called from the worker threads LLM calls run
+on (app.services.llm_router.run_llm_call), never on the event loop.
+"""
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.rate_limit import LLMRateLimitBucket  # Registers the table with Base.metadata
+from app.services.llm_resilience import LLMOperation, LLMUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English prose; good enough for admission control
+CHARS_PER_TOKEN = 4
+TOKENS_PER_MESSAGE = 4
+
+
+class RatePriority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 1
+
+
+OPERATION_PRIORITIES: Dict[LLMOperation, RatePriority] = {
+    LLMOperation.SHORTEN: RatePriority.INTERACTIVE,
+    LLMOperation.REWRITE: RatePriority.INTERACTIVE,
+    LLMOperation.EXPAND: RatePriority.INTERACTIVE,
+    LLMOperation.CONTINUE: RatePriority.INTERACTIVE,
+}
+
+
+def get_priority(operation: LLMOperation) -> RatePriority:
+    return OPERATION_PRIORITIES.get(operation, RatePriority.BULK)
+
+
+def estimate_prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Cheap up-front estimate of the prompt size in tokens."""
+    total = 0
+    for message in messages:
+        content = message.get("content") or ""
+        total += len(content) // CHARS_PER_TOKEN + TOKENS_PER_MESSAGE
+    return total
+
+
+class RateLimiterMetrics:
+    """Queue-wait statistics per priority class."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {
+            priority: {
+                "acquired": 0,
+                "rejected": 0,
+                "waiting": 0,
+                "total_wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+            }
+            for priority in RatePriority
+        }
+
+    def waiting(self, priority: RatePriority, delta: int) -> None:
+        with self._lock:
+            self._stats[priority]["waiting"] += delta
+
+    def record(self, priority: RatePriority, wait_seconds: float, acquired: bool) -> None:
+        with self._lock:
+            stats = self._stats[priority]
+            stats["acquired" if acquired else "rejected"] += 1
+            stats["total_wait_seconds"] += wait_seconds
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait_seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for priority, stats in self._stats.items():
+                calls = stats["acquired"] + stats["rejected"]
+                result[priority.name.lower()] = {
+                    **stats,
+                    "total_wait_seconds": round(stats["total_wait_seconds"], 3),
+                    "max_wait_seconds": round(stats["max_wait_seconds"], 3),
+                    "avg_wait_seconds": round(stats["total_wait_seconds"] / calls, 3) if calls else 0.0,
+                }
+            return result
+
+
+class _MemoryBucket:
+    """In-process token + request bucket with strict priority between waiters."""
+
+    def __init__(self, tokens_per_minute: int, requests_per_minute: int):
+        self.token_capacity = float(tokens_per_minute)
+        self.request_capacity = float(requests_per_minute)
+        self.tokens = self.token_capacity
+        self.requests = self.request_capacity
+        self.updated = time.monotonic()
+        self.waiters = {priority: 0 for priority in RatePriority}
+        self.condition = threading.Condition()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.tokens = min(self.token_capacity, self.tokens + elapsed * self.token_capacity / 60.0)
+        self.requests = min(self.request_capacity, self.requests + elapsed * self.request_capacity / 60.0)
+
+    def acquire(self, cost: float, priority: RatePriority, reserve_fraction: float, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        token_reserve = self.token_capacity * reserve_fraction if priority == RatePriority.BULK else 0.0
+        request_reserve = self.request_capacity * reserve_fraction if priority == RatePriority.BULK else 0.0
+
+        with self.condition:
+            self.waiters[priority] += 1
+            try:
+                while True:
+                    self._refill()
+                    higher_waiting = any(self.waiters[p] for p in RatePriority if p < priority)
+                    if (not higher_waiting
+                            and self.tokens - token_reserve >= cost
+                            and self.requests - request_reserve >= 1):
+                        self.tokens -= cost
+                        self.requests -= 1
+                        return True
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    token_wait = max(0.0, cost + token_reserve - self.tokens) * 60.0 / self.token_capacity
+                    request_wait = max(0.0, 1 + request_reserve - self.requests) * 60.0 / self.request_capacity
+                    self.condition.wait(min(remaining, max(token_wait, request_wait, 0.05)))
+            finally:
+                self.waiters[priority] -= 1
+                self.condition.notify_all()
+
+
+class _PostgresBucket:
+    """
+    Token bucket stored in llm_rate_limit_buckets, shared by every process.
+
+    Refill and consumption happen in one conditional UPDATE, so concurrent workers
+    can never overdraw the bucket. Priority is enforced through the bulk reserve.
+    """
+
+    _REFILLED_TOKENS = (
+        "LEAST(:token_capacity, tokens + :token_capacity / 60.0 "
+        "* EXTRACT(EPOCH FROM (clock_timestamp() - updated_at)))"
+    )
+    _REFILLED_REQUESTS = (
+        "LEAST(:request_capacity, requests + :request_capacity / 60.0 "
+        "* EXTRACT(EPOCH FROM (clock_timestamp() - updated_at)))"
+    )
+
+    def __init__(self, name: str, tokens_per_minute: int, requests_per_minute: int):
+        self.name = name
+        self.token_capacity = float(tokens_per_minute)
+        self.request_capacity = float(requests_per_minute)
+        self._initialized = False
+
+    def _params(self, **extra) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "token_capacity": self.token_capacity,
+            "request_capacity": self.request_capacity,
+            **extra,
+        }
+
+    def _ensure_row(self, db) -> None:
+        if self._initialized:
+            return
+        db.execute(
+            text(
+                "INSERT INTO llm_rate_limit_buckets (name, tokens, requests, updated_at) "
+                "VALUES (:name, :token_capacity, :request_capacity, clock_timestamp()) "
+                "ON CONFLICT (name) DO NOTHING"
+            ),
+            self._params()
+        )
+        db.commit()
+        self._initialized = True
+
+    def acquire(self, cost: float, priority: RatePriority, reserve_fraction: float, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        token_reserve = self.token_capacity * reserve_fraction if priority == RatePriority.BULK else 0.0
+        request_reserve = self.request_capacity * reserve_fraction if priority == RatePriority.BULK else 0.0
+        params = self._params(cost=cost, token_reserve=token_reserve, request_reserve=request_reserve)
+
+        db = SessionLocal()
+        try:
+            self._ensure_row(db)
+            while True:
+                acquired = db.execute(
+                    text(
+                        f"UPDATE llm_rate_limit_buckets SET "
+                        f"tokens = {self._REFILLED_TOKENS} - :cost, "
+                        f"requests = {self._REFILLED_REQUESTS} - 1, "
+                        f"updated_at = clock_timestamp() "
+                        f"WHERE name = :name "
+                        f"AND {self._REFILLED_TOKENS} - :token_reserve >= :cost "
+                        f"AND {self._REFILLED_REQUESTS} - :request_reserve >= 1 "
+                        f"RETURNING tokens"
+                    ),
+                    params
+                ).first()
+                db.commit()
+                if acquired:
+                    return True
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+
+                level = db.execute(
+                    text(
+                        f"SELECT {self._REFILLED_TOKENS} AS tokens, {self._REFILLED_REQUESTS} AS requests "
+                        f"FROM llm_rate_limit_buckets WHERE name = :name"
+                    ),
+                    params
+                ).first()
+                db.commit()
+                token_wait = max(0.0, cost + token_reserve - level.tokens) * 60.0 / self.token_capacity
+                request_wait = max(0.0, 1 + request_reserve - level.requests) * 60.0 / self.request_capacity
+                # Interactive callers poll faster so they win races against bulk callers
+                floor = 0.05 if priority == RatePriority.INTERACTIVE else 0.25
+                time.sleep(min(remaining, max(token_wait, request_wait, floor)))
+        finally:
+            db.close()
+
+
+class LLMRateLimiter:
+    """
+    Admission control for one Azure OpenAI deployment.
+    """
+
+    def __init__(self, name: str, backend: Optional[str] = None):
+        self.name = name
+        self.backend = backend or settings.AZURE_OPENAI_RATE_LIMIT_BACKEND
+        if self.backend == "postgres":
+            self._bucket = _PostgresBucket(name, settings.AZURE_OPENAI_TPM, settings.AZURE_OPENAI_RPM)
+        else:
+            self._bucket = _MemoryBucket(settings.AZURE_OPENAI_TPM, settings.AZURE_OPENAI_RPM)
+        self.metrics = RateLimiterMetrics()
+
+    def acquire(
+        self,
+        operation: LLMOperation,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+        max_wait: Optional[float] = None
+    ) -> float:
+        """
+        Block until the call fits in the deployment's quota.
+
+        Reserves the estimated prompt tokens plus the output budget (Azure counts
+        max_tokens against TPM). Returns the time spent waiting in seconds and raises
+        LLMUnavailableError if the wait would exceed `max_wait` (default: configured maximum).
+        """
+        priority = get_priority(operation)
+        output_tokens = max_tokens or settings.AZURE_OPENAI_DEFAULT_OUTPUT_TOKENS
+        # A single call larger than the usable bucket could never be admitted
+        usable = settings.AZURE_OPENAI_TPM * (1 - settings.AZURE_OPENAI_BULK_RESERVE_FRACTION)
+        cost = min(float(estimate_prompt_tokens(messages) + output_tokens), usable)
+
+        start = time.monotonic()
+        self.metrics.waiting(priority, 1)
+        try:
+            acquired = self._bucket.acquire(
+                cost,
+                priority,
+                settings.AZURE_OPENAI_BULK_RESERVE_FRACTION,
+                settings.AZURE_OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS if max_wait is None else max_wait
+            )
+        finally:
+            self.metrics.waiting(priority, -1)
+
+        waited = time.monotonic() - start
+        self.metrics.record(priority, waited, acquired)
+        if not acquired:
+            raise LLMUnavailableError(
+                f"Rate limit queue wait exceeded for {operation.value}",
+                retry_after=settings.AZURE_OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS
+            )
+        if waited > 1.0:
+            logger.info(f"LLM call {operation.value} waited {waited:.2f}s for rate limit ({priority.name})")
+        return waited
+
+
+_limiters: Dict[str, LLMRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> LLMRateLimiter:
+    """Return the process-wide limiter for a deployment, creating it on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = LLMRateLimiter(name)
+            _limiters[name] = limiter
+        return limiter
+
+
+def get_rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    """Queue-wait metrics of every limiter, for the /health endpoint."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.metrics.snapshot() for limiter in limiters}
@@ -0,0 +1,346 @@
+# app/services/llm_resilience.py
+"""
+Retry, deadline, hedging and circuit-breaker handling for Azure OpenAI calls.
+
+AzureOpenAIService routes every chat completion through ResilientLLMClient.create(),
+so all calls share the same failure handling and the same per-deployment breakers.
+Calls block while they retry, back off and hedge; async code runs them through
+app.services.llm_router.run_llm_call so the event loop keeps serving requests.
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+import logging
+import random
+import threading
+import time
+
+import openai
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMOperation(str, Enum):
+    BEAT_SHEET = "beat_sheet"
+    SCENES_FOR_BEAT = "scenes_for_beat"
+    REGENERATE_SCENE = "regenerate_scene"
+    SCENE_DESCRIPTION = "scene_description"
+    SCENE_SEGMENT = "scene_segment"
+    SHORTEN = "shorten"
+    REWRITE = "rewrite"
+    EXPAND = "expand"
+    CONTINUE = "continue"
+
+
+# Total time budget (seconds) for one logical call, across all retries
+OPERATION_DEADLINES: Dict[LLMOperation, float] = {
+    LLMOperation.BEAT_SHEET: 180.0,
+    LLMOperation.SCENES_FOR_BEAT: 180.0,
+    LLMOperation.REGENERATE_SCENE: 120.0,
+    LLMOperation.SCENE_DESCRIPTION: 180.0,
+    LLMOperation.SCENE_SEGMENT: 240.0,
+    LLMOperation.SHORTEN: 45.0,
+    LLMOperation.REWRITE: 45.0,
+    LLMOperation.EXPAND: 60.0,
+    LLMOperation.CONTINUE: 60.0,
+}
+
+# Short interactive edits are cheap enough to hedge when the first attempt is slow
+HEDGED_OPERATIONS = {
+    LLMOperation.SHORTEN,
+    LLMOperation.REWRITE,
+    LLMOperation.EXPAND,
+    LLMOperation.CONTINUE,
+}
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the circuit breaker is open or the deadline is exhausted."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    Opens after `failure_threshold` consecutive failures, fails fast while open and
+    lets a single probe through after `reset_timeout` seconds (half-open).
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_at >= self.reset_timeout:
+                    self._state = CircuitState.HALF_OPEN
+                    self._probe_in_flight = True
+                    return True
+                return False
+            # Half-open: only one probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def is_open(self) -> bool:
+        """True while failing fast; does not consume the half-open probe."""
+        with self._lock:
+            return (
+                self._state == CircuitState.OPEN
+                and time.monotonic() - self._opened_at < self.reset_timeout
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != CircuitState.OPEN:
+                    logger.warning(f"Circuit breaker '{self.name}' opened after {self._consecutive_failures} failures")
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+
+    def retry_after(self) -> Optional[float]:
+        with self._lock:
+            if self._state != CircuitState.OPEN or self._opened_at is None:
+                return None
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_after_seconds": (
+                    round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+                    if self._state == CircuitState.OPEN and self._opened_at is not None else None
+                ),
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+# Shared pool for hedged requests; the losing attempt finishes in the background
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge")
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a deployment, creating it on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name=name,
+                failure_threshold=settings.AZURE_OPENAI_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.AZURE_OPENAI_CIRCUIT_RESET_SECONDS,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def get_circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """State of every breaker, for the /health endpoint."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def _unwrap(exc: BaseException) -> BaseException:
+    """instructor may wrap the SDK error; find the underlying openai exception."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, openai.OpenAIError):
+            return exc
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return exc
+
+
+def is_retryable(exc: BaseException) -> bool:
+    exc = _unwrap(exc)
+    if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def get_retry_after(exc: BaseException) -> Optional[float]:
+    """Read retry-after-ms / retry-after from an API error response, if present."""
+    exc = _unwrap(exc)
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def compute_backoff(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's retry-after."""
+    cap = settings.AZURE_OPENAI_BACKOFF_MAX_SECONDS
+    delay = random.uniform(0, min(cap, settings.AZURE_OPENAI_BACKOFF_BASE_SECONDS * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class ResilientLLMClient:
+    """
+    Wraps an instructor client with deadlines, retries, hedging and a circuit breaker.
+    """
+
+    def __init__(self, client, breaker_name: str):
+        self.client = client
+        self.breaker_name = breaker_name
+
+    def create(
+        self,
+        operation: LLMOperation,
+        deadline: Optional[float] = None,
+        breaker_name: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        admit: Optional[Callable[[float], None]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run chat.completions.create for `operation`.
+
+        Retries 429/5xx/timeouts with jittered exponential backoff (honouring retry-after)
+        until the operation deadline is spent. Raises LLMUnavailableError when the
+        breaker is open or no time is left for another attempt.
+        `breaker_name` selects the deployment's breaker (defaults to the client's own) and
+        `max_retries` lowers the retry count, e.g. when a fallback deployment is available.
+        `admit(max_wait)` is called before every HTTP request, retries and hedges included,
+        to take it from the deployment's rate limiter; it raises LLMUnavailableError when
+        the request cannot be admitted within `max_wait` seconds.
+        """
+        breaker_name = breaker_name or self.breaker_name
+        breaker = get_circuit_breaker(breaker_name)
+        max_retries = settings.AZURE_OPENAI_MAX_RETRIES if max_retries is None else max_retries
+        deadline = deadline or OPERATION_DEADLINES.get(operation, settings.AZURE_OPENAI_TIMEOUT_SECONDS)
+        expires_at = time.monotonic() + deadline
+        attempt = 0
+
+        while True:
+            # Checked before admission so an open breaker does not use up quota
+            if breaker.is_open():
+                raise LLMUnavailableError(
+                    f"Azure OpenAI is temporarily unavailable (circuit '{breaker_name}' open)",
+                    retry_after=breaker.retry_after()
+                )
+
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                raise LLMUnavailableError(f"Deadline of {deadline:.0f}s exceeded for {operation.value}")
+            if admit is not None:
+                admit(remaining)
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    raise LLMUnavailableError(f"Deadline of {deadline:.0f}s exceeded for {operation.value}")
+
+            # After admission, so a half-open probe is never left waiting in the queue
+            if not breaker.allow_request():
+                raise LLMUnavailableError(
+                    f"Azure OpenAI is temporarily unavailable (circuit '{breaker_name}' open)",
+                    retry_after=breaker.retry_after()
+                )
+            timeout = min(settings.AZURE_OPENAI_TIMEOUT_SECONDS, remaining)
+
+            try:
+                if operation in HEDGED_OPERATIONS and settings.AZURE_OPENAI_HEDGE_DELAY_SECONDS > 0:
+                    result = self._hedged_call(timeout, kwargs, admit)
+                else:
+                    result = self.client.chat.completions.create(timeout=timeout, **kwargs)
+                breaker.record_success()
+                return result
+
+            except Exception as e:
+                if not is_retryable(e):
+                    # The service answered (bad request, validation error...), so it is healthy
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+
+                attempt += 1
+                delay = compute_backoff(attempt, get_retry_after(e))
+                if attempt > max_retries or time.monotonic() + delay >= expires_at:
+                    logger.error(f"LLM call {operation.value} failed after {attempt} attempt(s): {str(e)}")
+                    raise
+                logger.warning(
+                    f"LLM call {operation.value} failed ({str(e)}); retry {attempt} in {delay:.2f}s"
+                )
+                time.sleep(delay)
+
+    def _hedged_call(
+        self,
+        timeout: float,
+        kwargs: Dict[str, Any],
+        admit: Optional[Callable[[float], None]] = None
+    ) -> Any:
+        """
+        Start a second identical request if the first has not answered within the hedge
+        delay, and return whichever finishes first successfully. The second request is
+        only sent if the rate limiter admits it without waiting.
+        """
+        call: Callable[[], Any] = lambda: self.client.chat.completions.create(timeout=timeout, **kwargs)
+        primary = _hedge_executor.submit(call)
+        done, _ = wait([primary], timeout=settings.AZURE_OPENAI_HEDGE_DELAY_SECONDS)
+        if done:
+            return primary.result()
+
+        if admit is not None:
+            try:
+                admit(0.0)
+            except LLMUnavailableError:
+                logger.info("Not hedging slow LLM call: no rate limit headroom")
+                return primary.result()
+
+        logger.info("Hedging slow LLM call with a second request")
+        pending = {primary, _hedge_executor.submit(call)}
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
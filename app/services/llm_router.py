@@ -0,0 +1,164 @@
+# app/services/llm_router.py
+"""
+Routing table for Azure OpenAI calls.
+
+Maps each LLMOperation to a tier of deployments (primary first, then fallbacks),
+an output budget and sampling parameters. Short interactive edits go to the fast
+tier; long-form generation stays on the quality tier.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.llm_resilience import LLMOperation
+
+T = TypeVar("T")
+
+
+class ModelTier(str, Enum):
+    FAST = "fast"
+    QUALITY = "quality"
+
+
+@dataclass(frozen=True)
+class RouteConfig:
+    operation: LLMOperation
+    tier: ModelTier
+    deployments: Tuple[str, ...]
+    max_tokens: Optional[int] = None  # Fixed budget; None sizes it per call (see llm_budget)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RoutingDecision:
+    operation: LLMOperation
+    tier: ModelTier
+    deployment: str
+    fallback_used: bool
+    skipped_deployments: List[str]
+    max_tokens: Optional[int]
+    queue_wait_seconds: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "operation": self.operation.value,
+            "tier": self.tier.value,
+            "deployment": self.deployment,
+            "fallback_used": self.fallback_used,
+            "skipped_deployments": self.skipped_deployments,
+            "max_tokens": self.max_tokens,
+            "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+        }
+
+
+OPERATION_TIERS: Dict[LLMOperation, ModelTier] = {
+    LLMOperation.BEAT_SHEET: ModelTier.QUALITY,
+    LLMOperation.SCENES_FOR_BEAT: ModelTier.QUALITY,
+    LLMOperation.REGENERATE_SCENE: ModelTier.QUALITY,
+    LLMOperation.SCENE_DESCRIPTION: ModelTier.QUALITY,
+    LLMOperation.SCENE_SEGMENT: ModelTier.QUALITY,
+    LLMOperation.SHORTEN: ModelTier.FAST,
+    LLMOperation.REWRITE: ModelTier.FAST,
+    LLMOperation.EXPAND: ModelTier.FAST,
+    LLMOperation.CONTINUE: ModelTier.FAST,
+}
+
+
+def _dedupe(names: List[Optional[str]]) -> Tuple[str, ...]:
+    seen = []
+    for name in names:
+        if name and name not in seen:
+            seen.append(name)
+    return tuple(seen)
+
+
+def _tier_deployments(tier: ModelTier) -> Tuple[str, ...]:
+    fallbacks = list(settings.AZURE_OPENAI_FALLBACK_DEPLOYMENTS)
+    if tier == ModelTier.FAST:
+        return _dedupe([settings.AZURE_OPENAI_FAST_DEPLOYMENT_NAME, settings.AZURE_OPENAI_DEPLOYMENT_NAME] + fallbacks)
+    return _dedupe([settings.AZURE_OPENAI_DEPLOYMENT_NAME] + fallbacks)
+
+
+def _default_route(operation: LLMOperation) -> RouteConfig:
+    tier = OPERATION_TIERS.get(operation, ModelTier.QUALITY)
+    params: Dict[str, Any] = {"temperature": settings.AZURE_OPENAI_TEMPERATURE}
+
+    if operation == LLMOperation.SCENE_SEGMENT:
+        params.update({
+            "top_p": settings.AZURE_TOP_P,  # Focus on high-probability words
+            "presence_penalty": settings.AZURE_PRESENCE_PENALTY,  # Discourage repetitive phrases
+            "frequency_penalty": settings.AZURE_FREQUENCY_PENALTY,  # Discourage word repetition
+            "seed": settings.AZURE_SEED,
+        })
+
+    return RouteConfig(
+        operation=operation,
+        tier=tier,
+        deployments=_tier_deployments(tier),
+        params=params,
+    )
+
+
+def get_route(operation: LLMOperation) -> RouteConfig:
+    """
+    Route for an operation, with any AZURE_OPENAI_ROUTES override applied.
+
+    Overrides are keyed by operation value, e.g.
+    {"shorten": {"deployments": ["gpt-4o-mini"], "max_tokens": 1500, "params": {"temperature": 0.7}}}
+    """
+    route = _default_route(operation)
+    override = settings.AZURE_OPENAI_ROUTES.get(operation.value)
+    if not override:
+        return route
+
+    return RouteConfig(
+        operation=operation,
+        tier=ModelTier(override.get("tier", route.tier.value)),
+        deployments=_dedupe(list(override.get("deployments", [])) + list(route.deployments)),
+        max_tokens=override.get("max_tokens", route.max_tokens),
+        params={**route.params, **override.get("params", {})},
+    )
+
+
+# Routing decisions made while serving the current request, picked up by UsageService
+_routing_decisions: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("llm_routing_decisions", default=None)
+
+
+def record_routing_decision(decision: RoutingDecision) -> None:
+    decisions = _routing_decisions.get()
+    if decisions is None:
+        decisions = []
+        _routing_decisions.set(decisions)
+    decisions.append(decision.to_dict())
+
+
+def has_routing_decisions() -> bool:
+    return bool(_routing_decisions.get())
+
+
+def consume_routing_decisions() -> List[Dict[str, Any]]:
+    """Return and clear the routing decisions recorded in the current context."""
+    decisions = _routing_decisions.get()
+    if not decisions:
+        return []
+    # Cleared in place: a worker thread started by run_llm_call shares the list
+    consumed = list(decisions)
+    decisions.clear()
+    return consumed
+
+
+async def run_llm_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call that talks to Azure OpenAI in a worker thread.
+
+    Retries, backoff, hedging and rate-limit waits then never block the event loop.
+    The thread runs in a copy of the caller's context, so the decision list is
+    created here first: decisions recorded by the call land in the caller's list.
+    """
+    if _routing_decisions.get() is None:
+        _routing_decisions.set([])
+    return await run_in_threadpool(func, *args, **kwargs)
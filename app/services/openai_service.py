@@ -7,6 +7,11 @@ from pydantic import BaseModel, Field
 from instructor import from_openai, Mode
 from openai import AzureOpenAI
 from app.config import settings
+from app.services.llm_resilience import (ResilientLLMClient, LLMOperation, LLMUnavailableError,
+                                         get_circuit_breaker, is_retryable)
+from app.services.llm_rate_limiter import get_rate_limiter
+from app.services.llm_router import get_route, record_routing_decision, RoutingDecision, RouteConfig
+from app.services.llm_budget import estimate_output_budget, next_budget, is_truncated
 import traceback
 
 
@@ -72,18 +77,121 @@ class AzureOpenAIService:
             api_key=settings.AZURE_OPENAI_API_KEY,
             api_version=settings.AZURE_OPENAI_API_VERSION,
             azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+            timeout=settings.AZURE_OPENAI_TIMEOUT_SECONDS,
+            max_retries=0,  # Retries are handled by ResilientLLMClient
         )
         self.client = from_openai(self.azure_client, mode=Mode.TOOLS_STRICT)
         self.deployment_name = settings.AZURE_OPENAI_DEPLOYMENT_NAME
+        self.resilient_client = ResilientLLMClient(self.client, breaker_name=self.deployment_name)
+
+    def _create(
+        self,
+        operation: LLMOperation,
+        source_text: Optional[str] = None,
+        expected_words: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Run a structured chat completion with a right-sized output budget.
+
+        max_tokens is estimated from `source_text` (the text being edited) or
+        `expected_words` and the response model, and only raised - up to
+        AZURE_OPENAI_MAX_TOKENS - when the model actually ran out of tokens.
+        """
+        route = get_route(operation)
+        max_tokens = (
+            kwargs.pop("max_tokens", None)
+            or route.max_tokens
+            or estimate_output_budget(operation, kwargs.get("response_model"), source_text, expected_words)
+        )
+        escalations = 0
+
+        while True:
+            try:
+                return self._create_on_route(operation, route, {**kwargs, "max_tokens": max_tokens})
+            except Exception as e:
+                larger = None
+                if is_truncated(e) and escalations < settings.AZURE_OPENAI_BUDGET_MAX_ESCALATIONS:
+                    larger = next_budget(max_tokens)
+                if larger is None:
+                    raise
+                logger.warning(
+                    f"LLM call {operation.value} truncated at {max_tokens} tokens; retrying with {larger}"
+                )
+                max_tokens = larger
+                escalations += 1
+
+    def _create_on_route(self, operation: LLMOperation, route: RouteConfig, kwargs: Dict[str, Any]):
+        """
+        Run a structured chat completion on the deployment chosen by the routing table.
+
+        Each candidate deployment gets its own rate limiter and circuit breaker. While a
+        fallback is still available, a deployment whose breaker is open is skipped and a
+        throttled one gets a short queue wait and a single retry before moving on.
+        """
+        skipped: List[str] = []
+        last_error: Optional[BaseException] = None
+
+        for index, deployment in enumerate(route.deployments):
+            is_last = index == len(route.deployments) - 1
+            if not is_last and get_circuit_breaker(deployment).is_open():
+                skipped.append(deployment)
+                continue
+
+            params = {**route.params, **kwargs, "model": deployment}
+            limiter = get_rate_limiter(deployment)
+            queue_limit = (
+                settings.AZURE_OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS if is_last
+                else settings.AZURE_OPENAI_FALLBACK_MAX_WAIT_SECONDS
+            )
+            waits: List[float] = []
+
+            def admit(max_wait: float) -> None:
+                # Every request sent to the deployment, retries and hedges included, is charged
+                waits.append(limiter.acquire(
+                    operation,
+                    params["messages"],
+                    params.get("max_tokens"),
+                    max_wait=min(max_wait, queue_limit)
+                ))
+
+            try:
+                response = self.resilient_client.create(
+                    operation,
+                    breaker_name=deployment,
+                    max_retries=None if is_last else 1,
+                    admit=admit,
+                    **params
+                )
+            except Exception as e:
+                if is_last or not (isinstance(e, LLMUnavailableError) or is_retryable(e)):
+                    raise
+                logger.warning(f"Deployment {deployment} unavailable for {operation.value}, falling back: {str(e)}")
+                skipped.append(deployment)
+                last_error = e
+                continue
+
+            decision = RoutingDecision(
+                operation=operation,
+                tier=route.tier,
+                deployment=deployment,
+                fallback_used=bool(skipped),
+                skipped_deployments=skipped,
+                max_tokens=params.get("max_tokens"),
+                queue_wait_seconds=sum(waits),
+            )
+            record_routing_decision(decision)
+            logger.info(f"LLM route: {decision.to_dict()}")
+            return response
+
+        raise last_error or LLMUnavailableError(f"No deployment configured for {operation.value}")
 
     def _make_request(self, messages: List[dict]) -> List[Beat]:
         try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.BEAT_SHEET,
                 messages=messages,
                 response_model=List[Beat],
-                max_tokens=settings.AZURE_OPENAI_MAX_TOKENS,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE,
             )
             return response
         except Exception as e:
@@ -143,13 +251,38 @@ class AzureOpenAIService:
             {"role": "user", "content": user_prompt},
         ]
 
+        # Streams cannot be retried midway, but they still respect the routing table, skip
+        # deployments whose circuit breaker is open and take their request from the rate limiter
+        route = get_route(LLMOperation.BEAT_SHEET)
+        deployment = next(
+            (name for name in route.deployments if not get_circuit_breaker(name).is_open()),
+            None
+        )
+        max_tokens = route.max_tokens or estimate_output_budget(LLMOperation.BEAT_SHEET, List[Beat])
+        if deployment is None:
+            breaker = get_circuit_breaker(route.deployments[0])
+            raise LLMUnavailableError(
+                "Azure OpenAI is temporarily unavailable",
+                retry_after=breaker.retry_after()
+            )
+        waited = get_rate_limiter(deployment).acquire(LLMOperation.BEAT_SHEET, messages, max_tokens)
+        record_routing_decision(RoutingDecision(
+            operation=LLMOperation.BEAT_SHEET,
+            tier=route.tier,
+            deployment=deployment,
+            fallback_used=deployment != route.deployments[0],
+            skipped_deployments=list(route.deployments[:route.deployments.index(deployment)]),
+            max_tokens=max_tokens,
+            queue_wait_seconds=waited,
+        ))
+
         # Use create_partial to stream progress; each yield is a partial List[Beat]
         return self.client.chat.completions.create_partial(
-            model=self.deployment_name,
+            model=deployment,
             messages=messages,
             response_model=List[Beat],
-            max_tokens=settings.AZURE_OPENAI_MAX_TOKENS,
-            temperature=settings.AZURE_OPENAI_TEMPERATURE,
+            max_tokens=max_tokens,
+            **route.params,
         )
 
     def generate_scenes_for_beat(
@@ -192,15 +325,13 @@ class AzureOpenAIService:
         """
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.SCENES_FOR_BEAT,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=List[GeneratedScene],
-                max_tokens=settings.AZURE_OPENAI_MAX_TOKENS,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE,
             )
             
             return response
@@ -274,15 +405,13 @@ class AzureOpenAIService:
         """
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.REGENERATE_SCENE,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=GeneratedScene,
-                max_tokens=settings.AZURE_OPENAI_MAX_TOKENS,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE,
             )
             
             return response
@@ -359,15 +488,13 @@ class AzureOpenAIService:
         """
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.SCENE_DESCRIPTION,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=List[GeneratedScene],
-                max_tokens=settings.AZURE_OPENAI_MAX_TOKENS,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE,
             )
             
             return response
@@ -471,19 +598,14 @@ class AzureOpenAIService:
 
         try:
             # Use instructor's from_openai wrapper to get structured output
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.SCENE_SEGMENT,
+                expected_words=min_word_count,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=GeneratedSceneSegment,
-                max_tokens=settings.AZURE_OPENAI_MAX_TOKENS,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE,
-                top_p=settings.AZURE_TOP_P,        # Focus on high-probability words
-                presence_penalty=settings.AZURE_PRESENCE_PENALTY,  # Discourage repetitive phrases
-                frequency_penalty=settings.AZURE_FREQUENCY_PENALTY,  # Discourage word repetition
-                seed=settings.AZURE_SEED
             )
             return response
 
@@ -526,14 +648,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with your schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.SHORTEN,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptShortenerResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             
             return response
@@ -593,14 +715,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with your schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.SHORTEN,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptShortenerResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             logger.info(response)
             return response
@@ -662,14 +784,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with your schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.REWRITE,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptRewriteResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             
             return response
@@ -737,14 +859,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with your schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.REWRITE,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptRewriteResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             
             return response
@@ -796,14 +918,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with your schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.EXPAND,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptExpansionResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             
             return response
@@ -865,14 +987,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with your schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.EXPAND,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptExpansionResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             
             return response
@@ -936,14 +1058,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with the ScriptContinuationResponse schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.CONTINUE,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptContinuationResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             
             return response
@@ -1013,14 +1135,14 @@ class AzureOpenAIService:
         
         try:
             # Use instructor with the ScriptContinuationResponse schema
-            response = self.client.chat.completions.create(
-                model=self.deployment_name,
+            response = self._create(
+                LLMOperation.CONTINUE,
+                source_text=text,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_model=ScriptContinuationResponse,
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
             )
             
             return response
@@ -0,0 +1,389 @@
+# app/services/operation_log_service.py
+"""
+Operation-log editing of component content.
+
+Instead of replacing whole components, editors send text ranges against the
+script revision they last saw (POST /scripts/{id}/operations). Under the script
+row lock the server transforms each edit past every logged operation on the same
+component since that revision, applies the result to the component row and
+appends it to `script_operations`. Two sessions typing in the same component both
+keep their text, and a one-character edit costs a one-character payload.
+
+Content is applied on write, so every existing read path keeps working unchanged;
+the log only exists to merge concurrent edits. Whole-content replacements from
+the ORM paths (apply_script_changes, batch updates, AI apply) are logged too, as
+a prefix/suffix diff, so edits made concurrently with them still transform.
+compact() trims entries older than OPERATION_LOG_RETENTION_MINUTES and raises
+Script.operation_log_floor; edits based on a revision below the floor must be
+re-based on a fresh snapshot.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import asyncio
+import logging
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, delete, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.operations import ScriptOperation
+from app.models.scene_segments import ComponentType, SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.schemas.operations import (
+    ComponentEdit,
+    LoggedEdit,
+    OperationBatchRequest,
+    OperationBatchResponse,
+    OperationLogResponse,
+    TextChange,
+)
+from app.services import text_operations
+from app.services.character_index_service import CharacterIndexService
+from app.services.script_revision import bump_script_revision, component_revision
+
+logger = logging.getLogger(__name__)
+
+
+def _changes(operation: text_operations.TextOp) -> List[TextChange]:
+    return [
+        TextChange(position=position, delete_count=delete_count, insert=insert)
+        for position, delete_count, insert in text_operations.to_ranges(operation)
+    ]
+
+
+def _replacement(old: str, new: str) -> text_operations.TextOp:
+    """Smallest single-range operation turning old into new (common prefix/suffix kept)."""
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]:
+        suffix += 1
+    return text_operations.from_ranges(
+        len(old), [(prefix, len(old) - prefix - suffix, new[prefix:len(new) - suffix])]
+    )
+
+
+class OperationLogService:
+    @staticmethod
+    def _lock_script(db: Session, script_id: UUID, user_id: UUID):
+        row = db.query(Script.user_id, Script.revision, Script.operation_log_floor).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).with_for_update().first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if row.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+        return row
+
+    @staticmethod
+    def _check_base(since: int, revision: int, floor: int) -> None:
+        if since > revision:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Requested revision is ahead of the script; reload the snapshot"
+            )
+        if since < floor:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Edit log before revision {floor} has been compacted; reload the snapshot"
+            )
+
+    @staticmethod
+    def submit(
+        db: Session,
+        script_id: UUID,
+        user_id: UUID,
+        request: OperationBatchRequest
+    ) -> OperationBatchResponse:
+        """
+        Merge a batch of text edits made against `request.base_revision` and apply it.
+
+        Edits to the same component are sequential (each relative to the content
+        after the previous one). Concurrent logged operations win ties: text
+        inserted at the same position by an earlier writer stays first.
+        """
+        try:
+            script = OperationLogService._lock_script(db, script_id, user_id)
+            OperationLogService._check_base(request.base_revision, script.revision, script.operation_log_floor)
+
+            component_ids = {edit.component_id for edit in request.edits}
+            contents: Dict[UUID, str] = dict(
+                db.query(SceneSegmentComponent.id, SceneSegmentComponent.content).join(
+                    SceneSegment, SceneSegmentComponent.scene_segment_id == SceneSegment.id
+                ).filter(
+                    and_(
+                        SceneSegmentComponent.id.in_(component_ids),
+                        SceneSegmentComponent.is_deleted.is_(False),
+                        SceneSegment.script_id == script_id,
+                        SceneSegment.is_deleted.is_(False)
+                    )
+                ).all()
+            )
+
+            # Operations other writers applied after the client's base revision
+            concurrent: Dict[UUID, List[text_operations.TextOp]] = defaultdict(list)
+            logged = db.query(ScriptOperation.component_id, ScriptOperation.operations).filter(
+                and_(
+                    ScriptOperation.component_id.in_(list(contents)),
+                    ScriptOperation.revision > request.base_revision
+                )
+            ).order_by(ScriptOperation.revision).all()
+            for component_id, operations in logged:
+                concurrent[component_id].extend(operations)
+
+            applied: Dict[UUID, List[text_operations.TextOp]] = defaultdict(list)
+            applied_edits: List[ComponentEdit] = []
+            client_lengths: Dict[UUID, int] = {}
+            for edit in request.edits:
+                component_id = edit.component_id
+                if component_id not in contents:
+                    continue
+                pending = concurrent[component_id]
+                if component_id not in client_lengths:
+                    client_lengths[component_id] = (
+                        text_operations.base_length(pending[0]) if pending else len(contents[component_id])
+                    )
+                operation = text_operations.from_ranges(
+                    client_lengths[component_id],
+                    [(change.position, change.delete_count, change.insert) for change in edit.changes]
+                )
+                client_lengths[component_id] = text_operations.target_length(operation)
+
+                # Rebase past the concurrent operations; they are rebased past this
+                # edit in turn for the client's next edit to the same component
+                rebased = []
+                for other in pending:
+                    other, operation = text_operations.transform(other, operation)
+                    rebased.append(other)
+                concurrent[component_id] = rebased
+
+                contents[component_id] = text_operations.apply(contents[component_id], operation)
+                applied[component_id].append(operation)
+                applied_edits.append(ComponentEdit(component_id=component_id, changes=_changes(operation)))
+
+            revision = script.revision
+            if applied:
+                revision = bump_script_revision(db, script_ids=[script_id])[script_id]
+                for component_id in applied:
+                    db.execute(
+                        update(SceneSegmentComponent)
+                        .where(SceneSegmentComponent.id == component_id)
+                        .values(content=contents[component_id], revision=component_revision()),
+                        execution_options={"synchronize_session": False}
+                    )
+                db.execute(insert(ScriptOperation), [
+                    {
+                        "script_id": script_id,
+                        "component_id": component_id,
+                        "revision": revision,
+                        "operations": operations,
+                        "user_id": user_id,
+                        "client_id": request.client_id,
+                    }
+                    for component_id, operations in applied.items()
+                ])
+                CharacterIndexService.refresh_segments(db, {
+                    segment_id for (segment_id,) in db.query(SceneSegmentComponent.scene_segment_id).filter(
+                        and_(
+                            SceneSegmentComponent.id.in_(list(applied)),
+                            SceneSegmentComponent.component_type == ComponentType.DIALOGUE
+                        )
+                    ).distinct()
+                })
+            db.commit()
+        except HTTPException:
+            db.rollback()
+            raise
+        except text_operations.OperationError as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Edits do not match the content at revision {request.base_revision}: {str(e)}"
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error applying operations to script {script_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error applying operations: {str(e)}"
+            )
+
+        return OperationBatchResponse(
+            script_id=script_id,
+            base_revision=request.base_revision,
+            revision=revision,
+            applied=applied_edits,
+            dropped_component_ids=sorted(component_ids - set(contents), key=str)
+        )
+
+    @staticmethod
+    def get_operations(db: Session, script_id: UUID, user_id: UUID, since: int) -> OperationLogResponse:
+        """Logged edits after revision `since`, oldest first, for clients rebasing local edits."""
+        script = db.query(Script.user_id, Script.revision, Script.operation_log_floor).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).first()
+        if script is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if script.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+        OperationLogService._check_base(since, script.revision, script.operation_log_floor)
+
+        rows = db.query(ScriptOperation).filter(
+            and_(
+                ScriptOperation.script_id == script_id,
+                ScriptOperation.revision > since,
+                ScriptOperation.revision <= script.revision
+            )
+        ).order_by(ScriptOperation.revision).all()
+        return OperationLogResponse(
+            script_id=script_id,
+            since=since,
+            revision=script.revision,
+            operations=[
+                LoggedEdit(
+                    component_id=row.component_id,
+                    changes=_changes(operation),
+                    revision=row.revision,
+                    client_id=row.client_id
+                )
+                for row in rows for operation in row.operations
+            ]
+        )
+
+    @staticmethod
+    def compact(db: Session, cutoff: datetime, batch_size: int) -> int:
+        """
+        Drop one batch of log entries created before cutoff and raise the floors of
+        their scripts, in one statement. Returns the number of entries removed; commits.
+        """
+        doomed = (
+            select(ScriptOperation.id)
+            .where(ScriptOperation.created_at < cutoff)
+            .order_by(ScriptOperation.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        removed = (
+            delete(ScriptOperation)
+            .where(ScriptOperation.id.in_(doomed))
+            .returning(ScriptOperation.script_id, ScriptOperation.revision)
+            .cte("removed")
+        )
+        floors = (
+            select(
+                removed.c.script_id,
+                func.max(removed.c.revision).label("floor"),
+                func.count().label("entries")
+            )
+            .group_by(removed.c.script_id)
+            .subquery("floors")
+        )
+        result = db.execute(
+            update(Script)
+            .where(Script.id == floors.c.script_id)
+            .values(
+                operation_log_floor=func.greatest(Script.operation_log_floor, floors.c.floor),
+                updated_at=Script.updated_at
+            )
+            .returning(floors.c.entries)
+            .add_cte(removed),
+            execution_options={"synchronize_session": False}
+        )
+        entries = sum(result.scalars())
+        db.commit()
+        return entries
+
+    @staticmethod
+    def run_compaction(db: Session, retention_minutes: Optional[int] = None) -> Dict[str, Any]:
+        retention_minutes = retention_minutes or settings.OPERATION_LOG_RETENTION_MINUTES
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=retention_minutes)
+        removed = 0
+        while True:
+            batch = OperationLogService.compact(db, cutoff, settings.OPERATION_LOG_COMPACTION_BATCH_SIZE)
+            removed += batch
+            if batch < settings.OPERATION_LOG_COMPACTION_BATCH_SIZE:
+                break
+        return {"cutoff": cutoff, "entries_removed": removed}
+
+
+async def run_compaction_loop() -> None:
+    """Background task: compact the edit log every OPERATION_LOG_COMPACTION_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(settings.OPERATION_LOG_COMPACTION_INTERVAL_SECONDS)
+        db = SessionLocal()
+        try:
+            report = await run_in_threadpool(OperationLogService.run_compaction, db)
+            logger.info(f"Edit log compaction removed {report['entries_removed']} entries")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Edit log compaction failed: {str(e)}")
+        finally:
+            db.close()
+
+
+# Registered after script_revision's before_flush hook (imported above), so the
+# script rows are already locked and the components stamped with the new revision
+@event.listens_for(Session, "before_flush")
+def _log_content_replacements(session: Session, flush_context, instances) -> None:
+    """
+    Log ORM rewrites of component content as operations, stamped with the flush's revision.
+
+    Each rewrite is diffed against the content stored now, read under the script
+    row lock, rather than the value the session loaded earlier: an edit applied
+    since then is part of the log, and the logged operation must start from it.
+    """
+    rewritten = {}
+    for obj in session.dirty:
+        if not isinstance(obj, SceneSegmentComponent) or not isinstance(obj.revision, int):
+            continue
+        history = inspect(obj).attrs.content.history
+        if history.added and history.added[0] is not None:
+            rewritten[obj.id] = obj
+    if not rewritten:
+        return
+
+    connection = session.connection()
+    stored = connection.execute(
+        select(SceneSegmentComponent.id, SceneSegmentComponent.content, SceneSegment.script_id)
+        .join(SceneSegment, SceneSegmentComponent.scene_segment_id == SceneSegment.id)
+        .where(SceneSegmentComponent.id.in_(rewritten))
+    ).all()
+    rows = [
+        {
+            "script_id": script_id,
+            "component_id": component_id,
+            "revision": rewritten[component_id].revision,
+            "operations": [_replacement(old, rewritten[component_id].content)],
+        }
+        for component_id, old, script_id in stored
+        if old is not None and old != rewritten[component_id].content
+    ]
+    if rows:
+        connection.execute(insert(ScriptOperation), rows)
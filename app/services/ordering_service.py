@@ -0,0 +1,338 @@
+# app/services/ordering_service.py
+"""
+Fractional ordering for scene segments and components.
+
+Rows are ordered by a float key (SceneSegment.segment_number,
+SceneSegmentComponent.position) spaced ORDER_SPACING apart. Inserting or moving
+rows picks keys between the neighbours, so a reorder only writes the moved rows.
+Repeated bisection eventually exhausts float precision; that is detected and the
+parent's rows are renumbered with a single UPDATE before new keys are handed out.
+
+Appending at the end goes through a counter column on the parent row, bumped with
+UPDATE ... RETURNING, so concurrent writers never receive the same key.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.services.script_revision import bump_script_revision, component_revision, segment_revision
+
+logger = logging.getLogger(__name__)
+
+ORDER_SPACING = 1000.0
+# Keys closer than this (relative to their magnitude) are treated as exhausted.
+# Doubles carry 52 bits of mantissa; keep a wide margin for client-side bisection.
+MIN_RELATIVE_GAP = 2.0 ** -32
+
+
+@dataclass(frozen=True)
+class OrderedCollection:
+    """
+    Describes one ordered child table: its key column, its parent column and the
+    counter column on the parent row used to append at the end.
+    """
+    name: str
+    model: Any
+    key_attr: str
+    parent_attr: str
+    parent_model: Any
+    counter_attr: str
+
+    @property
+    def key(self):
+        return getattr(self.model, self.key_attr)
+
+    @property
+    def parent(self):
+        return getattr(self.model, self.parent_attr)
+
+    def live(self, parent_id: UUID):
+        return and_(self.parent == parent_id, self.model.is_deleted.is_(False))
+
+    def touch(self, db: Session, parent_id: UUID) -> None:
+        """
+        Bump the owning script's revision before a Core write to this collection;
+        the write then stamps its rows with `revision()`.
+        """
+        if self.parent_model is Script:
+            bump_script_revision(db, script_ids=[parent_id])
+        else:
+            bump_script_revision(db, segment_ids=[parent_id])
+
+    def revision(self):
+        """The owning script's current revision, for a Core UPDATE of this collection."""
+        return segment_revision() if self.model is SceneSegment else component_revision()
+
+
+SEGMENTS = OrderedCollection(
+    "segment", SceneSegment, "segment_number", "script_id", Script, "segment_number_seq"
+)
+COMPONENTS = OrderedCollection(
+    "component", SceneSegmentComponent, "position", "scene_segment_id", SceneSegment, "component_position_seq"
+)
+
+
+def is_exhausted(low: float, high: float) -> bool:
+    """True when no usable key fits strictly between low and high."""
+    scale = max(abs(low), abs(high), 1.0)
+    return high - low <= scale * MIN_RELATIVE_GAP
+
+
+def keys_between(low: Optional[float], high: Optional[float], count: int = 1) -> Optional[List[float]]:
+    """
+    `count` evenly spaced keys strictly between low and high (None = open end).
+
+    Returns None if float precision is exhausted and the parent must be renumbered.
+    """
+    if low is None and high is None:
+        return [ORDER_SPACING * i for i in range(1, count + 1)]
+    if high is None:
+        return [low + ORDER_SPACING * i for i in range(1, count + 1)]
+    if low is None:
+        return [high - ORDER_SPACING * (count - i + 1) for i in range(1, count + 1)]
+
+    step = (high - low) / (count + 1)
+    keys = [low + step * i for i in range(1, count + 1)]
+    bounds = [low] + keys + [high]
+    if any(is_exhausted(a, b) for a, b in zip(bounds, bounds[1:])):
+        return None
+    return keys
+
+
+class OrderingService:
+    @staticmethod
+    def renumber(db: Session, collection: OrderedCollection, parent_id: UUID) -> int:
+        """
+        Respace every live row of a parent to ORDER_SPACING multiples, keeping the order.
+
+        One UPDATE ... FROM (row_number() OVER ...) statement; does not commit.
+        """
+        ranked = (
+            select(
+                collection.model.id.label("id"),
+                func.row_number().over(order_by=(collection.key, collection.model.id)).label("rank")
+            )
+            .where(collection.live(parent_id))
+            .subquery()
+        )
+        collection.touch(db, parent_id)
+        result = db.execute(
+            update(collection.model)
+            .where(collection.model.id == ranked.c.id)
+            .values({collection.key_attr: ranked.c.rank * ORDER_SPACING, "revision": collection.revision()}),
+            execution_options={"synchronize_session": False}
+        )
+        logger.info(f"Renumbered {result.rowcount} {collection.name}s of {parent_id}")
+        return result.rowcount
+
+    @staticmethod
+    def allocate_end(
+        db: Session,
+        collection: OrderedCollection,
+        parent_id: UUID,
+        count: int = 1
+    ) -> List[float]:
+        """
+        Reserve `count` consecutive keys after the last row of a parent.
+
+        One UPDATE ... RETURNING on the parent's counter: the row lock serialises
+        concurrent allocators, and GREATEST() with the current MAX() keeps the counter
+        ahead of rows placed explicitly (moves, older clients). Does not commit; the
+        lock is held until the caller's transaction ends.
+        """
+        counter = getattr(collection.parent_model, collection.counter_attr)
+        current_max = (
+            select(func.coalesce(func.max(collection.key), 0.0))
+            .where(collection.live(parent_id))
+            .scalar_subquery()
+        )
+        # updated_at is kept as is: reserving keys is not an edit of the parent
+        last_key = db.execute(
+            update(collection.parent_model)
+            .where(collection.parent_model.id == parent_id)
+            .values({
+                collection.counter_attr: func.greatest(counter, current_max) + ORDER_SPACING * count,
+                "updated_at": collection.parent_model.updated_at
+            })
+            .returning(counter),
+            execution_options={"synchronize_session": False}
+        ).scalar()
+        if last_key is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Parent of {collection.name} not found"
+            )
+        return [last_key - ORDER_SPACING * (count - i) for i in range(1, count + 1)]
+
+    @staticmethod
+    def get_neighbours(
+        db: Session,
+        collection: OrderedCollection,
+        parent_id: UUID,
+        key: float,
+        exclude_ids: Optional[List[UUID]] = None
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Keys of the live rows immediately before and after `key`, in one query."""
+        conditions = [collection.live(parent_id)]
+        if exclude_ids:
+            conditions.append(collection.model.id.notin_(exclude_ids))
+        live = and_(*conditions)
+        lower = select(func.max(collection.key)).where(and_(live, collection.key < key)).scalar_subquery()
+        upper = select(func.min(collection.key)).where(and_(live, collection.key > key)).scalar_subquery()
+        row = db.execute(select(lower, upper)).one()
+        return row[0], row[1]
+
+    @staticmethod
+    def rebalance_if_needed(
+        db: Session,
+        collection: OrderedCollection,
+        parent_id: UUID,
+        key: float
+    ) -> bool:
+        """
+        Renumber the parent if `key` has (nearly) collided with a neighbour.
+
+        Call after writing a client-chosen key; does not commit.
+        """
+        low, high = OrderingService.get_neighbours(db, collection, parent_id, key)
+        if (low is not None and is_exhausted(low, key)) or (high is not None and is_exhausted(key, high)):
+            OrderingService.renumber(db, collection, parent_id)
+            return True
+        return False
+
+    @staticmethod
+    def _gap_after(
+        db: Session,
+        collection: OrderedCollection,
+        parent_id: UUID,
+        after_id: Optional[UUID],
+        exclude_ids: List[UUID]
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Keys bounding the slot right after `after_id` (None = before the first row)."""
+        if after_id is None:
+            first = db.query(func.min(collection.key)).filter(
+                and_(collection.live(parent_id), collection.model.id.notin_(exclude_ids))
+            ).scalar()
+            return None, first
+
+        after_key = db.query(collection.key).filter(
+            and_(collection.model.id == after_id, collection.live(parent_id))
+        ).scalar()
+        if after_key is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Anchor {collection.name} not found in the same parent"
+            )
+        _, high = OrderingService.get_neighbours(db, collection, parent_id, after_key, exclude_ids)
+        return after_key, high
+
+    @staticmethod
+    def allocate_after(
+        db: Session,
+        collection: OrderedCollection,
+        parent_id: UUID,
+        after_id: Optional[UUID],
+        count: int = 1,
+        exclude_ids: Optional[List[UUID]] = None
+    ) -> Tuple[List[float], bool]:
+        """
+        Keys for `count` rows placed right after `after_id` (None = at the start).
+
+        Renumbers the parent first if there is no room. Returns (keys, renumbered);
+        does not commit.
+        """
+        exclude_ids = exclude_ids or []
+        low, high = OrderingService._gap_after(db, collection, parent_id, after_id, exclude_ids)
+        keys = keys_between(low, high, count)
+        if keys is not None:
+            return keys, False
+
+        OrderingService.renumber(db, collection, parent_id)
+        low, high = OrderingService._gap_after(db, collection, parent_id, after_id, exclude_ids)
+        keys = keys_between(low, high, count)
+        if keys is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Could not allocate positions for {collection.name}s"
+            )
+        return keys, True
+
+    @staticmethod
+    def move_range(
+        db: Session,
+        collection: OrderedCollection,
+        item_ids: List[UUID],
+        after_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Move a set of rows (kept in their current relative order) to sit right after
+        `after_id`, or at the start of the parent when `after_id` is None.
+
+        Only the moved rows are written, with one UPDATE, unless float precision runs
+        out between the neighbours, in which case the parent is renumbered first.
+        """
+        if not item_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No {collection.name}s to move"
+            )
+        if after_id is not None and after_id in item_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot move {collection.name}s after one of themselves"
+            )
+
+        items = db.query(collection.model.id, collection.parent, collection.key).filter(
+            and_(
+                collection.model.id.in_(item_ids),
+                collection.model.is_deleted.is_(False)
+            )
+        ).order_by(collection.key).all()
+        parent_ids = {item[1] for item in items}
+        if len(items) != len(set(item_ids)) or len(parent_ids) != 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"All {collection.name}s must exist and share the same parent"
+            )
+        parent_id = parent_ids.pop()
+        ordered_ids = [item[0] for item in items]
+
+        try:
+            keys, renumbered = OrderingService.allocate_after(
+                db, collection, parent_id, after_id, len(ordered_ids), exclude_ids=ordered_ids
+            )
+            new_keys = dict(zip(ordered_ids, keys))
+            collection.touch(db, parent_id)
+            db.execute(
+                update(collection.model)
+                .where(collection.model.id.in_(ordered_ids))
+                .values({
+                    collection.key_attr: case(new_keys, value=collection.model.id),
+                    "revision": collection.revision()
+                }),
+                execution_options={"synchronize_session": False}
+            )
+            db.commit()
+        except HTTPException:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error moving {collection.name}s: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error moving {collection.name}s: {str(e)}"
+            )
+
+        return {
+            "parent_id": parent_id,
+            "renumbered": renumbered,
+            "positions": {str(item_id): key for item_id, key in new_keys.items()},
+        }
@@ -0,0 +1,229 @@
+# app/services/page_estimate_service.py
+"""
+Page-count and runtime estimates per segment, beat and script.
+
+Laying out a segment (wrapping every component to its column) is the costly
+step, so each segment's blocks are cached in segment_layouts and only segments
+whose components changed since are laid out again. Flowing the cached blocks
+onto pages is a single pass over a few integers per component, cheap enough to
+run on every autosave. See app/services/screenplay_layout.py for the metrics.
+
+Runtime uses the one-page-per-minute rule (PAGINATION_SECONDS_PER_PAGE).
+"""
+from collections import defaultdict
+from typing import Dict, List
+from uuid import UUID
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.beats import Beat
+from app.models.pagination import SegmentLayout
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.schemas.pagination import BeatPageEstimate, ScriptPageEstimate, SegmentPageEstimate
+from app.services import screenplay_layout
+from app.services.screenplay_layout import Block
+
+logger = logging.getLogger(__name__)
+
+
+def _eighths(pages: float) -> int:
+    if pages <= 0:
+        return 0
+    return max(1, round(pages * 8))
+
+
+class PageEstimateService:
+    @staticmethod
+    def load_layouts(db: Session, script_id: UUID) -> List[tuple]:
+        """
+        (segment_id, beat_id, segment_number, blocks) of the script's live segments
+        in order, laying out and caching the segments that changed. Does not commit.
+        """
+        segments = db.query(
+            SceneSegment.id,
+            SceneSegment.beat_id,
+            SceneSegment.segment_number,
+            func.coalesce(func.max(SceneSegmentComponent.revision), 0),
+            func.count(SceneSegmentComponent.id),
+        ).outerjoin(
+            SceneSegmentComponent, SceneSegmentComponent.scene_segment_id == SceneSegment.id
+        ).filter(
+            and_(
+                SceneSegment.script_id == script_id,
+                SceneSegment.is_deleted.is_(False)
+            )
+        ).group_by(SceneSegment.id).order_by(SceneSegment.segment_number).all()
+
+        cached = {
+            row.segment_id: row for row in db.query(
+                SegmentLayout.segment_id,
+                SegmentLayout.content_revision,
+                SegmentLayout.component_count,
+                SegmentLayout.layout_version,
+                SegmentLayout.blocks
+            ).filter(SegmentLayout.script_id == script_id)
+        }
+
+        layouts: Dict[UUID, List[Block]] = {}
+        stale: Dict[UUID, tuple] = {}
+        for segment_id, _, _, content_revision, component_count in segments:
+            layout = cached.get(segment_id)
+            if layout is not None and (
+                layout.content_revision, layout.component_count, layout.layout_version
+            ) == (content_revision, component_count, screenplay_layout.LAYOUT_VERSION):
+                layouts[segment_id] = [Block.from_json(block) for block in layout.blocks]
+            else:
+                stale[segment_id] = (content_revision, component_count)
+
+        if stale:
+            components = defaultdict(list)
+            for component in db.query(
+                SceneSegmentComponent.scene_segment_id,
+                SceneSegmentComponent.component_type,
+                SceneSegmentComponent.content,
+                SceneSegmentComponent.character_name,
+                SceneSegmentComponent.parenthetical
+            ).filter(
+                and_(
+                    SceneSegmentComponent.scene_segment_id.in_(list(stale)),
+                    SceneSegmentComponent.is_deleted.is_(False)
+                )
+            ).order_by(SceneSegmentComponent.scene_segment_id, SceneSegmentComponent.position):
+                components[component.scene_segment_id].append(component)
+
+            rows = []
+            for segment_id, (content_revision, component_count) in stale.items():
+                blocks = screenplay_layout.layout_components(components.get(segment_id, ()))
+                layouts[segment_id] = blocks
+                rows.append({
+                    "segment_id": segment_id,
+                    "script_id": script_id,
+                    "content_revision": content_revision,
+                    "component_count": component_count,
+                    "layout_version": screenplay_layout.LAYOUT_VERSION,
+                    "blocks": [block.to_json() for block in blocks],
+                })
+            statement = pg_insert(SegmentLayout).values(rows)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[SegmentLayout.segment_id],
+                set_={
+                    "content_revision": statement.excluded.content_revision,
+                    "component_count": statement.excluded.component_count,
+                    "layout_version": statement.excluded.layout_version,
+                    "blocks": statement.excluded.blocks,
+                    "created_at": func.now()
+                }
+            ))
+            logger.debug(f"Laid out {len(stale)} of {len(segments)} segments of script {script_id}")
+
+        return [
+            (segment_id, beat_id, segment_number, layouts[segment_id])
+            for segment_id, beat_id, segment_number, _, _ in segments
+        ]
+
+    @staticmethod
+    def _target_page_lengths(db: Session, script_id: UUID) -> Dict[int, str]:
+        """Suggested page length per beat position, from the generated beat sheet."""
+        complete_json = db.query(Beat.complete_json).filter(
+            and_(
+                Beat.script_id == script_id,
+                Beat.complete_json.isnot(None)
+            )
+        ).order_by(Beat.position).limit(1).scalar()
+        targets: Dict[int, str] = {}
+        for beat in complete_json if isinstance(complete_json, list) else []:
+            if isinstance(beat, dict) and beat.get("beat_number") is not None and beat.get("page_length"):
+                targets[beat["beat_number"]] = str(beat["page_length"])
+        return targets
+
+    @staticmethod
+    def get_estimate(db: Session, script_id: UUID, user_id: UUID) -> ScriptPageEstimate:
+        lines_per_page = settings.PAGINATION_LINES_PER_PAGE
+        seconds_per_page = settings.PAGINATION_SECONDS_PER_PAGE
+
+        script = db.query(Script.user_id, Script.revision).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).first()
+        if script is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if script.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+
+        try:
+            layouts = PageEstimateService.load_layouts(db, script_id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error laying out script {script_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error estimating page count: {str(e)}"
+            )
+
+        spans, page_count = screenplay_layout.paginate([blocks for *_, blocks in layouts], lines_per_page)
+
+        segments: List[SegmentPageEstimate] = []
+        beat_segments: Dict[UUID, List[SegmentPageEstimate]] = defaultdict(list)
+        for (segment_id, beat_id, segment_number, _), (start, end) in zip(layouts, spans):
+            pages = end - start
+            estimate = SegmentPageEstimate(
+                segment_id=segment_id,
+                segment_number=segment_number,
+                beat_id=beat_id,
+                start_page=int(start) + 1,
+                pages=round(pages, 3),
+                eighths=_eighths(pages),
+                runtime_seconds=round(pages * seconds_per_page, 1)
+            )
+            segments.append(estimate)
+            if beat_id is not None:
+                beat_segments[beat_id].append(estimate)
+
+        beats: List[BeatPageEstimate] = []
+        if beat_segments:
+            targets = PageEstimateService._target_page_lengths(db, script_id)
+            for beat in db.query(Beat.id, Beat.position, Beat.beat_title).filter(
+                and_(
+                    Beat.script_id == script_id,
+                    Beat.is_deleted.is_(False)
+                )
+            ).order_by(Beat.position):
+                estimates = beat_segments.get(beat.id, [])
+                pages = sum(estimate.pages for estimate in estimates)
+                beats.append(BeatPageEstimate(
+                    beat_id=beat.id,
+                    position=beat.position,
+                    beat_title=beat.beat_title,
+                    segment_count=len(estimates),
+                    pages=round(pages, 3),
+                    eighths=_eighths(pages),
+                    runtime_seconds=round(pages * seconds_per_page, 1),
+                    target_page_length=targets.get(beat.position)
+                ))
+
+        pages = spans[-1][1] if spans else 0.0
+        return ScriptPageEstimate(
+            script_id=script_id,
+            revision=script.revision,
+            lines_per_page=lines_per_page,
+            page_count=page_count,
+            pages=round(pages, 3),
+            runtime_seconds=round(pages * seconds_per_page, 1),
+            segments=segments,
+            beats=beats
+        )
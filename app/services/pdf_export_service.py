@@ -0,0 +1,316 @@
+# app/services/pdf_export_service.py
+"""
+PDF export.
+
+Layout and rendering (app/services/screenplay_pdf.py) run in a small process
+pool, so a long script keeps neither the event loop nor the API process busy;
+the script itself is read in a worker thread. Each render is stored in
+rendered_pdfs under the script revision it was made from: downloading an
+unchanged script again is one row read, and concurrent requests for the same
+revision share a single render.
+
+Inline renders are bounded. Past PDF_RENDER_MAX_PENDING renders in flight the
+endpoint answers 503, and scripts over PDF_INLINE_MAX_COMPONENTS that are not
+rendered yet must go through an export job, which renders in the background and
+is polled until its PDF can be downloaded.
+
+The PDF font only covers Western European text (see screenplay_pdf.py): scripts
+with other characters get a 422, or a failed job, naming them.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import threading
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.exports import PdfExportJob, PdfExportJobStatus, RenderedPdf
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.services.screenplay_export_service import ScreenplayExportService
+from app.services.screenplay_pdf import PdfComponent, UnsupportedCharactersError, render_pdf
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Renders in flight in this process by (script_id, revision), shared by the
+# requests and jobs waiting on them
+_renders: Dict[Tuple[UUID, int], "asyncio.Future[Tuple[bytes, int]]"] = {}
+# Running export jobs, referenced until they finish
+_job_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.PDF_RENDER_WORKERS)
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    global _pool
+    for task in list(_job_tasks):
+        task.cancel()
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _load_segments(script_id: UUID) -> List[List[PdfComponent]]:
+    db = SessionLocal()
+    try:
+        return [
+            [
+                PdfComponent(row.component_type, row.content, row.character_name, row.parenthetical)
+                for row in rows
+            ]
+            for _, rows in groupby(
+                ScreenplayExportService.ordered_components(db, script_id), key=lambda row: row[0]
+            )
+        ]
+    finally:
+        db.close()
+
+
+def _update_job(job_id: UUID, job_status: PdfExportJobStatus, error: Optional[str] = None) -> None:
+    db = SessionLocal()
+    try:
+        job = db.query(PdfExportJob).filter(PdfExportJob.id == job_id).first()
+        if job is None:
+            return
+        job.status = job_status
+        job.error = error
+        if job_status in (PdfExportJobStatus.DONE, PdfExportJobStatus.FAILED):
+            job.completed_at = func.now()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error updating PDF export job {job_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+class PdfExportService:
+    @staticmethod
+    def get_script(db: Session, script_id: UUID, user_id: UUID):
+        """(user_id, title, revision) of a live script owned by user_id; 404/403 otherwise."""
+        script = db.query(Script.user_id, Script.title, Script.revision).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).first()
+        if script is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if script.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+        return script
+
+    @staticmethod
+    def get_cached(db: Session, script_id: UUID, revision: int) -> Optional[Tuple[bytes, int]]:
+        """(content, page_count) of the stored PDF if it was rendered at `revision` with the current metrics."""
+        row = db.query(RenderedPdf.content, RenderedPdf.page_count).filter(
+            and_(
+                RenderedPdf.script_id == script_id,
+                RenderedPdf.revision == revision,
+                RenderedPdf.lines_per_page == settings.PAGINATION_LINES_PER_PAGE
+            )
+        ).first()
+        return (row.content, row.page_count) if row is not None else None
+
+    @staticmethod
+    def store(script_id: UUID, revision: int, lines_per_page: int, page_count: int, content: bytes) -> None:
+        """Keep a render unless one of a later revision was stored meanwhile. Failures are only logged."""
+        db = SessionLocal()
+        try:
+            statement = pg_insert(RenderedPdf).values(
+                script_id=script_id,
+                revision=revision,
+                lines_per_page=lines_per_page,
+                page_count=page_count,
+                content=content
+            )
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[RenderedPdf.script_id],
+                set_={
+                    "revision": statement.excluded.revision,
+                    "lines_per_page": statement.excluded.lines_per_page,
+                    "page_count": statement.excluded.page_count,
+                    "content": statement.excluded.content,
+                    "created_at": func.now()
+                },
+                where=RenderedPdf.revision <= statement.excluded.revision
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error storing PDF of script {script_id}: {str(e)}")
+        finally:
+            db.close()
+
+    @staticmethod
+    async def _render(script_id: UUID, title: str, revision: int) -> Tuple[bytes, int]:
+        lines_per_page = settings.PAGINATION_LINES_PER_PAGE
+        segments = await run_in_threadpool(_load_segments, script_id)
+        loop = asyncio.get_running_loop()
+        content, page_count = await loop.run_in_executor(
+            get_render_pool(), render_pdf, title, segments, lines_per_page
+        )
+        await run_in_threadpool(PdfExportService.store, script_id, revision, lines_per_page, page_count, content)
+        logger.info(f"Rendered script {script_id} at revision {revision}: {page_count} pages, {len(content)} bytes")
+        return content, page_count
+
+    @staticmethod
+    async def render(script_id: UUID, title: str, revision: int) -> Tuple[bytes, int]:
+        """Render and store the script, or wait for the render of this revision already in flight."""
+        key = (script_id, revision)
+        future = _renders.get(key)
+        if future is None:
+            future = asyncio.ensure_future(PdfExportService._render(script_id, title, revision))
+            _renders[key] = future
+            future.add_done_callback(lambda _: _renders.pop(key, None))
+        # A client going away must not cancel a render others may be waiting on
+        return await asyncio.shield(future)
+
+    @staticmethod
+    async def get_pdf(db: Session, script_id: UUID, title: str, revision: int) -> Tuple[bytes, int]:
+        """(content, page_count) at `revision`, from the cache or rendered inline."""
+        cached = PdfExportService.get_cached(db, script_id, revision)
+        if cached is not None:
+            return cached
+
+        component_count = db.query(func.count(SceneSegmentComponent.id)).join(
+            SceneSegment, SceneSegmentComponent.scene_segment_id == SceneSegment.id
+        ).filter(
+            and_(
+                SceneSegment.script_id == script_id,
+                SceneSegment.is_deleted.is_(False),
+                SceneSegmentComponent.is_deleted.is_(False)
+            )
+        ).scalar()
+        if component_count > settings.PDF_INLINE_MAX_COMPONENTS:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Script is too large to render inline; create a PDF export job instead"
+            )
+        if (script_id, revision) not in _renders and len(_renders) >= settings.PDF_RENDER_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many PDF exports in progress, please retry shortly",
+                headers={"Retry-After": "5"}
+            )
+        try:
+            return await PdfExportService.render(script_id, title, revision)
+        except UnsupportedCharactersError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+
+    @staticmethod
+    async def _run_job(job_id: UUID, script_id: UUID, title: str, revision: int) -> None:
+        await run_in_threadpool(_update_job, job_id, PdfExportJobStatus.RUNNING)
+        try:
+            await PdfExportService.render(script_id, title, revision)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"PDF export job {job_id} failed: {str(e)}")
+            await run_in_threadpool(_update_job, job_id, PdfExportJobStatus.FAILED, str(e))
+            return
+        await run_in_threadpool(_update_job, job_id, PdfExportJobStatus.DONE)
+
+    @staticmethod
+    async def create_job(db: Session, script_id: UUID, user_id: UUID) -> PdfExportJob:
+        """Start rendering the script's current revision in the background."""
+        script = PdfExportService.get_script(db, script_id, user_id)
+        job = PdfExportJob(script_id=script_id, user_id=user_id, revision=script.revision)
+        if PdfExportService.get_cached(db, script_id, script.revision) is not None:
+            job.status = PdfExportJobStatus.DONE
+            job.completed_at = func.now()
+        try:
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error creating PDF export job for script {script_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error creating export job: {str(e)}"
+            )
+
+        if job.status == PdfExportJobStatus.PENDING:
+            task = asyncio.create_task(PdfExportService._run_job(job.id, script_id, script.title, script.revision))
+            _job_tasks.add(task)
+            task.add_done_callback(_job_tasks.discard)
+        return job
+
+    @staticmethod
+    def get_job(db: Session, script_id: UUID, job_id: UUID, user_id: UUID) -> PdfExportJob:
+        job = db.query(PdfExportJob).filter(
+            and_(
+                PdfExportJob.id == job_id,
+                PdfExportJob.script_id == script_id
+            )
+        ).first()
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Export job not found"
+            )
+        if job.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this export job"
+            )
+
+        # Jobs are not resumed after a restart; report abandoned ones as failed
+        unfinished = job.status in (PdfExportJobStatus.PENDING, PdfExportJobStatus.RUNNING)
+        timeout = timedelta(seconds=settings.PDF_JOB_TIMEOUT_SECONDS)
+        if unfinished and job.created_at < datetime.now(timezone.utc) - timeout:
+            job.status = PdfExportJobStatus.FAILED
+            job.error = "Export job timed out"
+            job.completed_at = func.now()
+            db.commit()
+            db.refresh(job)
+        return job
+
+    @staticmethod
+    def get_job_result(db: Session, script_id: UUID, job_id: UUID, user_id: UUID) -> Tuple[bytes, int]:
+        """(content, page_count) of a finished job, while its revision is still the stored one."""
+        job = PdfExportService.get_job(db, script_id, job_id, user_id)
+        if job.status != PdfExportJobStatus.DONE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Export job is {job.status.value}"
+            )
+        row = db.query(RenderedPdf.revision, RenderedPdf.content, RenderedPdf.page_count).filter(
+            RenderedPdf.script_id == script_id
+        ).first()
+        if row is None or row.revision != job.revision:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="This export was replaced by a later revision of the script; create a new export job"
+            )
+        return row.content, row.page_count
@@ -0,0 +1,255 @@
+# app/services/purge_service.py
+"""
+Batched purge of soft-deleted rows.
+
+Rows soft-deleted longer than PURGE_RETENTION_DAYS ago are removed from the hot
+tables, either copied into `archived_rows` first (PURGE_MODE="archive") or simply
+hard-deleted (PURGE_MODE="delete"). Children of a soft-deleted parent count as
+deleted with it, because deleting a segment or beat does not flag its children.
+
+Each batch is one statement over at most PURGE_BATCH_SIZE ids, taken in primary
+key order after the previous batch and locked with SKIP LOCKED, and is committed
+on its own, so the job never holds locks for long and can run on several workers.
+Tables are purged children first so ON DELETE CASCADE never removes rows that
+were not archived.
+
+The exception is rows that only exist for the live tables and are deliberately
+left to the cascade, neither archived nor counted: `character_appearances` and
+`segment_layouts` are derived from a segment's components and rebuilt on demand,
+and `script_operations` is the edit-merge log, which compaction already trims
+after OPERATION_LOG_RETENTION_MINUTES, long before a row can be purged.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, cast, delete, exists, func, insert, literal, not_, null, or_, select
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.archive import ArchivedRow
+from app.models.beats import Beat, Scene, SceneGenerationTracker
+from app.models.scenes import SceneDescription
+from app.models.scene_segments import (
+    SceneSegment, SceneSegmentComponent,
+    ShorteningAlternative, ShorteningSelectionHistory,
+    RewriteAlternative, RewriteSelectionHistory,
+    ExpansionAlternative, ExpansionSelectionHistory,
+    ContinuationAlternative, ContinuationSelectionHistory,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PurgeTarget:
+    """
+    A purgeable table.
+
+    `parent` is (fk column, parent target): the row is dead when its parent is.
+    `blockers` are (model, fk column) pairs whose rows must not reference a row
+    for it to be purged, e.g. selection history that would otherwise cascade away.
+    """
+    model: Any
+    parent: Optional[Tuple[str, "PurgeTarget"]] = None
+    blockers: Tuple[Tuple[Any, str], ...] = field(default_factory=tuple)
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__
+
+
+def _dead_condition(target: PurgeTarget, table, cutoff: datetime):
+    """Row of `table` was soft-deleted before cutoff, directly or through its parents."""
+    conditions = []
+    if "is_deleted" in table.c:
+        conditions.append(and_(table.c.is_deleted.is_(True), table.c.deleted_at < cutoff))
+    if target.parent is not None:
+        fk_column, parent = target.parent
+        parent_table = parent.model.__table__.alias()
+        conditions.append(
+            exists().where(
+                and_(
+                    parent_table.c.id == table.c[fk_column],
+                    _dead_condition(parent, parent_table, cutoff)
+                )
+            )
+        )
+    return or_(*conditions)
+
+
+def _purge_condition(target: PurgeTarget, cutoff: datetime):
+    table = target.model.__table__
+    conditions = [_dead_condition(target, table, cutoff)]
+    for blocker_model, fk_column in target.blockers:
+        blocker = blocker_model.__table__
+        conditions.append(not_(exists().where(blocker.c[fk_column] == table.c.id)))
+    return and_(*conditions)
+
+
+SEGMENT = PurgeTarget(SceneSegment)
+COMPONENT = PurgeTarget(SceneSegmentComponent, parent=("scene_segment_id", SEGMENT))
+BEAT = PurgeTarget(Beat, blockers=((SceneGenerationTracker, "beat_id"),))
+
+_ALTERNATIVES = (
+    (ShorteningAlternative, ShorteningSelectionHistory),
+    (RewriteAlternative, RewriteSelectionHistory),
+    (ExpansionAlternative, ExpansionSelectionHistory),
+    (ContinuationAlternative, ContinuationSelectionHistory),
+)
+
+# Children before parents
+PURGE_TARGETS: List[PurgeTarget] = (
+    [PurgeTarget(history, parent=("component_id", COMPONENT)) for _, history in _ALTERNATIVES]
+    + [
+        # A deleted alternative that was once selected stays until its component goes,
+        # otherwise the cascade would silently drop the selection history
+        PurgeTarget(alternative, parent=("component_id", COMPONENT), blockers=((history, "alternative_id"),))
+        for alternative, history in _ALTERNATIVES
+    ]
+    + [
+        COMPONENT,
+        SEGMENT,
+        PurgeTarget(SceneGenerationTracker, parent=("beat_id", BEAT)),
+        PurgeTarget(Scene, parent=("beat_id", BEAT)),
+        PurgeTarget(SceneDescription, parent=("beat_id", BEAT)),
+        BEAT,
+    ]
+)
+
+
+class PurgeService:
+    @staticmethod
+    def purge_batch(
+        db: Session,
+        target: PurgeTarget,
+        cutoff: datetime,
+        after_id: Optional[Any],
+        batch_size: int,
+        archive: bool
+    ) -> List[Any]:
+        """
+        Remove (and optionally archive) the next batch of dead rows after `after_id`.
+
+        One statement: WITH moved AS (DELETE ... WHERE id IN (SELECT id ... LIMIT n
+        FOR UPDATE SKIP LOCKED) RETURNING *) INSERT INTO archived_rows SELECT ... FROM moved.
+        Returns the purged ids; does not commit.
+        """
+        table = target.model.__table__
+        batch = select(table.c.id).where(_purge_condition(target, cutoff))
+        if after_id is not None:
+            batch = batch.where(table.c.id > after_id)
+        batch = batch.order_by(table.c.id).limit(batch_size).with_for_update(skip_locked=True, of=table)
+
+        if not archive:
+            result = db.execute(delete(table).where(table.c.id.in_(batch)).returning(table.c.id))
+            return list(result.scalars())
+
+        moved = delete(table).where(table.c.id.in_(batch)).returning(*table.c).cte("moved")
+        statement = (
+            insert(ArchivedRow)
+            .from_select(
+                ["table_name", "row_id", "data", "deleted_at"],
+                select(
+                    literal(target.table_name),
+                    moved.c.id,
+                    func.to_jsonb(moved.table_valued()),
+                    moved.c.deleted_at if "deleted_at" in moved.c else null()
+                )
+            )
+            .add_cte(moved)
+            .returning(ArchivedRow.row_id)
+        )
+        return list(db.execute(statement).scalars())
+
+    @staticmethod
+    def purge_table(
+        db: Session,
+        target: PurgeTarget,
+        cutoff: datetime,
+        batch_size: int,
+        archive: bool,
+        max_batches: Optional[int] = None
+    ) -> int:
+        """Purge one table batch by batch, committing after each batch."""
+        purged = 0
+        after_id = None
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            try:
+                ids = PurgeService.purge_batch(db, target, cutoff, after_id, batch_size, archive)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            batches += 1
+            purged += len(ids)
+            # Fewer rows than asked for means the key range is exhausted (skipped,
+            # locked rows are picked up on the next run)
+            if len(ids) < batch_size:
+                break
+            after_id = max(ids)
+        return purged
+
+    @staticmethod
+    def run(
+        db: Session,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        archive: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Purge every table once and report rows reclaimed and current table sizes.
+        """
+        retention_days = settings.PURGE_RETENTION_DAYS if retention_days is None else retention_days
+        batch_size = batch_size or settings.PURGE_BATCH_SIZE
+        archive = settings.PURGE_MODE == "archive" if archive is None else archive
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+        tables = {}
+        for target in PURGE_TARGETS:
+            purged = PurgeService.purge_table(
+                db, target, cutoff, batch_size, archive, settings.PURGE_MAX_BATCHES_PER_TABLE
+            )
+            if purged:
+                logger.info(f"Purged {purged} rows from {target.table_name}")
+            size = db.execute(select(func.pg_total_relation_size(cast(target.table_name, REGCLASS)))).scalar()
+            tables[target.table_name] = {"rows_purged": purged, "total_bytes": size}
+        db.commit()
+
+        return {
+            "cutoff": cutoff,
+            "mode": "archive" if archive else "delete",
+            "rows_purged": sum(table["rows_purged"] for table in tables.values()),
+            "tables": tables,
+        }
+
+
+async def run_purge_loop() -> None:
+    """Background task: run the purge every PURGE_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(settings.PURGE_INTERVAL_SECONDS)
+        db = SessionLocal()
+        try:
+            report = await run_in_threadpool(PurgeService.run, db)
+            logger.info(f"Soft-delete purge reclaimed {report['rows_purged']} rows")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Soft-delete purge failed: {str(e)}")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    # One-off run, e.g. from cron: python -m app.services.purge_service
+    session = SessionLocal()
+    try:
+        print(PurgeService.run(session))
+    finally:
+        session.close()
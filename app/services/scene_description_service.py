@@ -17,6 +17,7 @@ from app.models.beats import Beat, MasterBeatSheet
 
 from app.schemas.scene_description import SceneDescriptionResponse, SceneDescriptionResponsePost, ActEnum
 from app.services.openai_service import AzureOpenAIService
+from app.services.llm_router import run_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -230,7 +231,8 @@ class SceneDescriptionService:
 
 
             # Generate scenes using OpenAI
-            generated_scenes = self.openai_service.generate_scene_description_for_beat(
+            generated_scenes = await run_llm_call(
+                self.openai_service.generate_scene_description_for_beat,
                 story_synopsis=script.story,
                 genre=script.genre,
                 beat_position=beat.position,
@@ -1,8 +1,8 @@
 # app/services/scene_segment_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select
 from fastapi import HTTPException, status
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any
 from uuid import UUID
 import logging
 import traceback
@@ -11,7 +11,9 @@ from app.models.scene_segments import SceneSegment, SceneSegmentComponent, Compo
 from app.models.script import Script
 from app.models.beats import Beat
 from app.models.scenes import SceneDescription
-from app.schemas.scene_segment import SceneSegmentCreate, SceneSegmentUpdate, ComponentCreate, ComponentUpdate
+from app.schemas.scene_segment import SceneSegmentCreate, SceneSegmentUpdate, ComponentCreate, ComponentUpdate, SEGMENT_LIST_ADAPTER
+from app.services.screenplay_parser import parse_screenplay
+from app.services.ordering_service import OrderingService, SEGMENTS, COMPONENTS
 
 logger = logging.getLogger(__name__)
 
@@ -104,24 +106,27 @@ class SceneSegmentService:
                     detail="Scene description does not belong to the specified beat"
                 )
         
-        # Create the scene segment
+        # Create the scene segment, appending it when no number was given
+        segment_number = scene_segment.segment_number
+        if segment_number is None:
+            segment_number = OrderingService.allocate_end(db, SEGMENTS, scene_segment.script_id)[0]
         db_scene_segment = SceneSegment(
             script_id=scene_segment.script_id,
             beat_id=scene_segment.beat_id,
             scene_description_id=scene_segment.scene_description_id,
-            segment_number=scene_segment.segment_number
+            segment_number=segment_number
         )
         
         # Add to session and flush to get ID before creating components
         db.add(db_scene_segment)
         db.flush()
         
-        # Create components
-        for component_data in scene_segment.components:
+        # Create components; the segment is new, so missing positions follow list order
+        for index, component_data in enumerate(scene_segment.components, start=1):
             component = SceneSegmentComponent(
                 scene_segment_id=db_scene_segment.id,
                 component_type=component_data.component_type,
-                position=component_data.position,
+                position=component_data.position if component_data.position is not None else index * 1000.0,
                 content=component_data.content,
                 character_name=component_data.character_name,
                 parenthetical=component_data.parenthetical
@@ -141,41 +146,64 @@ class SceneSegmentService:
             )
 
     @staticmethod
-    def get_scene_segments_for_script(
-        db: Session, 
+    def get_scene_segments_json(
+        db: Session,
         script_id: UUID,
         skip: int = 0,
         limit: int = 100,
         beat_id: Optional[UUID] = None,
         scene_description_id: Optional[UUID] = None
-    ) -> Tuple[List[SceneSegment], int]:
+    ) -> bytes:
         """
-        Get scene segments for a script with optional filtering
+        Live segments of a script (optionally of one beat or scene description) with
+        their live components, ordered, paginated and serialized to JSON bytes.
+
+        Reads plain rows (no ORM identity map or lazy loads) and dumps them through
+        a precompiled TypeAdapter, skipping response_model validation entirely.
         """
-        query = db.query(SceneSegment).filter(
-            and_(
-                SceneSegment.script_id == script_id,
-                SceneSegment.is_deleted.is_(False)
-            )
-        )
-        
-        # Apply optional filters
+        conditions = [
+            SceneSegment.script_id == script_id,
+            SceneSegment.is_deleted.is_(False)
+        ]
         if beat_id:
-            query = query.filter(SceneSegment.beat_id == beat_id)
+            conditions.append(SceneSegment.beat_id == beat_id)
         if scene_description_id:
-            query = query.filter(SceneSegment.scene_description_id == scene_description_id)
-            
-        # Get total count for pagination
-        total = query.count()
-        
-        # Apply pagination and ordering
-        segments = query.order_by(SceneSegment.segment_number).offset(skip).limit(limit).all()
-        
-        for segment in segments:
-            segment.components = [comp for comp in segment.components if not comp.is_deleted]
+            conditions.append(SceneSegment.scene_description_id == scene_description_id)
 
-        
-        return segments, total
+        total = db.execute(select(func.count()).select_from(SceneSegment).where(and_(*conditions))).scalar()
+        segment_rows = db.execute(
+            select(*[SceneSegment.__table__.c[name] for name in (
+                "id", "script_id", "segment_number", "beat_id", "scene_description_id",
+                "created_at", "updated_at", "is_deleted", "deleted_at"
+            )])
+            .where(and_(*conditions))
+            .order_by(SceneSegment.segment_number)
+            .offset(skip)
+            .limit(limit)
+        ).mappings().all()
+
+        segments = [{**row, "components": []} for row in segment_rows]
+        by_id = {segment["id"]: segment for segment in segments}
+        if by_id:
+            component_table = SceneSegmentComponent.__table__
+            component_rows = db.execute(
+                select(*[component_table.c[name] for name in (
+                    "id", "scene_segment_id", "component_type", "position", "content",
+                    "character_name", "parenthetical", "created_at", "updated_at",
+                    "is_deleted", "deleted_at"
+                )])
+                .where(
+                    and_(
+                        component_table.c.scene_segment_id.in_(list(by_id)),
+                        component_table.c.is_deleted.is_(False)
+                    )
+                )
+                .order_by(component_table.c.scene_segment_id, component_table.c.position)
+            ).mappings()
+            for row in component_rows:
+                by_id[row["scene_segment_id"]]["components"].append(dict(row))
+
+        return SEGMENT_LIST_ADAPTER.dump_json({"segments": segments, "total": total})
 
     @staticmethod
     def get_scene_segment(db: Session, segment_id: UUID) -> SceneSegment:
@@ -291,10 +319,12 @@ class SceneSegmentService:
         """
         segment = SceneSegmentService.get_scene_segment(db, segment_id)
         
-        # Update segment number
+        # Update segment number; respace the script if the key collided with a neighbour
         segment.segment_number = new_segment_number
         
         try:
+            db.flush()
+            OrderingService.rebalance_if_needed(db, SEGMENTS, segment.script_id, new_segment_number)
             db.commit()
             db.refresh(segment)
             return segment
@@ -318,11 +348,14 @@ class SceneSegmentService:
         """
         segment = SceneSegmentService.get_scene_segment(db, segment_id)
         
-        # Create the component
+        # Create the component, appending it when no position was given
+        position = component.position
+        if position is None:
+            position = OrderingService.allocate_end(db, COMPONENTS, segment.id)[0]
         db_component = SceneSegmentComponent(
             scene_segment_id=segment.id,
             component_type=component.component_type,
-            position=component.position,
+            position=position,
             content=component.content,
             character_name=component.character_name,
             parenthetical=component.parenthetical
@@ -435,10 +468,12 @@ class SceneSegmentService:
                 detail="Component not found"
             )
             
-        # Update position
+        # Update position; respace the segment if the key collided with a neighbour
         component.position = new_position
         
         try:
+            db.flush()
+            OrderingService.rebalance_if_needed(db, COMPONENTS, component.scene_segment_id, new_position)
             db.commit()
             db.refresh(component)
             return component
@@ -454,7 +489,7 @@ class SceneSegmentService:
     def create_segment_with_components_from_text(
         db: Session,
         script_id: UUID,
-        segment_number: float,
+        segment_number: Optional[float],
         text: str,
         beat_id: Optional[UUID] = None,
         scene_description_id: Optional[UUID] = None
@@ -465,7 +500,9 @@ class SceneSegmentService:
         This method parses plain text and creates appropriate components based on 
         screenplay formatting conventions.
         """
-        # Create empty segment first
+        # Create empty segment first, appending it when no number was given
+        if segment_number is None:
+            segment_number = OrderingService.allocate_end(db, SEGMENTS, script_id)[0]
         segment = SceneSegment(
             script_id=script_id,
             beat_id=beat_id,
@@ -475,100 +512,21 @@ class SceneSegmentService:
         db.add(segment)
         db.flush()  # Get the ID without committing
         
-        # Split text into lines
-        lines = text.splitlines()
-        
-        # Variables to track parsing state
-        current_position = 1000.0
+        # Single pass over the text; the pasted block may span several scenes but is
+        # kept as one segment here (use the screenplay import for whole scripts)
         components = []
-        
-        # Scene headings are typically ALL CAPS or at least capitalized and begin the segment
-        if lines and (lines[0].isupper() or lines[0].istitle()):
-            # Create heading component
-            heading = SceneSegmentComponent(
-                scene_segment_id=segment.id,
-                component_type=ComponentType.HEADING,
-                position=current_position,
-                content=lines[0].strip()
-            )
-            components.append(heading)
-            current_position += 1000.0
-            lines = lines[1:]  # Remove processed line
-        
-        # Process remaining lines
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Skip empty lines
-            if not line:
-                i += 1
-                continue
-            
-            # Try to detect component type
-            if line.isupper() and ":" not in line:  # Possible character name
-                # Look ahead for dialogue
-                dialogue_content = []
-                j = i + 1
-                while j < len(lines) and lines[j].strip() and not lines[j].strip().isupper():
-                    dialogue_content.append(lines[j].strip())
-                    j += 1
-                
-                # Check for parenthetical
-                parenthetical = None
-                if dialogue_content and dialogue_content[0].startswith('(') and dialogue_content[0].endswith(')'):
-                    parenthetical = dialogue_content[0][1:-1]  # Remove parentheses
-                    dialogue_content = dialogue_content[1:]  # Remove parenthetical from dialogue
-                
-                # Create dialogue component
-                if dialogue_content:
-                    dialogue = SceneSegmentComponent(
-                        scene_segment_id=segment.id,
-                        component_type=ComponentType.DIALOGUE,
-                        position=current_position,
-                        content="\n".join(dialogue_content),
-                        character_name=line,
-                        parenthetical=parenthetical
-                    )
-                    components.append(dialogue)
-                    current_position += 1000.0
-                    i = j  # Skip processed lines
-                    continue
-            
-            # Check for transition (ends with TO:)
-            if line.endswith("TO:") and line.isupper():
-                transition = SceneSegmentComponent(
+        current_position = 1000.0
+        for parsed_segment in parse_screenplay(text):
+            for parsed in parsed_segment.components:
+                components.append(SceneSegmentComponent(
                     scene_segment_id=segment.id,
-                    component_type=ComponentType.TRANSITION,
+                    component_type=parsed.component_type,
                     position=current_position,
-                    content=line
-                )
-                components.append(transition)
+                    content=parsed.content,
+                    character_name=parsed.character_name,
+                    parenthetical=parsed.parenthetical
+                ))
                 current_position += 1000.0
-                i += 1
-                continue
-            
-            # Default to action
-            # Collect consecutive action lines
-            action_lines = [line]
-            j = i + 1
-            while j < len(lines) and lines[j].strip() and not (
-                lines[j].strip().isupper() or 
-                lines[j].strip().endswith("TO:") or
-                lines[j].strip().startswith('(')
-            ):
-                action_lines.append(lines[j].strip())
-                j += 1
-            
-            action = SceneSegmentComponent(
-                scene_segment_id=segment.id,
-                component_type=ComponentType.ACTION,
-                position=current_position,
-                content="\n".join(action_lines)
-            )
-            components.append(action)
-            current_position += 1000.0
-            i = j
         
         # Add components to DB
         db.add_all(components)
@@ -612,6 +570,15 @@ class SceneSegmentService:
         
         # Create lookup map for existing components
         existing_by_id = {comp.id: comp for comp in existing_components}
+
+        # New components sent without a position are appended, in request order
+        unplaced = [
+            data for data in components_data
+            if data.get('id') not in existing_by_id and data.get('position') is None
+        ]
+        appended_positions = iter(
+            OrderingService.allocate_end(db, COMPONENTS, segment_id, len(unplaced)) if unplaced else []
+        )
         
         # Process each component update
         for component_data in components_data:
@@ -629,10 +596,13 @@ class SceneSegmentService:
                 result.append(component)
             else:
                 # Create new component
+                position = component_data.get('position')
+                if position is None:
+                    position = next(appended_positions)
                 new_component = SceneSegmentComponent(
                     scene_segment_id=segment_id,
                     component_type=component_data['component_type'],
-                    position=component_data['position'],
+                    position=position,
                     content=component_data['content'],
                     character_name=component_data.get('character_name'),
                     parenthetical=component_data.get('parenthetical')
@@ -700,10 +670,15 @@ class SceneSegmentService:
                     formatted_text.append(component.content)
                     formatted_text.append("")  # Add blank line
                 
+                elif component.component_type == ComponentType.CHARACTER:
+                    # Standalone cue; the following dialogue goes right below it
+                    formatted_text.append(component.content.upper())
+
                 elif component.component_type == ComponentType.DIALOGUE:
                     # Character name is centered and capitalized
-                    formatted_text.append(component.character_name.upper())
-                    
+                    if component.character_name:
+                        formatted_text.append(component.character_name.upper())
+
                     # Add parenthetical if present
                     if component.parenthetical:
                         formatted_text.append(f"({component.parenthetical})")
@@ -11,6 +11,7 @@ from app.models.script import Script
 from app.schemas.scene import SceneCreate, SceneUpdate, SceneGenerationRequest
 from app.schemas.scene import SceneResponse, SceneGenerationResult
 from app.services.openai_service import AzureOpenAIService
+from app.services.llm_router import run_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -250,7 +251,8 @@ class SceneGenerationService:
             }
 
         # Generate scenes using OpenAI
-        scenes_data = self.openai_service.generate_scenes_for_beat(
+        scenes_data = await run_llm_call(
+                self.openai_service.generate_scenes_for_beat,
                 beat_title=beat.beat_title,
                 beat_description=beat.beat_description,
                 script_genre=script.genre,
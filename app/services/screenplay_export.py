@@ -0,0 +1,158 @@
+# app/services/screenplay_export.py
+"""
+Fountain and Final Draft (FDX) rendering of segments.
+
+Each segment is rendered on its own from its live components, in order, so the
+result can be cached per segment and the document assembled by concatenation:
+
+    header(title) + fragment(segment 1) + fragment(segment 2) + ... + footer()
+
+Fountain output forces an element type (".", "!", "@", ">") wherever the plain
+text would otherwise be read as something else, so exports re-import through
+app/services/screenplay_parser.py unchanged.
+"""
+from typing import Iterable, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+import re
+
+from app.models.scene_segments import ComponentType
+from app.services.screenplay_parser import is_character_cue, is_scene_heading, is_transition
+
+# Characters XML 1.0 does not allow, even escaped
+_XML_INVALID_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+# Line starts Fountain reads as markup
+_FOUNTAIN_MARKUP = ("!", "@", "#", "=", "~", ">", ".", "[[", "/*")
+
+
+def content_disposition(title: str, extension: str) -> str:
+    """Attachment header for a download named after the script."""
+    filename = re.sub(r"[^A-Za-z0-9._-]+", "_", title).strip("_") or "screenplay"
+    return f'attachment; filename="{filename}.{extension}"'
+
+
+def _lines(text: Optional[str]) -> List[str]:
+    return [line.strip() for line in (text or "").strip().splitlines()]
+
+
+def _fountain_cue(name: str) -> str:
+    cue = name.strip().upper()
+    return cue if is_character_cue(cue) and not cue.startswith("@") else f"@{cue}"
+
+
+def _fountain_action_line(line: str) -> str:
+    if line and (
+        line.startswith(_FOUNTAIN_MARKUP)
+        or is_scene_heading(line)
+        or is_transition(line)
+        or is_character_cue(line)
+    ):
+        return f"!{line}"
+    return line
+
+
+class FountainRenderer:
+    media_type = "text/plain; charset=utf-8"
+    extension = "fountain"
+
+    @staticmethod
+    def header(title: str) -> str:
+        return f"Title: {' '.join(title.split())}\n\n"
+
+    @staticmethod
+    def footer() -> str:
+        return ""
+
+    @staticmethod
+    def fragment(components: Iterable) -> str:
+        elements: List[str] = []
+        previous = None
+        for component in components:
+            kind = component.component_type
+            if kind == ComponentType.HEADING:
+                heading = " ".join(component.content.split()).upper()
+                elements.append(heading if is_scene_heading(heading) and not heading.startswith(".") else f".{heading}")
+            elif kind == ComponentType.ACTION:
+                lines = [_fountain_action_line(line) for line in _lines(component.content)]
+                if any(lines):
+                    elements.append("\n".join(lines))
+            elif kind == ComponentType.CHARACTER:
+                elements.append(_fountain_cue(component.content))
+            elif kind == ComponentType.DIALOGUE:
+                # Blank lines would end the dialogue block
+                block = [line for line in _lines(component.content) if line]
+                if component.parenthetical and component.parenthetical.strip():
+                    block.insert(0, f"({component.parenthetical.strip().strip('()')})")
+                if component.character_name and component.character_name.strip():
+                    block.insert(0, _fountain_cue(component.character_name))
+                    elements.append("\n".join(block))
+                elif previous == ComponentType.CHARACTER and elements:
+                    # Speech under a separate CHARACTER cue joins it
+                    elements[-1] = "\n".join([elements[-1], *block])
+                elif block:
+                    elements.append("\n".join(block))
+            elif kind == ComponentType.TRANSITION:
+                transition = " ".join(component.content.split()).upper()
+                elements.append(transition if is_transition(transition) and not transition.startswith(">") else f"> {transition}")
+            previous = kind
+        return "".join(f"{element}\n\n" for element in elements)
+
+
+def _fdx_paragraph(paragraph_type: str, text: str) -> str:
+    text = _XML_INVALID_RE.sub("", text)
+    return (
+        f"    <Paragraph Type={quoteattr(paragraph_type)}>\n"
+        f"      <Text>{escape(text)}</Text>\n"
+        f"    </Paragraph>\n"
+    )
+
+
+class FDXRenderer:
+    media_type = "application/xml"
+    extension = "fdx"
+
+    @staticmethod
+    def header(title: str) -> str:
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="no" ?>\n'
+            '<FinalDraft DocumentType="Script" Template="No" Version="5">\n'
+            '  <TitlePage>\n'
+            '    <Content>\n'
+            f'      <Paragraph Alignment="Center"><Text>{escape(_XML_INVALID_RE.sub("", title))}</Text></Paragraph>\n'
+            '    </Content>\n'
+            '  </TitlePage>\n'
+            '  <Content>\n'
+        )
+
+    @staticmethod
+    def footer() -> str:
+        return "  </Content>\n</FinalDraft>\n"
+
+    @staticmethod
+    def fragment(components: Iterable) -> str:
+        paragraphs: List[str] = []
+        for component in components:
+            kind = component.component_type
+            if kind == ComponentType.HEADING:
+                paragraphs.append(_fdx_paragraph("Scene Heading", " ".join(component.content.split()).upper()))
+            elif kind == ComponentType.ACTION:
+                # One paragraph per line, as Final Draft has no line breaks inside one
+                paragraphs.extend(_fdx_paragraph("Action", line) for line in _lines(component.content) if line)
+            elif kind == ComponentType.CHARACTER:
+                paragraphs.append(_fdx_paragraph("Character", component.content.strip().upper()))
+            elif kind == ComponentType.DIALOGUE:
+                if component.character_name and component.character_name.strip():
+                    paragraphs.append(_fdx_paragraph("Character", component.character_name.strip().upper()))
+                if component.parenthetical and component.parenthetical.strip():
+                    paragraphs.append(_fdx_paragraph(
+                        "Parenthetical", f"({component.parenthetical.strip().strip('()')})"
+                    ))
+                paragraphs.append(_fdx_paragraph("Dialogue", " ".join(line for line in _lines(component.content) if line)))
+            elif kind == ComponentType.TRANSITION:
+                paragraphs.append(_fdx_paragraph("Transition", " ".join(component.content.split()).upper()))
+        return "".join(paragraphs)
+
+
+RENDERERS = {
+    "fountain": FountainRenderer,
+    "fdx": FDXRenderer,
+}
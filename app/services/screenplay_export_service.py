@@ -0,0 +1,147 @@
+# app/services/screenplay_export_service.py
+"""
+Streaming Fountain / FDX export.
+
+The script is read with a single ordered query over its live components (joined
+to their live segments), streamed from the database in batches. A window over
+each segment adds its cache key to every row: the latest change to any of its
+components (updated_at, or created_at for rows never updated), their highest
+revision (which also tells apart edits made within the same clock tick) and how
+many there are, so deletions show up even when nothing else changed.
+
+Rendered segment fragments are kept in a per-worker LRU keyed by segment and
+format; a segment whose key still matches is emitted from the cache and its rows
+are skipped, so re-exporting a large script only re-renders the edited scenes.
+Output is yielded in chunks of about EXPORT_STREAM_CHUNK_SIZE characters.
+"""
+from collections import OrderedDict
+from itertools import groupby
+from typing import Iterator, Optional, Tuple
+from uuid import UUID
+import logging
+import threading
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.services.screenplay_export import RENDERERS
+
+logger = logging.getLogger(__name__)
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered fragments: (segment_id, format) -> (key, text)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[UUID, str], Tuple[tuple, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, segment_id: UUID, export_format: str, key: tuple) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get((segment_id, export_format))
+            if entry is None or entry[0] != key:
+                return None
+            self._entries.move_to_end((segment_id, export_format))
+            return entry[1]
+
+    def put(self, segment_id: UUID, export_format: str, key: tuple, fragment: str) -> None:
+        with self._lock:
+            self._entries[(segment_id, export_format)] = (key, fragment)
+            self._entries.move_to_end((segment_id, export_format))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+fragment_cache = FragmentCache(settings.EXPORT_FRAGMENT_CACHE_SIZE)
+
+
+class ScreenplayExportService:
+    @staticmethod
+    def get_script_title(db: Session, script_id: UUID, user_id: UUID) -> str:
+        """Title of a live script owned by user_id; 404/403 otherwise."""
+        script = db.query(Script.user_id, Script.title).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).first()
+        if script is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if script.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+        return script.title
+
+    @staticmethod
+    def ordered_components(db: Session, script_id: UUID):
+        """Live components of the script's live segments in script order, with each segment's cache key."""
+        changed_at = func.coalesce(SceneSegmentComponent.updated_at, SceneSegmentComponent.created_at)
+        statement = select(
+            SceneSegmentComponent.scene_segment_id,
+            func.max(changed_at).over(partition_by=SceneSegmentComponent.scene_segment_id).label("changed_at"),
+            func.count().over(partition_by=SceneSegmentComponent.scene_segment_id).label("component_count"),
+            func.max(SceneSegmentComponent.revision).over(
+                partition_by=SceneSegmentComponent.scene_segment_id
+            ).label("revision"),
+            SceneSegmentComponent.component_type,
+            SceneSegmentComponent.content,
+            SceneSegmentComponent.character_name,
+            SceneSegmentComponent.parenthetical,
+        ).join(
+            SceneSegment, SceneSegmentComponent.scene_segment_id == SceneSegment.id
+        ).where(
+            and_(
+                SceneSegment.script_id == script_id,
+                SceneSegment.is_deleted.is_(False),
+                SceneSegmentComponent.is_deleted.is_(False)
+            )
+        ).order_by(SceneSegment.segment_number, SceneSegment.id, SceneSegmentComponent.position)
+        return db.execute(statement, execution_options={"yield_per": 1000})
+
+    @staticmethod
+    def stream(script_id: UUID, export_format: str, title: str) -> Iterator[str]:
+        """
+        Yield the export in chunks. Uses its own session, as the response is
+        streamed after the request's dependencies have been closed.
+        """
+        renderer = RENDERERS[export_format]
+        chunk_size = settings.EXPORT_STREAM_CHUNK_SIZE
+        db = SessionLocal()
+        try:
+            parts = [renderer.header(title)]
+            size = len(parts[0])
+            rendered = reused = 0
+            for segment_id, rows in groupby(ScreenplayExportService.ordered_components(db, script_id), key=lambda row: row[0]):
+                first = next(rows)
+                key = (first.changed_at, first.revision, first.component_count)
+                fragment = fragment_cache.get(segment_id, export_format, key)
+                if fragment is None:
+                    fragment = renderer.fragment([first, *rows])
+                    fragment_cache.put(segment_id, export_format, key, fragment)
+                    rendered += 1
+                else:
+                    reused += 1
+                parts.append(fragment)
+                size += len(fragment)
+                if size >= chunk_size:
+                    yield "".join(parts)
+                    parts, size = [], 0
+            parts.append(renderer.footer())
+            yield "".join(parts)
+            logger.info(
+                f"Exported script {script_id} as {export_format}: "
+                f"{rendered} segments rendered, {reused} from cache"
+            )
+        finally:
+            db.close()
@@ -0,0 +1,180 @@
+# app/services/screenplay_import_service.py
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, insert, update, func, select
+from fastapi import HTTPException, status
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Tuple
+from uuid import UUID
+import logging
+import uuid
+
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.services.character_index_service import CharacterIndexService
+from app.services.ordering_service import OrderingService, SEGMENTS
+from app.services.script_revision import bump_script_revision, component_revision, segment_revision
+from app.services.screenplay_parser import ParsedSegment, parse_screenplay
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SPACING = 1000.0
+POSITION_SPACING = 1000.0
+
+
+class ScreenplayImportService:
+    @staticmethod
+    def reserve_segment_numbers(db: Session, script_id: UUID, count: int) -> float:
+        """
+        Atomically reserve `count` segment numbers at the end of the script and return
+        the first one. Does not commit.
+        """
+        return OrderingService.allocate_end(db, SEGMENTS, script_id, count)[0]
+
+    @staticmethod
+    def build_rows(
+        script_id: UUID,
+        segments: Iterable[ParsedSegment],
+        start_number: float
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Turn parsed segments into insert rows.
+
+        Segment ids are generated here so components can reference them without a
+        flush per segment.
+        """
+        segment_rows = []
+        component_rows = []
+        segment_number = start_number
+
+        for segment in segments:
+            segment_id = uuid.uuid4()
+            segment_rows.append({
+                "id": segment_id,
+                "script_id": script_id,
+                "segment_number": segment_number,
+                "is_deleted": False,
+            })
+            for index, component in enumerate(segment.components, start=1):
+                component_rows.append({
+                    "id": uuid.uuid4(),
+                    "scene_segment_id": segment_id,
+                    "component_type": component.component_type,
+                    "position": index * POSITION_SPACING,
+                    "content": component.content,
+                    "character_name": component.character_name,
+                    "parenthetical": component.parenthetical,
+                    "is_deleted": False,
+                })
+            segment_number += SEGMENT_SPACING
+
+        return segment_rows, component_rows
+
+    @staticmethod
+    def insert_segments(
+        db: Session,
+        script_id: UUID,
+        segments: List[ParsedSegment],
+        start_number: float
+    ) -> Tuple[int, int]:
+        """
+        Bulk insert parsed segments and their components (one executemany per table).
+
+        Does not commit; returns (segments_created, components_created).
+        """
+        segment_rows, component_rows = ScreenplayImportService.build_rows(script_id, segments, start_number)
+        if segment_rows:
+            revision = bump_script_revision(db, script_ids=[script_id]).get(script_id, 0)
+            for row in chain(segment_rows, component_rows):
+                row["revision"] = revision
+            db.execute(insert(SceneSegment), segment_rows)
+        if component_rows:
+            db.execute(insert(SceneSegmentComponent), component_rows)
+            CharacterIndexService.refresh_segments(db, {row["id"] for row in segment_rows})
+        return len(segment_rows), len(component_rows)
+
+    @staticmethod
+    def clear_script(db: Session, script_id: UUID) -> int:
+        """Soft-delete every segment and component of a script. Does not commit."""
+        bump_script_revision(db, script_ids=[script_id])
+        segment_ids = select(SceneSegment.id).where(
+            and_(
+                SceneSegment.script_id == script_id,
+                SceneSegment.is_deleted.is_(False)
+            )
+        )
+        db.execute(
+            update(SceneSegmentComponent)
+            .where(
+                and_(
+                    SceneSegmentComponent.scene_segment_id.in_(segment_ids),
+                    SceneSegmentComponent.is_deleted.is_(False)
+                )
+            )
+            .values(is_deleted=True, deleted_at=func.now(), revision=component_revision()),
+            execution_options={"synchronize_session": False}
+        )
+        result = db.execute(
+            update(SceneSegment)
+            .where(
+                and_(
+                    SceneSegment.script_id == script_id,
+                    SceneSegment.is_deleted.is_(False)
+                )
+            )
+            .values(is_deleted=True, deleted_at=func.now(), revision=segment_revision()),
+            execution_options={"synchronize_session": False}
+        )
+        CharacterIndexService.refresh_script(db, script_id)
+        # Numbering restarts from the beginning for the replacement content
+        db.execute(
+            update(Script).where(Script.id == script_id).values(segment_number_seq=0.0),
+            execution_options={"synchronize_session": False}
+        )
+        return result.rowcount
+
+    @staticmethod
+    def import_text(
+        db: Session,
+        script_id: UUID,
+        text: str,
+        replace_existing: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Import a whole plain-text or Fountain screenplay into a script.
+
+        The text is parsed in one pass and every segment and component is written
+        with a single bulk insert per table, in one transaction.
+        """
+        segments = parse_screenplay(text)
+        if not segments:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No screenplay content found in the provided text"
+            )
+
+        try:
+            replaced_segments = ScreenplayImportService.clear_script(db, script_id) if replace_existing else 0
+            start_number = ScreenplayImportService.reserve_segment_numbers(db, script_id, len(segments))
+            segments_created, components_created = ScreenplayImportService.insert_segments(
+                db, script_id, segments, start_number
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error importing screenplay into script {script_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error importing screenplay: {str(e)}"
+            )
+
+        logger.info(
+            f"Imported {segments_created} segments / {components_created} components into script {script_id}"
+        )
+        return {
+            "script_id": script_id,
+            "segments_created": segments_created,
+            "components_created": components_created,
+            "replaced_segments": replaced_segments,
+            "first_segment_number": start_number,
+            "last_segment_number": start_number + (segments_created - 1) * SEGMENT_SPACING,
+        }
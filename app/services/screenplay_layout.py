@@ -0,0 +1,285 @@
+# app/services/screenplay_layout.py
+"""
+Screenplay page layout, for page estimates and PDF rendering.
+
+Pages are measured in lines of 12pt Courier: 10 characters per inch, 6 lines per
+inch, so a US Letter page with standard margins holds about 55 lines. Each
+element type wraps to its standard column width:
+
+    scene heading, action   60 characters (6.0")
+    character cue           38
+    dialogue                35 (3.5")
+    parenthetical           25
+    transition              16
+
+Layout happens in two steps:
+
+1. layout_components() turns one segment's components into blocks (blank lines
+   before, wrapped height, kind). This is the expensive part and depends only on
+   the segment's own content, so callers cache it per segment. text_blocks()
+   does the same but keeps the wrapped lines, for rendering.
+2. flow() places every segment's blocks on pages with the usual break rules:
+   action splits only with two lines on each side, dialogue splits with
+   (MORE) / (CONT'D) and two lines on each side, headings and cues never end a
+   page, no blank lines at the top of a page. paginate() sums the placements
+   up per segment.
+
+Bump LAYOUT_VERSION whenever the metrics or the block rules change, so cached
+layouts are rebuilt.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.models.scene_segments import ComponentType
+
+LAYOUT_VERSION = 1
+
+ACTION_WIDTH = 60
+CUE_WIDTH = 38
+DIALOGUE_WIDTH = 35
+PARENTHETICAL_WIDTH = 25
+TRANSITION_WIDTH = 16
+
+# Left indents from the action margin (1.5"), in characters
+CUE_INDENT = 22
+PARENTHETICAL_INDENT = 16
+DIALOGUE_INDENT = 10
+
+# Fewest lines of a block left on either side of a page break
+MIN_SPLIT_LINES = 2
+
+HEADING = "heading"
+ACTION = "action"
+CHARACTER = "character"
+DIALOGUE = "dialogue"
+TRANSITION = "transition"
+
+# Blocks that must not end a page
+KEEP_WITH_NEXT = {HEADING, CHARACTER}
+
+
+@dataclass(frozen=True)
+class Block:
+    space_before: int
+    lines: int
+    kind: str
+
+    def to_json(self) -> list:
+        return [self.space_before, self.lines, self.kind]
+
+    @classmethod
+    def from_json(cls, value: Sequence) -> "Block":
+        return cls(int(value[0]), int(value[1]), str(value[2]))
+
+
+def wrapped_lines(text: Optional[str], width: int) -> int:
+    """Lines `text` takes when word-wrapped to `width` columns (hard line breaks kept)."""
+    lines = 0
+    for paragraph in (text or "").split("\n"):
+        lines += 1
+        column = 0
+        for word in paragraph.split():
+            size = len(word)
+            if column and column + 1 + size <= width:
+                column += 1 + size
+                continue
+            if column:
+                lines += 1
+            # Words longer than the column are broken across lines
+            lines += (size - 1) // width
+            column = size - (size - 1) // width * width
+    return lines
+
+
+def wrap(text: Optional[str], width: int) -> List[str]:
+    """The lines wrapped_lines() counts, for rendering; len(wrap(t, w)) == wrapped_lines(t, w)."""
+    lines: List[str] = []
+    for paragraph in (text or "").split("\n"):
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) <= width:
+                line += " " + word
+                continue
+            if line:
+                lines.append(line)
+            while len(word) > width:
+                lines.append(word[:width])
+                word = word[width:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+@dataclass
+class TextBlock:
+    """A block with its wrapped lines as (indent in characters, text)."""
+    block: Block
+    lines: List[Tuple[int, str]]
+    # Speaker of a dialogue block, repeated with (CONT'D) when it is split
+    cue: Optional[str] = None
+
+
+def text_blocks(components: Iterable) -> List[TextBlock]:
+    """
+    Blocks of one segment with their text, from its live components in order.
+    Components only need component_type, content, character_name and parenthetical.
+    """
+    blocks: List[TextBlock] = []
+    last_cue: Optional[str] = None
+    for component in components:
+        kind = component.component_type
+        if kind == ComponentType.HEADING:
+            lines = [(0, line.upper()) for line in wrap(component.content, ACTION_WIDTH)]
+            blocks.append(TextBlock(Block(1, len(lines), HEADING), lines))
+        elif kind == ComponentType.ACTION:
+            lines = [(0, line) for line in wrap(component.content, ACTION_WIDTH)]
+            blocks.append(TextBlock(Block(1, len(lines), ACTION), lines))
+        elif kind == ComponentType.CHARACTER:
+            last_cue = " ".join((component.content or "").split()).upper()
+            lines = [(CUE_INDENT, line.upper()) for line in wrap(component.content, CUE_WIDTH)]
+            blocks.append(TextBlock(Block(1, len(lines), CHARACTER), lines))
+        elif kind == ComponentType.DIALOGUE:
+            lines = []
+            name = (component.character_name or "").strip()
+            if name:
+                lines.extend((CUE_INDENT, line.upper()) for line in wrap(name, CUE_WIDTH))
+            if component.parenthetical and component.parenthetical.strip():
+                parenthetical = component.parenthetical.strip()
+                if not parenthetical.startswith("("):
+                    parenthetical = f"({parenthetical})"
+                lines.extend((PARENTHETICAL_INDENT, line) for line in wrap(parenthetical, PARENTHETICAL_WIDTH))
+            lines.extend((DIALOGUE_INDENT, line) for line in wrap(component.content, DIALOGUE_WIDTH))
+            # Speech under a separate CHARACTER cue sits right below it
+            follows_cue = not name and bool(blocks) and blocks[-1].block.kind == CHARACTER
+            blocks.append(TextBlock(
+                Block(0 if follows_cue else 1, len(lines), DIALOGUE), lines, " ".join(name.split()).upper() or last_cue
+            ))
+        elif kind == ComponentType.TRANSITION:
+            # Right-aligned with the action column
+            lines = [
+                (ACTION_WIDTH - len(line), line.upper())
+                for line in wrap(component.content, TRANSITION_WIDTH)
+            ]
+            blocks.append(TextBlock(Block(1, len(lines), TRANSITION), lines))
+    return blocks
+
+
+def layout_components(components: Iterable) -> List[Block]:
+    """Blocks of one segment (see text_blocks), without their text."""
+    return [text_block.block for text_block in text_blocks(components)]
+
+
+def _min_room(block: Block) -> int:
+    """Fewest lines of `block` that can end a page: enough to split it, or all of it."""
+    if block.kind == ACTION and block.lines >= 2 * MIN_SPLIT_LINES:
+        return MIN_SPLIT_LINES
+    if block.kind == DIALOGUE and block.lines >= 2 + 2 * MIN_SPLIT_LINES:
+        return 2 + MIN_SPLIT_LINES
+    return block.lines
+
+
+def _split(block: Block, room: int) -> int:
+    """Lines of `block` still to place after filling `room` lines; 0 if it cannot split."""
+    if block.kind == ACTION:
+        taken = min(room, block.lines - MIN_SPLIT_LINES)
+        return block.lines - taken if taken >= MIN_SPLIT_LINES else 0
+    if block.kind == DIALOGUE:
+        # Cue and speech, then (MORE) on this page; the cue is repeated with
+        # (CONT'D) on the next
+        taken = min(room - 1, block.lines - MIN_SPLIT_LINES)
+        return block.lines - taken + 1 if taken >= 1 + MIN_SPLIT_LINES else 0
+    return 0
+
+
+@dataclass(frozen=True)
+class Placement:
+    """
+    Lines start .. start + count of one block, placed on `page` from `line` down
+    after `space` blank lines.
+    """
+    position: int  # Index of the block among all blocks, in order
+    segment: int
+    page: int
+    line: int
+    space: int
+    start: int
+    count: int
+    # Dialogue split across pages: the cue is repeated with (CONT'D) above these
+    # lines and/or (MORE) follows them
+    continued: bool = False
+    more: bool = False
+
+    @property
+    def height(self) -> int:
+        return self.space + self.count + self.continued + self.more
+
+
+def flow(segments: Sequence[Sequence[Block]], lines_per_page: int) -> Iterator[Placement]:
+    """Place every segment's blocks on pages, in order; see the module docstring for the rules."""
+    flat = [(index, block) for index, blocks in enumerate(segments) for block in blocks]
+    page = 0
+    used = 0
+
+    for position, (index, block) in enumerate(flat):
+        dialogue = block.kind == DIALOGUE
+        space = block.space_before if used else 0
+        needed = block.lines
+        if block.kind in KEEP_WITH_NEXT and position + 1 < len(flat):
+            following = flat[position + 1][1]
+            needed += following.space_before + _min_room(following)
+
+        start = 0
+        continued = False
+        if used and used + space + needed > lines_per_page:
+            remaining = _split(block, lines_per_page - used - space)
+            if remaining:
+                taken = block.lines - remaining + dialogue
+                yield Placement(position, index, page, used, space, 0, taken, more=dialogue)
+                start, continued = taken, dialogue
+            page, used, space = page + 1, 0, 0
+
+        while True:
+            rest = block.lines - start
+            capacity = lines_per_page - used - space - continued
+            if rest <= capacity:
+                yield Placement(position, index, page, used, space, start, rest, continued=continued)
+                used += space + continued + rest
+                break
+            # Longer than a page (a monologue, a wall of action)
+            count = max(1, capacity - dialogue)
+            yield Placement(position, index, page, used, space, start, count, continued=continued, more=dialogue)
+            start, continued = start + count, dialogue
+            page, used, space = page + 1, 0, 0
+
+
+def paginate(
+    segments: Sequence[Sequence[Block]],
+    lines_per_page: int
+) -> Tuple[List[Tuple[float, float]], int]:
+    """
+    Flow the segments' blocks onto pages.
+
+    Returns the (start, end) of every segment in pages from the top of page one
+    (so end - start is the segment's length in pages) and the number of pages.
+    """
+    bounds: List[Optional[List[float]]] = [None] * len(segments)
+    pages = 0
+    for placement in flow(segments, lines_per_page):
+        top = placement.page + placement.line / lines_per_page
+        bottom = placement.page + (placement.line + placement.height) / lines_per_page
+        if bounds[placement.segment] is None:
+            bounds[placement.segment] = [top, bottom]
+        else:
+            bounds[placement.segment][1] = bottom
+        pages = placement.page + 1
+
+    spans: List[Tuple[float, float]] = []
+    cursor = 0.0
+    for bound in bounds:
+        if bound is None:
+            # Empty segment: zero length where the previous one ended
+            spans.append((cursor, cursor))
+        else:
+            spans.append((bound[0], bound[1]))
+            cursor = bound[1]
+    return spans, pages
@@ -0,0 +1,249 @@
+# app/services/screenplay_parser.py
+"""
+Single-pass parser for plain-text and Fountain screenplays.
+
+Text is consumed line by line and every line is classified in constant time, so parsing
+is linear in the size of the script. Elements are usually paragraphs separated by blank
+lines (the Fountain convention, which plain-text exports follow as well), but text typed
+or pasted without blank lines packs several into one paragraph, so lines are classified
+one by one: a scene heading, a transition or a character cue followed by more lines
+starts a new element wherever it appears. A line forced to action with "!" never does;
+it starts or continues an action. A new segment starts at every scene heading.
+
+The parser is incremental: `feed()` accepts arbitrary chunks of text and returns the
+segments completed so far, so uploads can be parsed while they are still streaming in.
+"""
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional
+import re
+
+from app.models.scene_segments import ComponentType
+
+SCENE_HEADING_RE = re.compile(r"^(INT|EXT|EST|INT\.?/EXT|EXT\.?/INT|I/E)[\.\s]", re.IGNORECASE)
+TITLE_PAGE_KEY_RE = re.compile(
+    r"^(Title|Credit|Author|Authors|Source|Draft date|Date|Contact|Copyright|Notes|Revision)\s*:",
+    re.IGNORECASE
+)
+SCENE_NUMBER_RE = re.compile(r"\s*#[^#]*#\s*$")
+NOTE_RE = re.compile(r"\[\[.*?\]\]")
+CHARACTER_EXTENSION_RE = re.compile(r"\s*\((V\.O\.|O\.S\.|O\.C\.|CONT'D|CONT’D|[A-Z.' ]+)\)\s*$")
+
+
+@dataclass
+class ParsedComponent:
+    component_type: ComponentType
+    content: str
+    character_name: Optional[str] = None
+    parenthetical: Optional[str] = None
+
+
+@dataclass
+class ParsedSegment:
+    components: List[ParsedComponent] = field(default_factory=list)
+
+    @property
+    def heading(self) -> Optional[str]:
+        if self.components and self.components[0].component_type == ComponentType.HEADING:
+            return self.components[0].content
+        return None
+
+
+def is_scene_heading(line: str) -> bool:
+    if line.startswith(".") and not line.startswith(".."):
+        return True
+    return bool(SCENE_HEADING_RE.match(line))
+
+
+def is_character_cue(line: str) -> bool:
+    if line.startswith("@"):
+        return True
+    name = CHARACTER_EXTENSION_RE.sub("", line).rstrip("^").strip()
+    return (
+        bool(name)
+        and name == name.upper()
+        and any(c.isalpha() for c in name)
+        and not name.endswith((":", "."))
+    )
+
+
+def is_transition(line: str) -> bool:
+    if line.startswith(">") and not line.endswith("<"):
+        return True
+    return line == line.upper() and (line.endswith("TO:") or line in ("FADE IN:", "FADE OUT.", "FADE TO BLACK."))
+
+
+def _breaks_speech(line: str) -> bool:
+    """Lines that can never be spoken: forced action, scene headings and transitions."""
+    return line.startswith("!") or is_scene_heading(line) or is_transition(line)
+
+
+def _is_cue_at(lines: List[str], index: int) -> bool:
+    """A character cue needs a line after it (the speech or a parenthetical)."""
+    line = lines[index]
+    if line.startswith("!") or not is_character_cue(line) or index + 1 == len(lines):
+        return False
+    return not _breaks_speech(lines[index + 1])
+
+
+def _starts_element(lines: List[str], index: int) -> bool:
+    """Whether lines[index] ends the element before it, within one paragraph."""
+    return _breaks_speech(lines[index]) or _is_cue_at(lines, index)
+
+
+class ScreenplayParser:
+    """Incremental screenplay tokenizer; see module docstring."""
+
+    def __init__(self):
+        self._pending = ""  # Incomplete trailing line of the last chunk
+        self._paragraph: List[str] = []
+        self._segment = ParsedSegment()
+        self._completed: List[ParsedSegment] = []
+        self._seen_content = False
+        self._in_boneyard = False
+
+    def feed(self, chunk: str) -> List[ParsedSegment]:
+        """Consume a chunk of text; return the segments completed by it."""
+        data = self._pending + chunk
+        lines = data.split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._consume_line(line)
+        return self._drain()
+
+    def close(self) -> List[ParsedSegment]:
+        """Flush the remaining text; return the final segments."""
+        if self._pending:
+            self._consume_line(self._pending)
+            self._pending = ""
+        self._end_paragraph()
+        if self._segment.components:
+            self._completed.append(self._segment)
+            self._segment = ParsedSegment()
+        return self._drain()
+
+    def _drain(self) -> List[ParsedSegment]:
+        completed, self._completed = self._completed, []
+        return completed
+
+    def _consume_line(self, raw: str) -> None:
+        line = raw.rstrip("\r").replace("\t", "    ")
+
+        # Boneyard (/* ... */) comments may span paragraphs
+        if self._in_boneyard:
+            if "*/" not in line:
+                return
+            line = line.split("*/", 1)[1]
+            self._in_boneyard = False
+        if "/*" in line:
+            before, _, after = line.partition("/*")
+            if "*/" in after:
+                line = before + after.split("*/", 1)[1]
+            else:
+                line = before
+                self._in_boneyard = True
+
+        line = NOTE_RE.sub("", line).strip()
+        if not line:
+            self._end_paragraph()
+            return
+        # Sections, synopses and page breaks carry no screenplay text
+        if line.startswith(("#", "=")):
+            return
+        self._paragraph.append(line)
+
+    def _end_paragraph(self) -> None:
+        if not self._paragraph:
+            return
+        lines, self._paragraph = self._paragraph, []
+
+        if not self._seen_content and TITLE_PAGE_KEY_RE.match(lines[0]):
+            return
+        self._seen_content = True
+
+        if lines[0].startswith("!"):
+            # Forced action: the whole paragraph, whatever its lines look like
+            self._add_action(lines)
+            return
+
+        index = 0
+        while index < len(lines):
+            line = lines[index]
+            if line.startswith("!"):
+                index = self._add_action_run(lines, index)
+            elif is_scene_heading(line):
+                self._start_segment(SCENE_NUMBER_RE.sub("", line.lstrip(".")).strip().upper())
+                index += 1
+            elif is_transition(line):
+                self._add(ParsedComponent(ComponentType.TRANSITION, line.lstrip(">").strip().upper()))
+                index += 1
+            elif _is_cue_at(lines, index):
+                index = self._add_dialogue(lines, index)
+            else:
+                index = self._add_action_run(lines, index)
+
+    def _start_segment(self, heading: str) -> None:
+        if self._segment.components:
+            self._completed.append(self._segment)
+        self._segment = ParsedSegment(components=[ParsedComponent(ComponentType.HEADING, heading)])
+
+    def _add(self, component: ParsedComponent) -> None:
+        if component.content:
+            self._segment.components.append(component)
+
+    def _add_action(self, lines: List[str]) -> None:
+        text = "\n".join(line[1:] if line.startswith(("!", "~")) else line for line in lines)
+        self._add(ParsedComponent(ComponentType.ACTION, text.strip(">< ")))
+
+    def _add_action_run(self, lines: List[str], index: int) -> int:
+        """
+        Add the action starting at lines[index]; return the index of the next element.
+
+        Forced ("!") lines continue the action, whatever they look like.
+        """
+        end = index + 1
+        while end < len(lines) and (lines[end].startswith("!") or not _starts_element(lines, end)):
+            end += 1
+        self._add_action(lines[index:end])
+        return end
+
+    def _add_dialogue(self, lines: List[str], index: int) -> int:
+        """Add the dialogue whose cue is lines[index]; return the index of the next element."""
+        cue = lines[index]
+        character_name = cue.lstrip("@").rstrip("^").strip()
+        start = index + 1
+        parenthetical = None
+        if lines[start].startswith("(") and lines[start].endswith(")"):
+            parenthetical = lines[start][1:-1]
+            start += 1
+        if start == len(lines) or _breaks_speech(lines[start]):
+            # A cue followed only by a parenthetical is treated as action
+            self._add(ParsedComponent(ComponentType.ACTION, "\n".join([cue, f"({parenthetical})"])))
+            return start
+
+        # The first line is always spoken; the speech then runs to the next element
+        end = start + 1
+        while end < len(lines) and not _starts_element(lines, end):
+            end += 1
+        self._add(ParsedComponent(
+            ComponentType.DIALOGUE,
+            "\n".join(lines[start:end]),
+            character_name=character_name,
+            parenthetical=parenthetical,
+        ))
+        return end
+
+
+def parse_screenplay(text: str) -> List[ParsedSegment]:
+    """Parse a complete screenplay held in memory."""
+    parser = ScreenplayParser()
+    segments = parser.feed(text)
+    segments.extend(parser.close())
+    return segments
+
+
+def iter_parse_screenplay(chunks: Iterable[str]) -> Iterator[ParsedSegment]:
+    """Parse a screenplay arriving as a sequence of text chunks."""
+    parser = ScreenplayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
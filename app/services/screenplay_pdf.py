@@ -0,0 +1,180 @@
+# app/services/screenplay_pdf.py
+"""
+Industry-format screenplay PDFs, in pure Python.
+
+Pages are laid out with app/services/screenplay_layout.py, the same rules the
+page estimates use, so a script renders to the page count it was estimated at.
+The PDF itself is written by hand: US Letter, 12pt Courier (one of the standard
+PDF fonts, so nothing is embedded and no font files are needed), 1.5" left
+margin, 1" top margin, page numbers top right from page 2 and a title page.
+
+Text is drawn in Courier's WinAnsi (cp1252) encoding, which covers Western
+European scripts only. Characters outside it (CJK, Cyrillic, Devanagari, emoji,
+...) cannot be drawn without embedding a Unicode font, so render_pdf() raises
+UnsupportedCharactersError naming them instead of printing "?" in their place.
+
+render_pdf() takes plain picklable values and touches neither the database nor
+the settings, so it can run in a worker process.
+"""
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import zlib
+
+from app.models.scene_segments import ComponentType
+from app.services.screenplay_layout import ACTION_WIDTH, CUE_INDENT, flow, text_blocks, wrap
+
+PAGE_WIDTH = 612  # Points, 8.5"
+PAGE_HEIGHT = 792  # 11"
+LEFT_MARGIN = 108  # 1.5", for the binding
+TOP_MARGIN = 72
+RIGHT_MARGIN = 72
+FONT_SIZE = 12
+LINE_HEIGHT = 12  # 6 lines per inch
+CHARACTER_WIDTH = 7.2  # Courier is 0.6 em wide, 10 characters per inch
+# Courier's descent below the baseline, at 12pt
+DESCENT = 3
+# Baseline of the page number, half an inch from the top
+PAGE_NUMBER_Y = PAGE_HEIGHT - 36 - FONT_SIZE + DESCENT
+TITLE_LINE = 20  # Where the title sits on the title page
+
+# (line from the top margin, indent in characters, text)
+PageLine = Tuple[float, float, str]
+
+
+class PdfComponent(NamedTuple):
+    component_type: ComponentType
+    content: Optional[str]
+    character_name: Optional[str]
+    parenthetical: Optional[str]
+
+
+# Characters reported by UnsupportedCharactersError, at most
+MAX_REPORTED_CHARACTERS = 20
+
+
+class UnsupportedCharactersError(ValueError):
+    """The script contains characters the PDF font cannot draw."""
+
+    def __init__(self, characters: List[str]):
+        super().__init__(characters)
+        self.characters = characters
+
+    def __str__(self) -> str:
+        return f"Characters not supported in PDF export: {' '.join(self.characters)}"
+
+
+def _check_encodable(texts: Iterable[str]) -> None:
+    unsupported = set()
+    for text in texts:
+        try:
+            text.encode("cp1252")
+        except UnicodeEncodeError:
+            for character in text:
+                try:
+                    character.encode("cp1252")
+                except UnicodeEncodeError:
+                    unsupported.add(character)
+    if unsupported:
+        raise UnsupportedCharactersError(sorted(unsupported)[:MAX_REPORTED_CHARACTERS])
+
+
+def _pdf_string(text: str) -> bytes:
+    data = text.encode("cp1252")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"") + b")"
+
+
+def _content_stream(lines: List[PageLine], page_number: Optional[int]) -> bytes:
+    commands = [b"BT", f"/F1 {FONT_SIZE} Tf".encode()]
+    if page_number is not None:
+        label = f"{page_number}."
+        x = PAGE_WIDTH - RIGHT_MARGIN - len(label) * CHARACTER_WIDTH
+        commands.append(f"1 0 0 1 {x:.2f} {PAGE_NUMBER_Y} Tm ".encode() + _pdf_string(label) + b" Tj")
+    for line, indent, text in lines:
+        if not text:
+            continue
+        x = LEFT_MARGIN + indent * CHARACTER_WIDTH
+        y = PAGE_HEIGHT - TOP_MARGIN - LINE_HEIGHT * (line + 1) + DESCENT
+        commands.append(f"1 0 0 1 {x:.2f} {y:.2f} Tm ".encode() + _pdf_string(text) + b" Tj")
+    commands.append(b"ET")
+    return zlib.compress(b"\n".join(commands))
+
+
+def _write_pdf(title: str, pages: List[bytes]) -> bytes:
+    """A PDF document from compressed page content streams."""
+    # Objects 1-4 are the catalog, page tree, font and document info; each page
+    # then takes two: the page and its content stream
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{5 + 2 * index} 0 R".encode() for index in range(len(pages)))
+        + f"] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+        b"<< /Title " + _pdf_string(title) + b" >>",
+    ]
+    for index, stream in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {6 + 2 * index} 0 R >>".encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R /Info 4 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(output)
+
+
+def _title_page(title: str) -> List[PageLine]:
+    lines = wrap(" ".join(title.split()).upper(), ACTION_WIDTH)
+    return [
+        (TITLE_LINE + index, (ACTION_WIDTH - len(line)) / 2, line)
+        for index, line in enumerate(lines)
+    ]
+
+
+def render_pdf(
+    title: str,
+    segments: Sequence[Sequence[PdfComponent]],
+    lines_per_page: int
+) -> Tuple[bytes, int]:
+    """
+    Render the script's live segments, each a list of its live components in
+    order. Returns the document and its page count, not counting the title page.
+    Raises UnsupportedCharactersError if any text cannot be drawn.
+    """
+    segment_blocks = [text_blocks(components) for components in segments]
+    flat = [text_block for blocks in segment_blocks for text_block in blocks]
+
+    pages: List[List[PageLine]] = []
+    for placement in flow([[text_block.block for text_block in blocks] for blocks in segment_blocks], lines_per_page):
+        while len(pages) <= placement.page:
+            pages.append([])
+        page = pages[placement.page]
+        text_block = flat[placement.position]
+        line = placement.line + placement.space
+        if placement.continued:
+            page.append((line, CUE_INDENT, f"{text_block.cue} (CONT'D)" if text_block.cue else "(CONT'D)"))
+            line += 1
+        for indent, text in text_block.lines[placement.start:placement.start + placement.count]:
+            page.append((line, indent, text))
+            line += 1
+        if placement.more:
+            page.append((line, CUE_INDENT, "(MORE)"))
+
+    title_page = _title_page(title)
+    _check_encodable([title, *(text for _, _, text in title_page)])
+    _check_encodable(text for lines in pages for _, _, text in lines)
+
+    streams = [_content_stream(title_page, None)]
+    streams.extend(
+        _content_stream(lines, number if number > 1 else None)
+        for number, lines in enumerate(pages, start=1)
+    )
+    return _write_pdf(title, streams), len(pages)
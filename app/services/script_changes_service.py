@@ -0,0 +1,89 @@
+# app/services/script_changes_service.py
+"""
+Delta sync of a script's segments and components.
+
+Every segment and component write stamps the row with the script's new revision
+(see app/services/script_revision.py), so "what changed since revision N" is an
+indexed range scan over (script_id, revision) instead of a full re-read.
+Soft-deleted rows are returned with is_deleted=True; rows hard-deleted by the
+purge job are older than PURGE_RETENTION_DAYS and only matter to clients that
+have been away that long, which should reload the snapshot instead.
+"""
+from uuid import UUID
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.schemas.changes import ComponentChange, ScriptChangesResponse, SegmentChange
+
+logger = logging.getLogger(__name__)
+
+
+class ScriptChangesService:
+    @staticmethod
+    def get_changes(db: Session, script_id: UUID, user_id: UUID, since: int) -> ScriptChangesResponse:
+        """
+        Rows of a script written after revision `since`, plus the current revision.
+
+        The revision is read first and bounds the row queries, so a write that
+        commits meanwhile is picked up by the next sync instead of being skipped.
+        """
+        row = db.query(Script.user_id, Script.revision).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if row.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+        if since > row.revision:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Requested revision is ahead of the script; reload the snapshot"
+            )
+
+        return ScriptChangesService.collect(db, script_id, since, row.revision)
+
+    @staticmethod
+    def collect(db: Session, script_id: UUID, since: int, revision: int) -> ScriptChangesResponse:
+        """Rows of a script with since < row.revision <= revision; no access checks."""
+        segments = []
+        components = []
+        if since < revision:
+            segments = db.query(SceneSegment).filter(
+                and_(
+                    SceneSegment.script_id == script_id,
+                    SceneSegment.revision > since,
+                    SceneSegment.revision <= revision
+                )
+            ).order_by(SceneSegment.segment_number).all()
+
+            components = db.query(SceneSegmentComponent).join(
+                SceneSegment, SceneSegmentComponent.scene_segment_id == SceneSegment.id
+            ).filter(
+                and_(
+                    SceneSegment.script_id == script_id,
+                    SceneSegmentComponent.revision > since,
+                    SceneSegmentComponent.revision <= revision
+                )
+            ).order_by(SceneSegmentComponent.scene_segment_id, SceneSegmentComponent.position).all()
+
+        return ScriptChangesResponse(
+            script_id=script_id,
+            since=since,
+            revision=revision,
+            segments=[SegmentChange.model_validate(segment) for segment in segments],
+            components=[ComponentChange.model_validate(component) for component in components]
+        )
@@ -0,0 +1,186 @@
+# app/services/script_revision.py
+"""
+Per-script revision counter.
+
+Script.revision is incremented whenever the script's beats, scene descriptions,
+scenes, segments or components change, so caches and conditional requests can
+compare one integer instead of re-reading the script.
+
+Every segment and component written also records the revision it was written at
+(SceneSegment.revision, SceneSegmentComponent.revision), so clients can ask for
+just the rows changed since the revision they last saw (see ScriptChangesService).
+
+ORM writes are picked up by a before_flush listener on every Session, which bumps
+the scripts first and stamps the new revision on the pending rows. Bulk Core
+statements (imports, reordering) bypass the ORM, so they call bump_script_revision
+themselves and stamp their rows with the value it returns or with
+segment_revision() / component_revision().
+
+With LIVE_SYNC_ENABLED every bump also queues a NOTIFY on LIVE_SYNC_CHANNEL with
+"<script_id>:<revision>"; Postgres delivers it only when the transaction commits.
+See app/services/live_sync.py.
+"""
+from itertools import chain
+from typing import Dict, Iterable, Optional, Set
+from uuid import UUID
+import logging
+
+from sqlalchemy import and_, event, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.beats import Beat, Scene
+from app.models.scenes import SceneDescription
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+
+logger = logging.getLogger(__name__)
+
+
+def _bump_statement(
+    script_ids: Iterable[UUID] = (),
+    beat_ids: Iterable[UUID] = (),
+    segment_ids: Iterable[UUID] = ()
+):
+    script_ids, beat_ids, segment_ids = set(script_ids), set(beat_ids), set(segment_ids)
+    conditions = []
+    if script_ids:
+        conditions.append(Script.id.in_(script_ids))
+    if beat_ids:
+        conditions.append(Script.id.in_(select(Beat.script_id).where(Beat.id.in_(beat_ids))))
+    if segment_ids:
+        conditions.append(Script.id.in_(select(SceneSegment.script_id).where(SceneSegment.id.in_(segment_ids))))
+    if not conditions:
+        return None
+    returning = [Script.id, Script.revision]
+    if settings.LIVE_SYNC_ENABLED:
+        # Evaluated per updated row, so the notification rides on the same statement
+        returning.append(func.pg_notify(
+            literal(settings.LIVE_SYNC_CHANNEL), func.concat(Script.id, ":", Script.revision)
+        ))
+    # updated_at is kept as is: it tracks edits to the script's own fields
+    return update(Script).where(or_(*conditions)).values(
+        revision=Script.revision + 1,
+        updated_at=Script.updated_at
+    ).returning(*returning)
+
+
+def bump_script_revision(
+    db: Session,
+    script_ids: Iterable[UUID] = (),
+    beat_ids: Iterable[UUID] = (),
+    segment_ids: Iterable[UUID] = ()
+) -> Dict[UUID, int]:
+    """
+    Increment the revision of the scripts owning the given rows and return the new
+    revision per script id. Does not commit.
+    """
+    statement = _bump_statement(script_ids, beat_ids, segment_ids)
+    if statement is None:
+        return {}
+    result = db.execute(statement, execution_options={"synchronize_session": False})
+    return {row[0]: row[1] for row in result}
+
+
+def segment_revision():
+    """Correlated subquery: current revision of a scene_segments row's script."""
+    return select(Script.revision).where(Script.id == SceneSegment.script_id).scalar_subquery()
+
+
+def component_revision():
+    """Correlated subquery: current revision of a scene_segment_components row's script."""
+    return (
+        select(Script.revision)
+        .join(SceneSegment, SceneSegment.script_id == Script.id)
+        .where(SceneSegment.id == SceneSegmentComponent.scene_segment_id)
+        .scalar_subquery()
+    )
+
+
+def get_script_revision(db: Session, script_id: UUID, user_id: Optional[UUID] = None) -> Optional[int]:
+    """Revision of a live script (owned by user_id, if given); one primary-key lookup."""
+    conditions = [Script.id == script_id, Script.is_deleted.is_(False)]
+    if user_id is not None:
+        conditions.append(Script.user_id == user_id)
+    return db.query(Script.revision).filter(and_(*conditions)).scalar()
+
+
+def get_beat_script_revision(db: Session, beat_id: UUID, user_id: UUID) -> Optional[int]:
+    """Revision of the live script owning a beat, if it belongs to user_id."""
+    return db.query(Script.revision).join(Beat, Beat.script_id == Script.id).filter(
+        and_(
+            Beat.id == beat_id,
+            Script.user_id == user_id,
+            Script.is_deleted.is_(False)
+        )
+    ).scalar()
+
+
+def get_script_modified_at(db: Session, script_id: UUID, user_id: UUID):
+    """Last change to a live script's own fields, if it belongs to user_id."""
+    return db.query(func.coalesce(Script.updated_at, Script.created_at)).filter(
+        and_(
+            Script.id == script_id,
+            Script.user_id == user_id,
+            Script.is_deleted.is_(False)
+        )
+    ).scalar()
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_revisions_before_flush(session: Session, flush_context, instances) -> None:
+    script_ids: Set[UUID] = set()
+    beat_ids: Set[UUID] = set()
+    segments = []
+    components = []
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        if isinstance(obj, Beat):
+            script_ids.add(obj.script_id)
+        elif isinstance(obj, SceneSegment):
+            script_ids.add(obj.script_id)
+            segments.append(obj)
+        elif isinstance(obj, (SceneDescription, Scene)):
+            beat_ids.add(obj.beat_id)
+        elif isinstance(obj, SceneSegmentComponent):
+            components.append(obj)
+
+    # Components only know their segment; resolve the owning scripts in one query
+    segment_scripts: Dict[UUID, UUID] = {
+        segment.id: segment.script_id for segment in segments if segment.id is not None
+    }
+    unresolved = {
+        component.scene_segment_id for component in components
+        if component.scene_segment_id is not None and component.scene_segment_id not in segment_scripts
+    }
+    connection = session.connection()
+    if unresolved:
+        segment_scripts.update(connection.execute(
+            select(SceneSegment.id, SceneSegment.script_id).where(SceneSegment.id.in_(unresolved))
+        ).all())
+
+    def script_of(component: SceneSegmentComponent) -> Optional[UUID]:
+        if component.scene_segment_id is not None:
+            return segment_scripts.get(component.scene_segment_id)
+        # Attached through the relationship only, not flushed yet
+        segment = component.scene_segment
+        return segment.script_id if segment is not None else None
+
+    component_scripts = [(component, script_of(component)) for component in components]
+    script_ids.update(script_id for _, script_id in component_scripts if script_id is not None)
+
+    statement = _bump_statement(script_ids, beat_ids)
+    if statement is None:
+        return
+    # Plain Core execution on the session's connection; no nested autoflush
+    revisions = {row[0]: row[1] for row in connection.execute(statement)}
+
+    # Stamp the rows this flush is about to write; deleted rows are gone for good
+    for segment in segments:
+        if segment not in session.deleted and segment.script_id in revisions:
+            segment.revision = revisions[segment.script_id]
+    for component, script_id in component_scripts:
+        if component not in session.deleted and script_id in revisions:
+            component.revision = revisions[script_id]
@@ -0,0 +1,187 @@
+# app/services/script_snapshot_service.py
+"""
+Materialized editor snapshot of a script.
+
+Opening a script in the editor needs its beats, scene descriptions, segments and
+components. Instead of rebuilding that from the ORM on every open, the serialized
+payload is stored in script_snapshots together with the Script.revision it was
+built from. A read is a single indexed lookup; when the revision has moved on the
+snapshot is rebuilt and stored again.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.beats import Beat
+from app.models.scenes import SceneDescription
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.models.snapshot import ScriptSnapshot
+from app.schemas.beat import BeatResponse
+from app.schemas.scene_segment import Component, SceneSegment as SceneSegmentSchema
+from app.schemas.snapshot import ScriptSnapshotResponse
+from app.services.http_caching import etag_matches, weak_etag
+from app.services.scene_description_service import SceneDescriptionService
+
+logger = logging.getLogger(__name__)
+
+
+class ScriptSnapshotService:
+    @staticmethod
+    def etag(revision: int) -> str:
+        return weak_etag("snapshot", revision)
+
+    @staticmethod
+    def build_payload(db: Session, script_id: UUID, revision: int) -> str:
+        """Serialize the script's live editor content; four ordered, indexed queries."""
+        beats = db.query(Beat).filter(
+            and_(
+                Beat.script_id == script_id,
+                Beat.is_deleted.is_(False)
+            )
+        ).order_by(Beat.position).all()
+
+        scene_descriptions = db.query(SceneDescription).join(
+            Beat, SceneDescription.beat_id == Beat.id
+        ).filter(
+            and_(
+                Beat.script_id == script_id,
+                Beat.is_deleted.is_(False),
+                SceneDescription.is_deleted.is_(False)
+            )
+        ).order_by(Beat.position, SceneDescription.position).all()
+
+        segments = db.query(SceneSegment).filter(
+            and_(
+                SceneSegment.script_id == script_id,
+                SceneSegment.is_deleted.is_(False)
+            )
+        ).order_by(SceneSegment.segment_number).all()
+
+        components_by_segment: Dict[UUID, List[Component]] = defaultdict(list)
+        components = db.query(SceneSegmentComponent).join(
+            SceneSegment, SceneSegmentComponent.scene_segment_id == SceneSegment.id
+        ).filter(
+            and_(
+                SceneSegment.script_id == script_id,
+                SceneSegment.is_deleted.is_(False),
+                SceneSegmentComponent.is_deleted.is_(False)
+            )
+        ).order_by(SceneSegmentComponent.position).all()
+        for component in components:
+            components_by_segment[component.scene_segment_id].append(Component.model_validate(component))
+
+        scene_service = SceneDescriptionService()
+        snapshot = ScriptSnapshotResponse(
+            script_id=script_id,
+            revision=revision,
+            beats=[
+                BeatResponse(
+                    position=beat.position,
+                    beat_title=beat.beat_title,
+                    beat_description=beat.beat_description,
+                    script_id=beat.script_id,
+                    beat_act=beat.beat_act,
+                    beat_id=beat.id
+                ) for beat in beats
+            ],
+            scene_descriptions=[scene_service.prepare_scene_response(scene) for scene in scene_descriptions],
+            segments=[
+                SceneSegmentSchema(
+                    id=segment.id,
+                    script_id=segment.script_id,
+                    segment_number=segment.segment_number,
+                    beat_id=segment.beat_id,
+                    scene_description_id=segment.scene_description_id,
+                    created_at=segment.created_at,
+                    updated_at=segment.updated_at,
+                    is_deleted=segment.is_deleted,
+                    deleted_at=segment.deleted_at,
+                    components=components_by_segment.get(segment.id, [])
+                ) for segment in segments
+            ]
+        )
+        return snapshot.model_dump_json()
+
+    @staticmethod
+    def store(db: Session, script_id: UUID, revision: int, payload: str) -> None:
+        """Upsert the snapshot unless a newer one was stored concurrently."""
+        statement = pg_insert(ScriptSnapshot).values(
+            script_id=script_id,
+            revision=revision,
+            payload=payload
+        )
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[ScriptSnapshot.script_id],
+            set_={
+                "revision": statement.excluded.revision,
+                "payload": statement.excluded.payload,
+                "created_at": func.now()
+            },
+            where=ScriptSnapshot.revision < statement.excluded.revision
+        ))
+
+    @staticmethod
+    def get_snapshot(
+        db: Session,
+        script_id: UUID,
+        user_id: UUID,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Return (etag, payload) for the editor snapshot; payload is None when the
+        client's If-None-Match already matches.
+
+        The revision is read before the content, so a snapshot can only be labelled
+        with an older revision than its data, never a newer one.
+        """
+        columns = [Script.user_id, Script.revision, ScriptSnapshot.revision]
+        if not if_none_match:
+            columns.append(ScriptSnapshot.payload)
+        row = db.query(*columns).outerjoin(
+            ScriptSnapshot, ScriptSnapshot.script_id == Script.id
+        ).filter(
+            and_(
+                Script.id == script_id,
+                Script.is_deleted.is_(False)
+            )
+        ).first()
+
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Script not found"
+            )
+        if row[0] != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this script"
+            )
+
+        revision, snapshot_revision = row[1], row[2]
+        etag = ScriptSnapshotService.etag(revision)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+        if snapshot_revision == revision:
+            payload = row[3] if len(row) > 3 else db.query(ScriptSnapshot.payload).filter(
+                ScriptSnapshot.script_id == script_id
+            ).scalar()
+            if payload is not None:
+                return etag, payload
+
+        payload = ScriptSnapshotService.build_payload(db, script_id, revision)
+        try:
+            ScriptSnapshotService.store(db, script_id, revision, payload)
+            db.commit()
+        except Exception as e:
+            # Serving the freshly built payload matters more than caching it
+            db.rollback()
+            logger.error(f"Error storing snapshot for script {script_id}: {str(e)}")
+        return etag, payload
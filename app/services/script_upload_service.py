@@ -0,0 +1,184 @@
+# app/services/script_upload_service.py
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from azure.core.exceptions import AzureError
+from typing import Iterable, Iterator, List
+from uuid import UUID
+import codecs
+import logging
+import os
+import tempfile
+
+from app.config import settings
+from app.models.script import Script
+from app.services.azure_service import AzureStorageService
+from app.services.document_extraction import ExtractionError, extract_text, supports_extraction
+from app.services.screenplay_import_service import ScreenplayImportService
+from app.services.screenplay_parser import ParsedSegment, iter_parse_screenplay
+from app.services.script_service import ScriptService
+
+logger = logging.getLogger(__name__)
+
+TEXT_CONTENT_TYPE = "text/plain"
+
+
+class _SegmentBatchWriter:
+    """Buffers parsed segments and bulk inserts them in fixed-size batches."""
+
+    def __init__(self, db: Session, script_id: UUID, replace_existing: bool):
+        self.db = db
+        self.script_id = script_id
+        self.replace_existing = replace_existing
+        self.cleared = False
+        self.pending: List[ParsedSegment] = []
+        self.segments_created = 0
+        self.components_created = 0
+
+    def add(self, segments: List[ParsedSegment]) -> None:
+        self.pending.extend(segments)
+        if len(self.pending) >= settings.UPLOAD_IMPORT_BATCH_SEGMENTS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        if self.replace_existing and not self.cleared:
+            ScreenplayImportService.clear_script(self.db, self.script_id)
+            self.cleared = True
+        start_number = ScreenplayImportService.reserve_segment_numbers(
+            self.db, self.script_id, len(self.pending)
+        )
+        segments, components = ScreenplayImportService.insert_segments(
+            self.db, self.script_id, self.pending, start_number
+        )
+        self.segments_created += segments
+        self.components_created += components
+        self.pending = []
+
+    def import_text(self, chunks: Iterable[str]) -> None:
+        """Parse text chunks and insert the segments batch by batch. Blocking; does not commit."""
+        for segment in iter_parse_screenplay(chunks):
+            self.add([segment])
+        self.flush()
+
+
+def _spooled_text(path: str) -> Iterator[str]:
+    """Decoded chunks of a spooled text upload."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    with open(path, "rb") as spool:
+        while chunk := spool.read(settings.UPLOAD_CHUNK_SIZE):
+            yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def _text_chunks(text: str) -> Iterator[str]:
+    for start in range(0, len(text), settings.UPLOAD_CHUNK_SIZE):
+        yield text[start:start + settings.UPLOAD_CHUNK_SIZE]
+
+
+class ScriptUploadService:
+    @staticmethod
+    async def upload_and_import(
+        db: Session,
+        script_id: UUID,
+        file: UploadFile,
+        import_segments: bool = True,
+        replace_existing: bool = False
+    ) -> Script:
+        """
+        Stream an uploaded script file to blob storage and import it as segments.
+
+        The file is read once in UPLOAD_CHUNK_SIZE chunks; each chunk is size-checked,
+        staged to blob storage and, when it will be imported, spooled to a temporary
+        file. Nothing touches the database until the blob is committed, so no row lock
+        is held while the upload is awaited and a failed upload leaves the script
+        untouched.
+
+        The import then runs in a worker thread, off the event loop: plain text /
+        Fountain is parsed straight from the spool, PDF and DOCX are extracted in the
+        process pool first, and segments are bulk inserted UPLOAD_IMPORT_BATCH_SEGMENTS
+        at a time, so parsed segments never accumulate. Extracted PDF/DOCX text is the
+        one buffer held whole; it is bounded by MAX_FILE_SIZE. Segments and the script's
+        file_url are committed together.
+        """
+        azure_service = AzureStorageService()
+        content_type = file.content_type
+        azure_service.validate_content_type(content_type)
+
+        upload = azure_service.start_staged_upload(
+            script_id, AzureStorageService.safe_filename(file.filename), content_type
+        )
+        writer = _SegmentBatchWriter(db, script_id, replace_existing)
+        is_text = content_type == TEXT_CONTENT_TYPE
+        spool = None
+        if import_segments and (is_text or supports_extraction(content_type)):
+            spool = tempfile.NamedTemporaryFile(prefix="script-upload-", delete=False)
+
+        try:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                if upload.size == 0:
+                    azure_service.validate_signature(content_type, chunk)
+                if upload.size + len(chunk) > settings.MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE} bytes"
+                    )
+                await upload.write(chunk)
+                if spool:
+                    spool.write(chunk)
+
+            if upload.size == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Uploaded file is empty"
+                )
+
+            chunks = None
+            if spool:
+                spool.close()
+                if is_text:
+                    chunks = _spooled_text(spool.name)
+                else:
+                    try:
+                        text = await extract_text(spool.name, content_type)
+                    except ExtractionError as e:
+                        raise HTTPException(
+                            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail=f"Could not read script file: {str(e)}"
+                        )
+                    chunks = _text_chunks(text)
+            elif import_segments:
+                logger.info(f"Import of {content_type} uploads is not supported; storing file only")
+
+            file_url = await upload.commit()
+
+            if chunks is not None:
+                await run_in_threadpool(writer.import_text, chunks)
+            script = ScriptService.get_script(db=db, script_id=script_id)
+            script.is_file_uploaded = True
+            script.file_url = file_url
+            db.commit()
+            db.refresh(script)
+
+        except AzureError as e:
+            db.rollback()
+            logger.error(f"Azure storage error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error uploading file to storage"
+            )
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            await file.close()
+            if spool:
+                spool.close()
+                os.unlink(spool.name)
+
+        logger.info(
+            f"Uploaded {upload.size} bytes for script {script_id}; imported "
+            f"{writer.segments_created} segments / {writer.components_created} components"
+        )
+        return script
@@ -0,0 +1,170 @@
+# app/services/search_service.py
+"""
+Full-text search over a user's scripts.
+
+Components (content and character name), scene descriptions and beats carry a
+stored, generated `search_vector` (tsvector) column with a GIN index, which
+Postgres keeps current on every write. A search is one statement: the three
+indexed matches are restricted to the user's live scripts, ranked together, cut
+to the requested page, and only then highlighted with ts_headline, so snippet
+generation never runs over more rows than are returned.
+"""
+from typing import Optional
+from uuid import UUID
+import logging
+
+from sqlalchemy import Float, Integer, String, and_, cast, func, literal, literal_column, null, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG, UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from app.models.beats import Beat
+from app.models.scenes import SceneDescription
+from app.models.scene_segments import SceneSegment, SceneSegmentComponent
+from app.models.script import Script
+from app.schemas.search import SearchHit, SearchResponse
+
+logger = logging.getLogger(__name__)
+
+# Must match the configuration in the generated search_vector columns
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def _typed_null(type_):
+    return cast(null(), type_)
+
+
+class SearchService:
+    @staticmethod
+    def search(
+        db: Session,
+        user_id: UUID,
+        text: str,
+        script_id: Optional[UUID] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> SearchResponse:
+        config = cast(SEARCH_CONFIG, REGCONFIG)
+        query = func.websearch_to_tsquery(config, text)
+
+        scope = [Script.user_id == user_id, Script.is_deleted.is_(False)]
+        if script_id is not None:
+            scope.append(Script.id == script_id)
+
+        components = SceneSegmentComponent.__table__.c
+        component_hits = (
+            select(
+                literal("component").label("kind"),
+                Script.id.label("script_id"),
+                SceneSegment.beat_id.label("beat_id"),
+                _typed_null(Integer).label("beat_position"),
+                SceneSegment.scene_description_id.label("scene_description_id"),
+                _typed_null(Integer).label("scene_description_position"),
+                SceneSegment.id.label("segment_id"),
+                SceneSegment.segment_number.label("segment_number"),
+                components.id.label("component_id"),
+                components.position.label("component_position"),
+                cast(components.component_type, String).label("component_type"),
+                func.concat_ws(": ", components.character_name, components.content).label("document"),
+                func.ts_rank_cd(components.search_vector, query).label("rank"),
+            )
+            .select_from(SceneSegmentComponent.__table__)
+            .join(SceneSegment, SceneSegment.id == components.scene_segment_id)
+            .join(Script, Script.id == SceneSegment.script_id)
+            .where(
+                and_(
+                    components.search_vector.op("@@")(query),
+                    components.is_deleted.is_(False),
+                    SceneSegment.is_deleted.is_(False),
+                    *scope
+                )
+            )
+        )
+
+        descriptions = SceneDescription.__table__.c
+        description_hits = (
+            select(
+                literal("scene_description"),
+                Script.id,
+                Beat.id,
+                Beat.position,
+                descriptions.id,
+                descriptions.position,
+                _typed_null(PG_UUID(as_uuid=True)),
+                _typed_null(Float),
+                _typed_null(PG_UUID(as_uuid=True)),
+                _typed_null(Float),
+                _typed_null(String),
+                func.concat_ws(" - ", descriptions.scene_heading, descriptions.scene_description),
+                func.ts_rank_cd(descriptions.search_vector, query),
+            )
+            .select_from(SceneDescription.__table__)
+            .join(Beat, Beat.id == descriptions.beat_id)
+            .join(Script, Script.id == Beat.script_id)
+            .where(
+                and_(
+                    descriptions.search_vector.op("@@")(query),
+                    descriptions.is_deleted.is_(False),
+                    Beat.is_deleted.is_(False),
+                    *scope
+                )
+            )
+        )
+
+        beats = Beat.__table__.c
+        beat_hits = (
+            select(
+                literal("beat"),
+                Script.id,
+                beats.id,
+                beats.position,
+                _typed_null(PG_UUID(as_uuid=True)),
+                _typed_null(Integer),
+                _typed_null(PG_UUID(as_uuid=True)),
+                _typed_null(Float),
+                _typed_null(PG_UUID(as_uuid=True)),
+                _typed_null(Float),
+                _typed_null(String),
+                func.concat_ws(": ", beats.beat_title, beats.beat_description),
+                func.ts_rank_cd(beats.search_vector, query),
+            )
+            .select_from(Beat.__table__)
+            .join(Script, Script.id == beats.script_id)
+            .where(
+                and_(
+                    beats.search_vector.op("@@")(query),
+                    beats.is_deleted.is_(False),
+                    *scope
+                )
+            )
+        )
+
+        # Rank and page first; ts_headline only runs on the returned rows
+        page = (
+            union_all(component_hits, description_hits, beat_hits)
+            .order_by(
+                literal_column("rank").desc(),
+                literal_column("script_id"),
+                literal_column("segment_number"),
+                literal_column("component_position")
+            )
+            .limit(limit)
+            .offset(offset)
+            .subquery("page")
+        )
+        rows = db.execute(
+            select(
+                page,
+                Script.title.label("script_title"),
+                func.ts_headline(config, page.c.document, query, HEADLINE_OPTIONS).label("snippet"),
+            )
+            .join(Script, Script.id == page.c.script_id)
+            .order_by(page.c.rank.desc(), page.c.script_id, page.c.segment_number, page.c.component_position)
+        ).mappings().all()
+
+        return SearchResponse(
+            query=text,
+            limit=limit,
+            offset=offset,
+            results=[SearchHit.model_validate(dict(row)) for row in rows]
+        )
@@ -0,0 +1,168 @@
+# app/services/text_operations.py
+"""
+Operational transformation for plain text (the ot.js model).
+
+An operation is a list walked over the whole base text:
+    int > 0  retain that many characters
+    int < 0  delete that many characters
+    str      insert the string
+e.g. [5, -3, "abc", 10] turns a 18 character text into one of 18 - 3 + 3.
+Lengths are in Python characters (code points).
+
+On the wire edits are sent as ranges against the base text instead
+({position, delete_count, insert}, ascending and non-overlapping); from_ranges()
+and to_ranges() convert between the two.
+"""
+from typing import List, Sequence, Tuple, Union
+
+TextOp = List[Union[int, str]]
+
+
+class OperationError(ValueError):
+    """The operation does not fit the text it is applied to or transformed against."""
+
+
+def _push(op: TextOp, component: Union[int, str]) -> None:
+    """Append a component, merging with the previous one and keeping inserts before deletes."""
+    if component == 0 or component == "":
+        return
+    if op and isinstance(component, str):
+        if isinstance(op[-1], str):
+            op[-1] += component
+            return
+        if op[-1] < 0:
+            # Canonical order: insert before delete at the same position
+            if len(op) > 1 and isinstance(op[-2], str):
+                op[-2] += component
+            else:
+                op.insert(len(op) - 1, component)
+            return
+    elif op and isinstance(op[-1], int) and (op[-1] > 0) == (component > 0):
+        op[-1] += component
+        return
+    op.append(component)
+
+
+def base_length(op: Sequence[Union[int, str]]) -> int:
+    return sum(abs(c) for c in op if isinstance(c, int))
+
+
+def target_length(op: Sequence[Union[int, str]]) -> int:
+    return sum(c if isinstance(c, int) and c > 0 else len(c) if isinstance(c, str) else 0 for c in op)
+
+
+def from_ranges(length: int, ranges: Sequence[Tuple[int, int, str]]) -> TextOp:
+    """Build an operation from (position, delete_count, insert) ranges on a text of `length`."""
+    op: TextOp = []
+    index = 0
+    for position, delete_count, insert in ranges:
+        if position < index or delete_count < 0 or position + delete_count > length:
+            raise OperationError("Ranges must be ascending, non-overlapping and inside the text")
+        _push(op, position - index)
+        _push(op, insert)
+        _push(op, -delete_count)
+        index = position + delete_count
+    _push(op, length - index)
+    return op
+
+
+def to_ranges(op: Sequence[Union[int, str]]) -> List[Tuple[int, int, str]]:
+    """The (position, delete_count, insert) ranges of an operation, against its base text."""
+    ranges: List[Tuple[int, int, str]] = []
+    index = 0
+    for component in op:
+        if isinstance(component, str):
+            if ranges and ranges[-1][0] + ranges[-1][1] == index:
+                position, deleted, inserted = ranges[-1]
+                ranges[-1] = (position, deleted, inserted + component)
+            else:
+                ranges.append((index, 0, component))
+        elif component > 0:
+            index += component
+        else:
+            if ranges and ranges[-1][0] + ranges[-1][1] == index:
+                position, deleted, inserted = ranges[-1]
+                ranges[-1] = (position, deleted - component, inserted)
+            else:
+                ranges.append((index, -component, ""))
+            index -= component
+    return ranges
+
+
+def apply(text: str, op: Sequence[Union[int, str]]) -> str:
+    if base_length(op) != len(text):
+        raise OperationError(f"Operation expects a text of {base_length(op)} characters, got {len(text)}")
+    parts = []
+    index = 0
+    for component in op:
+        if isinstance(component, str):
+            parts.append(component)
+        elif component > 0:
+            parts.append(text[index:index + component])
+            index += component
+        else:
+            index -= component
+    return "".join(parts)
+
+
+def transform(a: Sequence[Union[int, str]], b: Sequence[Union[int, str]]) -> Tuple[TextOp, TextOp]:
+    """
+    Transform two operations made on the same text.
+
+    Returns (a', b') with apply(apply(s, a), b') == apply(apply(s, b), a').
+    When both insert at the same position, a's text comes first.
+    """
+    if base_length(a) != base_length(b):
+        raise OperationError("Both operations must be based on the same text")
+    a_prime: TextOp = []
+    b_prime: TextOp = []
+    ops_a, ops_b = list(a), list(b)
+    i = j = 0
+    x = ops_a[0] if ops_a else None
+    y = ops_b[0] if ops_b else None
+
+    def next_a():
+        nonlocal i
+        i += 1
+        return ops_a[i] if i < len(ops_a) else None
+
+    def next_b():
+        nonlocal j
+        j += 1
+        return ops_b[j] if j < len(ops_b) else None
+
+    while x is not None or y is not None:
+        if isinstance(x, str):
+            _push(a_prime, x)
+            _push(b_prime, len(x))
+            x = next_a()
+            continue
+        if isinstance(y, str):
+            _push(a_prime, len(y))
+            _push(b_prime, y)
+            y = next_b()
+            continue
+        if x is None or y is None:
+            raise OperationError("Operations do not cover the same text")
+
+        if x > 0 and y > 0:
+            # retain / retain
+            step = min(x, y)
+            _push(a_prime, step)
+            _push(b_prime, step)
+        elif x < 0 and y < 0:
+            # both deleted the same characters
+            step = -min(-x, -y)
+        elif x < 0:
+            # a deletes what b retains
+            step = -min(-x, y)
+            _push(a_prime, step)
+        else:
+            # a retains what b deletes
+            step = -min(x, -y)
+            _push(b_prime, step)
+
+        size = abs(step)
+        x = (x - size if x > 0 else x + size) or next_a()
+        y = (y - size if y > 0 else y + size) or next_b()
+    return a_prime, b_prime
@@ -10,9 +10,13 @@ import traceback
 from app.models.usage import AIUsageLog, AICallTypeEnum
 from app.models.subscription import ResetIntervalEnum, SubscriptionPlan
 from app.config import settings
+from app.services.llm_router import consume_routing_decisions, has_routing_decisions
 
 logger = logging.getLogger(__name__)
 
+# AI calls counted against the free tier; the others are logged for their routing decisions
+METERED_CALL_TYPES = (AICallTypeEnum.BEAT_GENERATION,)
+
 class UsageService:
     @staticmethod
     def log_ai_call(
@@ -22,13 +26,16 @@ class UsageService:
         script_id: Optional[UUID] = None,
         metadata: Optional[dict] = None
     ) -> AIUsageLog:
-        """Log an AI API call"""
+        """Log an AI API call, with the deployment(s) the router picked for it"""
         try:
+            routes = consume_routing_decisions()
+            if routes:
+                metadata = {**(metadata or {}), "llm_routes": routes}
             usage_log = AIUsageLog(
                 user_id=user_id,
                 call_type=call_type,
                 script_id=script_id,
-                metadata=metadata
+                usage_metadata=metadata
             )
             db.add(usage_log)
             db.commit()
@@ -40,6 +47,19 @@ class UsageService:
             logger.info("-"*100)
             logger.info(traceback.format_exc())
 
+    @staticmethod
+    def log_routed_ai_call(
+        db: Session,
+        user_id: UUID,
+        call_type: AICallTypeEnum,
+        script_id: Optional[UUID] = None,
+        metadata: Optional[dict] = None
+    ) -> Optional[AIUsageLog]:
+        """Log an AI call only if the request reached the model, not when it was served from stored results"""
+        if not has_routing_decisions():
+            return None
+        return UsageService.log_ai_call(db, user_id, call_type, script_id, metadata)
+
     @staticmethod
     def get_free_usage_count(
         db: Session,
@@ -52,7 +72,10 @@ class UsageService:
             reset_interval = ResetIntervalEnum(settings.FREE_TIER_RESET_INTERVAL)
             
         query = db.query(func.count(AIUsageLog.id)).filter(
-            AIUsageLog.user_id == user_id
+            and_(
+                AIUsageLog.user_id == user_id,
+                AIUsageLog.call_type.in_(METERED_CALL_TYPES)
+            )
         )
         
         if reset_interval == ResetIntervalEnum.MONTHLY:
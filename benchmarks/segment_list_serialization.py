@@ -0,0 +1,106 @@
+# benchmarks/segment_list_serialization.py
+"""
+Serialization cost of GET /scene-segments/script/{id} for a 500-segment script.
+
+Compares the previous path (validate ORM objects against SegmentListResponse, then
+stdlib json), the same with orjson, and the row fast path used by the endpoint now
+(plain dicts dumped by the precompiled SEGMENT_LIST_ADAPTER). No database is
+needed; rows are synthesized in memory.
+
+    python -m benchmarks.segment_list_serialization [segments] [components_per_segment]
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import json
+import sys
+import timeit
+import uuid
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.schemas.scene_segment import SEGMENT_LIST_ADAPTER, SegmentListResponse
+
+COMPONENT_TYPES = ["HEADING", "ACTION", "CHARACTER", "DIALOGUE", "ACTION", "TRANSITION"]
+
+
+def build_rows(segment_count: int, components_per_segment: int):
+    now = datetime.now(timezone.utc)
+    script_id = uuid.uuid4()
+    segments = []
+    for number in range(1, segment_count + 1):
+        segment_id = uuid.uuid4()
+        components = [
+            {
+                "id": uuid.uuid4(),
+                "scene_segment_id": segment_id,
+                "component_type": COMPONENT_TYPES[index % len(COMPONENT_TYPES)],
+                "position": (index + 1) * 1000.0,
+                "content": "INT. KITCHEN - NIGHT. Rain hammers the window while MAYA paces. " * 2,
+                "character_name": "MAYA" if index % 3 == 0 else None,
+                "parenthetical": "(quietly)" if index % 5 == 0 else None,
+                "created_at": now,
+                "updated_at": now,
+                "is_deleted": False,
+                "deleted_at": None,
+            }
+            for index in range(components_per_segment)
+        ]
+        segments.append({
+            "id": segment_id,
+            "script_id": script_id,
+            "segment_number": number * 1000.0,
+            "beat_id": None,
+            "scene_description_id": None,
+            "created_at": now,
+            "updated_at": None,
+            "is_deleted": False,
+            "deleted_at": None,
+            "components": components,
+        })
+    return segments
+
+
+def as_orm_objects(segments):
+    """Attribute access like ORM instances, which is what response_model validates."""
+    return [
+        SimpleNamespace(**{**segment, "components": [SimpleNamespace(**c) for c in segment["components"]]})
+        for segment in segments
+    ]
+
+
+def main() -> None:
+    segment_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    components_per_segment = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    rows = build_rows(segment_count, components_per_segment)
+    objects = as_orm_objects(rows)
+    response_adapter = TypeAdapter(SegmentListResponse)
+
+    def response_model_stdlib_json() -> bytes:
+        model = SegmentListResponse.model_validate({"segments": objects, "total": len(objects)}, from_attributes=True)
+        return json.dumps(response_adapter.dump_python(model, mode="json")).encode()
+
+    def response_model_orjson() -> bytes:
+        model = SegmentListResponse.model_validate({"segments": objects, "total": len(objects)}, from_attributes=True)
+        return orjson.dumps(response_adapter.dump_python(model, mode="json"))
+
+    def row_fast_path() -> bytes:
+        return SEGMENT_LIST_ADAPTER.dump_json({"segments": rows, "total": len(rows)})
+
+    assert json.loads(row_fast_path()) == json.loads(response_model_stdlib_json())
+
+    print(f"{segment_count} segments x {components_per_segment} components, "
+          f"{len(row_fast_path()) / 1024:.0f} KiB of JSON")
+    baseline = None
+    for name, func in [
+        ("response_model + json", response_model_stdlib_json),
+        ("response_model + orjson", response_model_orjson),
+        ("row TypeAdapter fast path", row_fast_path),
+    ]:
+        best = min(timeit.repeat(func, number=5, repeat=5)) / 5
+        baseline = baseline or best
+        print(f"{name:28s} {best * 1000:8.1f} ms   x{baseline / best:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# tests/test_azure_storage.py
+"""
+The shared async BlobServiceClient against a local fake of the Blob service REST API.
+"""
+from contextlib import asynccontextmanager
+from email.utils import formatdate
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.etree import ElementTree
+import asyncio
+import io
+import uuid
+
+import pytest
+from aiohttp import web
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.config import settings
+from app.services import azure_service
+from app.services.azure_service import (AzureStorageService, close_blob_service_client,
+                                        get_blob_service_client, init_blob_service_client)
+
+ACCOUNT = "devstoreaccount1"
+# Azurite's well-known development key
+ACCOUNT_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+CONTAINER = "scripts-test"
+PDF = b"%PDF-1.7\n" + b"x" * 20
+
+
+class FakeBlobStorage:
+    """Block blobs of one account, kept in memory; only the calls the app makes."""
+
+    def __init__(self):
+        self.blobs: Dict[str, Tuple[bytes, str]] = {}
+        self.staged: Dict[str, Dict[str, bytes]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.app = web.Application()
+        self.app.router.add_route("*", "/{account}/{container}/{blob:.+}", self.handle)
+
+    @staticmethod
+    def _headers(**extra: str) -> Dict[str, str]:
+        return {
+            "x-ms-request-id": str(uuid.uuid4()),
+            "x-ms-version": "2021-08-06",
+            "Date": formatdate(usegmt=True),
+            "ETag": '"0x1"',
+            "Last-Modified": formatdate(usegmt=True),
+            **extra,
+        }
+
+    def _not_found(self) -> web.Response:
+        return web.Response(
+            status=404,
+            headers=self._headers(**{"x-ms-error-code": "BlobNotFound"}),
+            content_type="application/xml",
+            text="<?xml version=\"1.0\" encoding=\"utf-8\"?><Error><Code>BlobNotFound</Code>"
+                 "<Message>The specified blob does not exist.</Message></Error>",
+        )
+
+    async def handle(self, request: web.Request) -> web.Response:
+        name = f"{request.match_info['container']}/{request.match_info['blob']}"
+        comp = request.query.get("comp")
+        self.requests.append((request.method, comp or ""))
+
+        if request.method == "PUT" and comp == "block":
+            self.staged.setdefault(name, {})[request.query["blockid"]] = await request.read()
+            return web.Response(status=201, headers=self._headers())
+        if request.method == "PUT" and comp == "blocklist":
+            staged = self.staged.pop(name, {})
+            block_ids = [element.text for element in ElementTree.fromstring(await request.read())]
+            content_type = request.headers.get("x-ms-blob-content-type", "application/octet-stream")
+            self.blobs[name] = (b"".join(staged[block_id] for block_id in block_ids), content_type)
+            return web.Response(status=201, headers=self._headers())
+        if request.method in ("HEAD", "GET"):
+            if name not in self.blobs:
+                return self._not_found()
+            content, content_type = self.blobs[name]
+            headers = self._headers(**{"x-ms-blob-type": "BlockBlob", "Content-Type": content_type})
+            if request.method == "HEAD":
+                headers["Content-Length"] = str(len(content))
+                return web.Response(status=200, headers=headers)
+            return web.Response(status=200, headers=headers, body=content)
+        if request.method == "DELETE":
+            if self.blobs.pop(name, None) is None:
+                return self._not_found()
+            return web.Response(status=202, headers=self._headers())
+        return web.Response(status=400, headers=self._headers())
+
+
+@asynccontextmanager
+async def running(fake: FakeBlobStorage):
+    """Serve the fake on a free port and point the app at it for the duration."""
+    runner = web.AppRunner(fake.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    settings.AZURE_STORAGE_CONNECTION_STRING = (
+        f"DefaultEndpointsProtocol=http;AccountName={ACCOUNT};AccountKey={ACCOUNT_KEY};"
+        f"BlobEndpoint=http://127.0.0.1:{port}/{ACCOUNT};"
+    )
+    try:
+        yield
+    finally:
+        await close_blob_service_client()
+        await runner.cleanup()
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_STORAGE_CONNECTION_STRING", None)
+    monkeypatch.setattr(settings, "AZURE_CONTAINER_NAME", CONTAINER)
+    monkeypatch.setattr(settings, "AZURE_UPLOAD_BLOCK_SIZE", 8)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 5)
+    monkeypatch.setattr(azure_service, "_blob_service_client", None)
+    monkeypatch.setattr(azure_service, "_http_session", None)
+    return FakeBlobStorage()
+
+
+def _upload(content: bytes, filename: str = "draft.pdf", content_type: str = "application/pdf") -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+def test_client_is_shared_between_startup_and_shutdown(storage):
+    async def scenario():
+        async with running(storage):
+            await init_blob_service_client()
+            client = get_blob_service_client()
+            session = azure_service._http_session
+            assert get_blob_service_client() is client
+            assert AzureStorageService().get_blob_client("a").url.startswith(client.url)
+
+            await close_blob_service_client()
+            assert azure_service._blob_service_client is None
+            assert session.closed
+
+            # Created again on first use after a shutdown
+            assert get_blob_service_client() is not client
+
+    asyncio.run(scenario())
+
+
+def test_unconfigured_storage_is_not_started(storage):
+    async def scenario():
+        await init_blob_service_client()
+        assert azure_service._blob_service_client is None
+        with pytest.raises(HTTPException) as error:
+            get_blob_service_client()
+        assert error.value.status_code == 500
+
+    asyncio.run(scenario())
+
+
+def test_upload_is_staged_in_blocks_and_committed(storage):
+    script_id = uuid.uuid4()
+
+    async def scenario():
+        async with running(storage):
+            return await AzureStorageService().upload_file(_upload(PDF, filename="../My Draft?.pdf"), script_id)
+
+    url = asyncio.run(scenario())
+
+    blob_name = f"{CONTAINER}/scripts/{script_id}/My Draft_.pdf"
+    assert storage.blobs[blob_name] == (PDF, "application/pdf")
+    assert urlparse(url).path.endswith("/scripts/" + str(script_id) + "/My%20Draft_.pdf")
+    assert storage.requests.count(("PUT", "block")) == 4
+    assert storage.requests.count(("PUT", "blocklist")) == 1
+
+
+def test_rejected_upload_is_never_committed(storage):
+    async def scenario():
+        async with running(storage):
+            with pytest.raises(HTTPException) as error:
+                await AzureStorageService().upload_file(_upload(b"not a pdf at all"), uuid.uuid4())
+            return error.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 400
+    assert storage.blobs == {}
+    assert ("PUT", "blocklist") not in storage.requests
+
+
+def test_download_url_is_a_read_only_attachment(storage):
+    script_id = uuid.uuid4()
+
+    async def scenario():
+        async with running(storage):
+            service = AzureStorageService()
+            url = await service.upload_file(_upload(PDF), script_id)
+            return url, service.generate_download_sas(f"scripts/{script_id}/draft.pdf")
+
+    url, download = asyncio.run(scenario())
+
+    assert download["blob_name"] == f"scripts/{script_id}/draft.pdf"
+    assert download["url"].split("?")[0] == url
+    query = parse_qs(urlparse(download["url"]).query)
+    assert query["sp"] == ["r"]
+    assert query["rscd"] == ['attachment; filename="draft.pdf"']
+
+
+def test_delete_and_lookup(storage):
+    script_id = uuid.uuid4()
+
+    async def scenario():
+        async with running(storage):
+            service = AzureStorageService()
+            url = await service.upload_file(_upload(PDF), script_id)
+            found = await service.get_file_url(script_id, "draft.pdf")
+            deleted = await service.delete_file(script_id, "draft.pdf")
+            missing = await service.get_file_url(script_id, "draft.pdf")
+            deleted_again = await service.delete_file(script_id, "draft.pdf")
+            return url, found, deleted, missing, deleted_again
+
+    url, found, deleted, missing, deleted_again = asyncio.run(scenario())
+
+    assert found == url
+    assert deleted is True
+    assert missing is None
+    assert deleted_again is False
+    assert storage.blobs == {}
@@ -0,0 +1,21 @@
+# tests/test_compression.py
+import pytest
+
+from app.middleware.compression import choose_encoding
+
+AVAILABLE = ["zstd", "br", "gzip"]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("gzip;q=0", None),
+    ("gzip;Q=0", None),
+    ("gzip; q = 0", None),
+    ("gzip;level=1;q=0", None),
+    ("br;q=0.5, gzip", "gzip"),
+    ("*;q=0.1, zstd;q=0", "br"),
+    ("identity", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, AVAILABLE) == expected
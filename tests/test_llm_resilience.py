@@ -0,0 +1,252 @@
+# tests/test_llm_resilience.py
+"""
+ResilientLLMClient against a local fake of the OpenAI chat completions endpoint.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+import json
+import threading
+import time
+
+import openai
+import pytest
+
+from app.config import settings
+from app.services import llm_resilience
+from app.services.llm_resilience import LLMOperation, LLMUnavailableError, ResilientLLMClient
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "test",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "ok"},
+        "finish_reason": "stop",
+    }],
+}
+
+# (status, headers, delay in seconds)
+Reply = Tuple[int, dict, float]
+OK: Reply = (200, {}, 0.0)
+
+
+class FakeOpenAI:
+    """Answers each request with the next scripted reply; the last one repeats."""
+
+    def __init__(self):
+        self.replies: List[Reply] = [OK]
+        self.requests = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake._lock:
+                    fake.requests += 1
+                    code, headers, delay = fake.replies.pop(0) if len(fake.replies) > 1 else fake.replies[0]
+                time.sleep(delay)
+                body = json.dumps(COMPLETION if code == 200 else {"error": {"message": f"status {code}"}}).encode()
+                try:
+                    self.send_response(code)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client timed out
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_openai():
+    fake = FakeOpenAI()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def resilient(fake_openai, monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_OPENAI_BACKOFF_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "AZURE_OPENAI_BACKOFF_MAX_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "AZURE_OPENAI_TIMEOUT_SECONDS", 5.0)
+    monkeypatch.setattr(settings, "AZURE_OPENAI_HEDGE_DELAY_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "AZURE_OPENAI_CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "AZURE_OPENAI_CIRCUIT_RESET_SECONDS", 0.3)
+    monkeypatch.setattr(llm_resilience, "_breakers", {})
+    client = openai.OpenAI(base_url=fake_openai.url, api_key="test", max_retries=0)
+    return ResilientLLMClient(client, breaker_name="test-deployment")
+
+
+def _create(resilient, **kwargs):
+    return resilient.create(
+        LLMOperation.BEAT_SHEET,
+        model="test",
+        messages=[{"role": "user", "content": "hello"}],
+        **kwargs
+    )
+
+
+def test_429_waits_for_retry_after(fake_openai, resilient):
+    fake_openai.replies = [(429, {"retry-after": "0.3"}, 0.0), OK]
+
+    started = time.monotonic()
+    response = _create(resilient)
+
+    assert response.choices[0].message.content == "ok"
+    assert fake_openai.requests == 2
+    assert time.monotonic() - started >= 0.3
+
+
+def test_5xx_is_retried_until_success(fake_openai, resilient):
+    fake_openai.replies = [(503, {}, 0.0), OK]
+
+    response = _create(resilient)
+
+    assert response.choices[0].message.content == "ok"
+    assert fake_openai.requests == 2
+    assert llm_resilience.get_circuit_breaker("test-deployment").snapshot()["consecutive_failures"] == 0
+
+
+def test_non_retryable_error_is_raised_at_once(fake_openai, resilient):
+    fake_openai.replies = [(400, {}, 0.0), OK]
+
+    with pytest.raises(openai.BadRequestError):
+        _create(resilient)
+    assert fake_openai.requests == 1
+
+
+def test_deadline_bounds_slow_calls(fake_openai, resilient):
+    fake_openai.replies = [(200, {}, 2.0)]
+
+    started = time.monotonic()
+    with pytest.raises((LLMUnavailableError, openai.APITimeoutError)):
+        _create(resilient, deadline=0.5)
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_retry_after_past_the_deadline_is_not_waited_for(fake_openai, resilient):
+    fake_openai.replies = [(429, {"retry-after": "5"}, 0.0), OK]
+
+    started = time.monotonic()
+    with pytest.raises(openai.RateLimitError):
+        _create(resilient, deadline=1.0)
+
+    assert fake_openai.requests == 1
+    assert time.monotonic() - started < 1.0
+
+
+def test_breaker_opens_then_lets_one_probe_through(fake_openai, resilient):
+    fake_openai.replies = [(500, {}, 0.0)]
+
+    with pytest.raises(openai.InternalServerError):
+        _create(resilient, max_retries=1)
+    assert fake_openai.requests == 2
+    breaker = llm_resilience.get_circuit_breaker("test-deployment")
+    assert breaker.snapshot()["state"] == "open"
+
+    # Open: fails fast without reaching the server
+    with pytest.raises(LLMUnavailableError) as error:
+        _create(resilient)
+    assert error.value.retry_after is not None
+    assert fake_openai.requests == 2
+
+    # Half-open after the reset timeout: the probe succeeds and closes the breaker
+    time.sleep(0.35)
+    fake_openai.replies = [OK]
+    response = _create(resilient)
+
+    assert response.choices[0].message.content == "ok"
+    assert fake_openai.requests == 3
+    assert breaker.snapshot()["state"] == "closed"
+
+
+def test_failed_probe_reopens_the_breaker(fake_openai, resilient):
+    fake_openai.replies = [(500, {}, 0.0)]
+    with pytest.raises(openai.InternalServerError):
+        _create(resilient, max_retries=1)
+
+    time.sleep(0.35)
+    with pytest.raises((openai.InternalServerError, LLMUnavailableError)):
+        _create(resilient, max_retries=0)
+
+    assert fake_openai.requests == 3
+    assert llm_resilience.get_circuit_breaker("test-deployment").snapshot()["state"] == "open"
+
+
+def test_every_attempt_is_admitted(fake_openai, resilient, monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_OPENAI_CIRCUIT_FAILURE_THRESHOLD", 5)
+    fake_openai.replies = [(503, {}, 0.0), (429, {}, 0.0), OK]
+    admitted = []
+
+    _create(resilient, admit=admitted.append)
+
+    assert fake_openai.requests == 3
+    assert len(admitted) == 3
+
+
+def test_open_breaker_is_not_admitted(fake_openai, resilient):
+    fake_openai.replies = [(500, {}, 0.0)]
+    with pytest.raises(openai.InternalServerError):
+        _create(resilient, max_retries=1)
+    admitted = []
+
+    with pytest.raises(LLMUnavailableError):
+        _create(resilient, admit=admitted.append)
+
+    assert admitted == []
+
+
+def _create_hedged(resilient, **kwargs):
+    return resilient.create(
+        LLMOperation.SHORTEN,
+        model="test",
+        messages=[{"role": "user", "content": "hello"}],
+        **kwargs
+    )
+
+
+def test_hedged_request_is_admitted(fake_openai, resilient, monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_OPENAI_HEDGE_DELAY_SECONDS", 0.1)
+    fake_openai.replies = [(200, {}, 1.0), OK]
+    admitted = []
+
+    started = time.monotonic()
+    _create_hedged(resilient, admit=admitted.append)
+
+    assert fake_openai.requests == 2
+    assert len(admitted) == 2 and admitted[1] == 0.0
+    assert time.monotonic() - started < 1.0
+
+
+def test_hedge_is_skipped_without_headroom(fake_openai, resilient, monkeypatch):
+    monkeypatch.setattr(settings, "AZURE_OPENAI_HEDGE_DELAY_SECONDS", 0.1)
+    fake_openai.replies = [(200, {}, 0.5), OK]
+    admitted = []
+
+    def admit(max_wait):
+        if admitted:
+            raise LLMUnavailableError("Rate limit queue wait exceeded")
+        admitted.append(max_wait)
+
+    response = _create_hedged(resilient, admit=admit)
+
+    assert response.choices[0].message.content == "ok"
+    assert fake_openai.requests == 1
+    assert len(admitted) == 1
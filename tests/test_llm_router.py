@@ -0,0 +1,61 @@
+# tests/test_llm_router.py
+import asyncio
+import time
+
+from app.services.llm_resilience import LLMOperation
+from app.services.llm_router import (ModelTier, RoutingDecision, consume_routing_decisions,
+                                     has_routing_decisions, record_routing_decision, run_llm_call)
+
+
+def _decision() -> RoutingDecision:
+    return RoutingDecision(
+        operation=LLMOperation.SHORTEN,
+        tier=ModelTier.FAST,
+        deployment="fast",
+        fallback_used=False,
+        skipped_deployments=[],
+        max_tokens=100,
+        queue_wait_seconds=0.0,
+    )
+
+
+def test_run_llm_call_runs_off_the_event_loop_and_keeps_decisions():
+    def blocking_call(value):
+        record_routing_decision(_decision())
+        time.sleep(0.2)
+        return value
+
+    async def request():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        result = await run_llm_call(blocking_call, "done")
+        task.cancel()
+        return result, ticks, consume_routing_decisions()
+
+    result, ticks, decisions = asyncio.run(request())
+
+    assert result == "done"
+    assert ticks >= 5
+    assert [decision["deployment"] for decision in decisions] == ["fast"]
+
+
+def test_decisions_consumed_in_the_worker_thread_are_not_logged_twice():
+    def blocking_call():
+        record_routing_decision(_decision())
+        return consume_routing_decisions()
+
+    async def request():
+        consumed = await run_llm_call(blocking_call)
+        return consumed, has_routing_decisions()
+
+    consumed, pending = asyncio.run(request())
+
+    assert len(consumed) == 1
+    assert not pending
@@ -0,0 +1,107 @@
+# tests/test_partial_indexes.py
+"""
+The editor's list queries are served by the partial indexes of migration a0123456abcd.
+
+Each service call runs against Postgres while its statements are recorded; the
+statements are then EXPLAINed with their own parameters. Sequential scans are
+disabled so the plan does not depend on the (tiny) table sizes.
+"""
+from typing import Any, List, Tuple
+import uuid
+
+import pytest
+from sqlalchemy import event, text
+
+from app.models.beats import ActEnum, Beat, BeatSheetType, MasterBeatSheet
+from app.models.scene_segments import ComponentType, SceneSegment, SceneSegmentComponent
+from app.models.scenes import SceneDescription
+from app.models.script import Script
+from app.models.users import User
+from app.services.scene_description_service import SceneDescriptionService
+from app.services.scene_segment_service import SceneSegmentService
+
+
+@pytest.fixture
+def script(pg_session):
+    user = User(email=f"{uuid.uuid4()}@example.com", full_name="Test", supabase_uid=str(uuid.uuid4()))
+    script = Script(title="Test", genre="Drama", story="Story", user=user)
+    sheet = pg_session.query(MasterBeatSheet).filter(
+        MasterBeatSheet.beat_sheet_type == BeatSheetType.INDIE_FILM
+    ).first() or MasterBeatSheet(
+        name="Indie", beat_sheet_type=BeatSheetType.INDIE_FILM, description="", number_of_beats=1, template=[]
+    )
+    beat = Beat(
+        script=script, master_beat_sheet=sheet, position=1, beat_title="Beat",
+        beat_description="Beat", beat_act=ActEnum.act_1
+    )
+    pg_session.add_all([user, script, beat])
+    pg_session.flush()
+
+    for position in range(1, 6):
+        pg_session.add(SceneDescription(
+            beat_id=beat.id, position=position, scene_heading="INT. ROOM - DAY",
+            scene_description="Scene", is_deleted=position == 3
+        ))
+        segment = SceneSegment(script_id=script.id, segment_number=position * 1000.0, is_deleted=position == 3)
+        segment.components = [
+            SceneSegmentComponent(
+                component_type=ComponentType.ACTION, position=index * 1000.0,
+                content="Action", is_deleted=index == 2
+            )
+            for index in range(1, 4)
+        ]
+        pg_session.add(segment)
+    pg_session.flush()
+    return script, beat
+
+
+def _record(pg_session, call) -> List[Tuple[str, Any]]:
+    """Run call() and return the (statement, parameters) it sent to the database."""
+    connection = pg_session.connection()
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def _plan(pg_session, statements: List[Tuple[str, Any]], table: str) -> str:
+    """EXPLAIN output of the ordered select the call ran against `table`."""
+    connection = pg_session.connection()
+    connection.execute(text("SET enable_seqscan = off"))
+    [(statement, parameters)] = [
+        (statement, parameters) for statement, parameters in statements
+        if f"FROM {table}" in statement and "ORDER BY" in statement
+    ]
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).scalars().all()
+    return "\n".join(rows)
+
+
+def test_segment_and_component_lists_use_the_live_indexes(pg_session, script):
+    script, _ = script
+    statements = _record(pg_session, lambda: SceneSegmentService.get_scene_segments_json(pg_session, script.id))
+
+    assert "ix_scene_segments_script_id_segment_number_live" in _plan(
+        pg_session, statements, "scene_segments"
+    )
+    assert "ix_scene_segment_components_segment_id_position_live" in _plan(
+        pg_session, statements, "scene_segment_components"
+    )
+
+
+def test_scene_description_list_uses_the_live_index(pg_session, script):
+    script, beat = script
+    statements = _record(
+        pg_session,
+        lambda: SceneDescriptionService.get_scene_descriptions_for_beat(pg_session, beat.id, script.user_id)
+    )
+
+    assert "ix_scene_description_beats_beat_id_position_live" in _plan(
+        pg_session, statements, "scene_description_beats"
+    )
@@ -0,0 +1,119 @@
+# tests/test_screenplay_parser.py
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+import pytest
+
+from app.models.scene_segments import ComponentType
+from app.services.screenplay_export import FountainRenderer
+from app.services.screenplay_parser import ParsedSegment, iter_parse_screenplay, parse_screenplay
+
+TIGHT = "INT. KITCHEN - DAY\nSarah pours coffee.\nJOHN\nMorning.\nSARAH\n(smiling)\nHi.\nCUT TO:"
+
+BLANK_LINES = """Title: Breakfast
+Author: Someone
+
+INT. KITCHEN - DAY
+
+Sarah pours coffee.
+
+JOHN
+Morning.
+
+SARAH
+(smiling)
+Hi.
+
+CUT TO:
+"""
+
+KITCHEN = [
+    (ComponentType.HEADING, "INT. KITCHEN - DAY", None, None),
+    (ComponentType.ACTION, "Sarah pours coffee.", None, None),
+    (ComponentType.DIALOGUE, "Morning.", "JOHN", None),
+    (ComponentType.DIALOGUE, "Hi.", "SARAH", "smiling"),
+    (ComponentType.TRANSITION, "CUT TO:", None, None),
+]
+
+Row = Tuple[ComponentType, str, Optional[str], Optional[str]]
+
+
+def _rows(segments: List[ParsedSegment]) -> List[List[Row]]:
+    return [
+        [
+            (component.component_type, component.content, component.character_name, component.parenthetical)
+            for component in segment.components
+        ]
+        for segment in segments
+    ]
+
+
+@pytest.mark.parametrize("text", [TIGHT, BLANK_LINES], ids=["tight", "blank-lines"])
+def test_scene_is_parsed_into_its_elements(text):
+    assert _rows(parse_screenplay(text)) == [KITCHEN]
+
+
+def test_tight_text_starts_a_segment_at_every_heading():
+    text = TIGHT + "\nEXT. STREET - NIGHT\nRain.\nJOHN (V.O.)\nShe never called."
+
+    assert _rows(parse_screenplay(text)) == [
+        KITCHEN,
+        [
+            (ComponentType.HEADING, "EXT. STREET - NIGHT", None, None),
+            (ComponentType.ACTION, "Rain.", None, None),
+            (ComponentType.DIALOGUE, "She never called.", "JOHN (V.O.)", None),
+        ],
+    ]
+
+
+def test_speech_runs_to_the_next_cue():
+    text = "JOHN\nWAIT\nDon't go.\n(beat)\nPlease.\nMARY\nNo."
+
+    assert _rows(parse_screenplay(text)) == [[
+        (ComponentType.DIALOGUE, "WAIT\nDon't go.\n(beat)\nPlease.", "JOHN", None),
+        (ComponentType.DIALOGUE, "No.", "MARY", None),
+    ]]
+
+
+def test_lone_capitals_are_action():
+    text = "He turns.\n\nBOOM\n\nJOHN\n(whispering)"
+
+    assert _rows(parse_screenplay(text)) == [[
+        (ComponentType.ACTION, "He turns.", None, None),
+        (ComponentType.ACTION, "BOOM", None, None),
+        (ComponentType.ACTION, "JOHN\n(whispering)", None, None),
+    ]]
+
+
+def test_forced_action_paragraph_is_not_split():
+    text = "!SARAH\nlooks at JOHN\nCUT TO:"
+
+    assert _rows(parse_screenplay(text)) == [[
+        (ComponentType.ACTION, "SARAH\nlooks at JOHN\nCUT TO:", None, None),
+    ]]
+
+
+def test_chunked_input_parses_like_whole_text():
+    text = BLANK_LINES + "\n" + TIGHT.replace("KITCHEN", "HALL")
+    chunks = [text[start:start + 7] for start in range(0, len(text), 7)]
+
+    assert _rows(list(iter_parse_screenplay(chunks))) == _rows(parse_screenplay(text))
+
+
+def test_fountain_export_reimports_unchanged():
+    rows = [
+        (ComponentType.HEADING, "INT. KITCHEN - DAY", None, None),
+        (ComponentType.ACTION, "Mary enters.\nCUT TO:\nBOB", None, None),
+        (ComponentType.ACTION, "She reads the sign:\nEXT. STREET - NIGHT", None, None),
+        (ComponentType.DIALOGUE, "Morning.", "JOHN", "smiling"),
+        (ComponentType.ACTION, "JOHN\nwaves.\nFADE OUT.", None, None),
+        (ComponentType.ACTION, "!Bang!", None, None),
+        (ComponentType.TRANSITION, "CUT TO:", None, None),
+    ]
+    components = [
+        SimpleNamespace(component_type=kind, content=content, character_name=name, parenthetical=parenthetical)
+        for kind, content, name, parenthetical in rows
+    ]
+    text = FountainRenderer.header("Kitchen") + FountainRenderer.fragment(components)
+
+    assert _rows(parse_screenplay(text)) == [rows]
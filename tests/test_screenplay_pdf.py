@@ -0,0 +1,37 @@
+# tests/test_screenplay_pdf.py
+import pytest
+
+from app.models.scene_segments import ComponentType
+from app.services.screenplay_pdf import PdfComponent, UnsupportedCharactersError, render_pdf
+
+LINES_PER_PAGE = 55
+
+
+def _scene(speech: str):
+    return [[
+        PdfComponent(ComponentType.HEADING, "INT. KITCHEN - DAY", None, None),
+        PdfComponent(ComponentType.DIALOGUE, speech, "JOHN", None),
+    ]]
+
+
+def test_western_european_text_renders():
+    content, page_count = render_pdf("Café", _scene("Naïve “quotes” — déjà vu."), LINES_PER_PAGE)
+
+    assert content.startswith(b"%PDF-")
+    assert page_count == 1
+
+
+def test_characters_outside_the_font_are_reported_not_replaced():
+    with pytest.raises(UnsupportedCharactersError) as error:
+        render_pdf("Tokyo", _scene("日本 again"), LINES_PER_PAGE)
+
+    assert error.value.characters == ["日", "本"]
+    assert "日 本" in str(error.value)
+
+
+def test_unsupported_title_is_reported():
+    with pytest.raises(UnsupportedCharactersError) as error:
+        render_pdf("Москва", _scene("Hello."), LINES_PER_PAGE)
+
+    # The title is drawn as written (document info) and in capitals (title page)
+    assert {"М", "О", "о", "с"} <= set(error.value.characters)